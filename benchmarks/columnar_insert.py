@@ -0,0 +1,78 @@
+"""Compare inserting revision data as per-row dicts against column-oriented `Columns`.
+
+Usage:
+    python benchmarks/columnar_insert.py [--rows 1000000] [--url postgresql://...]
+
+Given a `--url`, its `measurement` table is (re)created and dropped.
+"""
+
+import argparse
+import time
+
+from sqlalchemy import Column, create_engine, Float, Integer, MetaData, Table, Unicode
+
+from pytest_alembic.executor import ConnectionExecutor
+from pytest_alembic.revision_data import Columns
+
+metadata = MetaData()
+Table(
+    "measurement",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", Unicode()),
+    Column("value", Float()),
+)
+
+
+def make_columns(rows: int):
+    return {
+        "id": list(range(rows)),
+        "name": [f"name {i % 100}" for i in range(rows)],
+        "value": [i * 0.5 for i in range(rows)],
+    }
+
+
+def dict_per_row(engine, columns):
+    """Convert the columns to a list of dicts, as `RevisionSpec` previously required."""
+    names = list(columns)
+    data = [
+        {"__tablename__": "measurement", **dict(zip(names, row))} for row in zip(*columns.values())
+    ]
+    ConnectionExecutor(engine).table_insert("", data)
+
+
+def columnar(engine, columns):
+    Columns("measurement", columns).insert(ConnectionExecutor(engine), "")
+
+
+def run(name, fn, columns, url):
+    engine = create_engine(url)
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+
+    try:
+        start = time.perf_counter()
+        fn(engine, columns)
+        duration = time.perf_counter() - start
+    finally:
+        metadata.drop_all(engine)
+        engine.dispose()
+    rows = len(columns["id"])
+    print(f"{name:>12}: {duration:.3f}s ({rows / duration:,.0f} rows/s)")
+    return duration
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--url", default="sqlite:///")
+    args = parser.parse_args()
+
+    columns = make_columns(args.rows)
+    baseline = run("dict-per-row", dict_per_row, columns, args.url)
+    result = run("columnar", columnar, columns, args.url)
+    print(f"{'speedup':>12}: {baseline / result:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Compare row-at-a-time insertion of revision data against grouped insertion.
+
+Usage:
+    python benchmarks/table_insert.py [--rows 50000]
+"""
+
+import argparse
+import time
+
+from sqlalchemy import Column, create_engine, Integer, MetaData, Table, Unicode
+
+from pytest_alembic.executor import ConnectionExecutor
+
+metadata = MetaData()
+Table(
+    "parent",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", Unicode()),
+)
+Table(
+    "child",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("parent_id", Integer),
+    Column("name", Unicode()),
+)
+
+
+def make_data(rows: int):
+    data = []
+    for i in range(rows // 2):
+        data.append({"__tablename__": "parent", "id": i, "name": f"parent {i}"})
+    for i in range(rows // 2):
+        data.append({"__tablename__": "child", "id": i, "parent_id": i, "name": f"child {i}"})
+    return data
+
+
+def row_at_a_time(engine, data):
+    """Insert each row through its own statement, as `table_insert` previously did."""
+    connection_executor = ConnectionExecutor(engine)
+    with engine.begin() as connection:
+        for item in data:
+            table = connection_executor.table("", item["__tablename__"], connection=connection)
+            values = {k: v for k, v in item.items() if k != "__tablename__"}
+            connection.execute(table.insert().values(values))
+
+
+def grouped(engine, data):
+    ConnectionExecutor(engine).table_insert("", data)
+
+
+def run(name, fn, data):
+    engine = create_engine("sqlite:///")
+    metadata.create_all(engine)
+
+    start = time.perf_counter()
+    fn(engine, data)
+    duration = time.perf_counter() - start
+
+    engine.dispose()
+    print(f"{name:>15}: {duration:.3f}s ({len(data) / duration:,.0f} rows/s)")
+    return duration
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50_000)
+    args = parser.parse_args()
+
+    data = make_data(args.rows)
+    baseline = run("row-at-a-time", row_at_a_time, data)
+    result = run("grouped", grouped, data)
+    print(f"{'speedup':>15}: {baseline / result:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
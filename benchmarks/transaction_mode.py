@@ -0,0 +1,90 @@
+"""Compare committing after each revision against executing each window in one transaction.
+
+Each bundled example history which runs against SQLite is upgraded to "heads" and
+downgraded to "base", on a file-backed database, in each `transaction_mode`.
+
+Usage:
+    python benchmarks/transaction_mode.py [--rounds 20]
+"""
+
+import argparse
+import contextlib
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine
+
+import pytest_alembic
+from pytest_alembic import Config
+
+EXAMPLES = Path(__file__).parent.parent / "examples"
+MODES = ("revision", "single", "savepoint")
+
+
+@contextlib.contextmanager
+def example(path: Path):
+    """Execute from within an example directory, such that its `env.py` can import its models."""
+    cwd = Path.cwd()
+    os.chdir(path)
+    sys.path.insert(0, str(path))
+    try:
+        yield
+    finally:
+        sys.path.remove(str(path))
+        sys.modules.pop("models", None)
+        os.chdir(cwd)
+
+
+def run(path: Path, mode: str, rounds: int) -> float:
+    with tempfile.TemporaryDirectory() as tmp, example(path):
+        engine = create_engine(f"sqlite:///{tmp}/db.sqlite")
+        try:
+            config = Config(pin_connection=True, transaction_mode=mode)
+            with pytest_alembic.runner(config=config, engine=engine) as runner:
+                start = time.perf_counter()
+                for _ in range(rounds):
+                    runner.migrate_up_to("heads", return_current=False)
+                    runner.migrate_down_to("base", return_current=False)
+                return time.perf_counter() - start
+        finally:
+            engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    # Each example's `env.py` configures alembic to log every migration step (at INFO).
+    logging.disable(logging.INFO)
+
+    totals = dict.fromkeys(MODES, 0.0)
+    for path in sorted(EXAMPLES.iterdir()):
+        if not (path / "alembic.ini").exists():
+            continue
+
+        durations = {}
+        try:
+            for mode in MODES:
+                durations[mode] = run(path, mode, args.rounds)
+        except Exception as e:  # noqa: BLE001
+            # Examples which fail by design, or require some other database.
+            print(f"{path.name:>45}  skipped ({type(e).__name__})")
+            continue
+
+        for mode, duration in durations.items():
+            totals[mode] += duration
+        timings = "  ".join(f"{mode}: {duration:.3f}s" for mode, duration in durations.items())
+        print(f"{path.name:>45}  {timings}")
+
+    baseline = totals["revision"]
+    for mode, total in totals.items():
+        print(f"{mode:>12}: {total:.3f}s ({baseline / total:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
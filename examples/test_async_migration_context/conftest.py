@@ -0,0 +1,19 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from pytest_alembic import Config
+
+before_revision_data = {"bbbbbbbbbbbb": {"__tablename__": "foo", "id": 9}}
+
+
+@pytest.fixture
+def alembic_config():
+    return Config(before_revision_data=before_revision_data)
+
+
+@pytest_asyncio.fixture
+async def alembic_engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite'}")
+    yield engine
+    await engine.dispose()
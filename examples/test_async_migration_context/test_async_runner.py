@@ -0,0 +1,60 @@
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from pytest_alembic import async_runner, Config, MigrationContext
+
+before_revision_data = {"bbbbbbbbbbbb": {"__tablename__": "foo", "id": 9}}
+
+
+async def test_migrate(async_alembic_runner):
+    assert await async_alembic_runner.current == "base"
+
+    assert await async_alembic_runner.migrate_up_to("heads") == "bbbbbbbbbbbb"
+    await async_alembic_runner.insert_into("foo", {"id": 10})
+
+    foo = await async_alembic_runner.table_at_revision("foo")
+    assert foo.c.keys() == ["id", "created_at"]
+
+    await async_alembic_runner.migrate_down_to("base")
+    assert await async_alembic_runner.current == "base"
+
+
+async def test_run(async_alembic_runner):
+    assert await async_alembic_runner.run(MigrationContext.migrate_up_one) == "aaaaaaaaaaaa"
+    assert await async_alembic_runner.run(MigrationContext.migrate_down_one) == "base"
+
+
+async def migrate(runner, *, rows):
+    for _ in range(3):
+        await runner.migrate_up_to("heads")
+        await runner.insert_into("foo", [{"id": 10 + row} for row in range(rows)])
+        await runner.migrate_down_to("base")
+
+    await runner.migrate_up_to("aaaaaaaaaaaa")
+    await runner.insert_into("foo", [{"id": 10 + row} for row in range(rows)])
+    return await runner.current
+
+
+async def test_concurrent_runners(tmp_path):
+    engines = [
+        create_async_engine(f"sqlite+aiosqlite:///{tmp_path / f'db{index}.sqlite'}")
+        for index in range(2)
+    ]
+    try:
+        async with async_runner(
+            Config(before_revision_data=before_revision_data), engines[0]
+        ) as first, async_runner(
+            Config(before_revision_data=before_revision_data), engines[1]
+        ) as second:
+            currents = await asyncio.gather(migrate(first, rows=1), migrate(second, rows=2))
+            assert currents == ["aaaaaaaaaaaa", "aaaaaaaaaaaa"]
+
+        for rows, engine in enumerate(engines, start=1):
+            async with engine.connect() as connection:
+                result = await connection.execute(text("SELECT count(*) FROM foo"))
+                assert result.scalar() == rows
+    finally:
+        for engine in engines:
+            await engine.dispose()
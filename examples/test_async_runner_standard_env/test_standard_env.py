@@ -0,0 +1,10 @@
+import pytest
+
+
+def test_sync_runner(alembic_runner):
+    assert alembic_runner.migrate_up_to("heads") == "bbbbbbbbbbbb"
+
+
+async def test_async_runner(async_alembic_runner):
+    with pytest.raises(RuntimeError, match=r"env\.py.*must run migrations synchronously"):
+        await async_alembic_runner.migrate_up_to("heads")
@@ -0,0 +1,28 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from pytest_alembic import Config, create_alembic_fixture
+
+before_revision_data = {"bbbbbbbbbbbb": {"__tablename__": "foo", "id": 9}}
+
+alembic_replay = create_alembic_fixture(
+    Config(before_revision_data=before_revision_data, pin_connection=True, replay_env=True)
+)
+
+
+@pytest.fixture
+def alembic_config():
+    return Config(before_revision_data=before_revision_data, pin_connection=True)
+
+
+@pytest.fixture
+def checkouts():
+    return []
+
+
+@pytest.fixture
+def alembic_engine(tmp_path, checkouts):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite'}")
+    event.listen(engine.sync_engine, "checkout", lambda *args: checkouts.append(args))
+    return engine
@@ -0,0 +1,18 @@
+def test_single_connection(alembic_runner, checkouts):
+    alembic_runner.migrate_up_to("heads")
+    alembic_runner.migrate_down_to("base")
+    alembic_runner.migrate_up_to("heads")
+    alembic_runner.insert_into("foo", {"id": 10})
+
+    foo = alembic_runner.table_at_revision("foo")
+    assert foo.c.keys() == ["id", "created_at"]
+    assert len(checkouts) == 1
+
+
+def test_replay_env(alembic_replay, checkouts):
+    alembic_replay.migrate_up_to("heads")
+    alembic_replay.migrate_down_to("base")
+    alembic_replay.migrate_up_to("heads")
+
+    assert alembic_replay.command_executor.env_configuration.replayable
+    assert len(checkouts) == 1
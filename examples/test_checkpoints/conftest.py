@@ -0,0 +1,14 @@
+import pytest
+
+from pytest_alembic import Config
+from pytest_alembic.checkpoint import CheckpointStore
+
+store = CheckpointStore()
+
+
+@pytest.fixture
+def alembic_config():
+    return Config(
+        checkpoints=store,
+        before_revision_data={"bbbbbbbbbbbb": {"__tablename__": "foo", "id": 1}},
+    )
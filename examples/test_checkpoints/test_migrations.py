@@ -0,0 +1,45 @@
+from sqlalchemy import text
+
+from conftest import store
+
+
+def test_checkpoints_recorded(alembic_runner):
+    alembic_runner.migrate_up_to("heads")
+
+    assert len(store.checkpoints) == 3
+    assert alembic_runner.checkpoint_revision == "heads"
+
+
+def test_checkpoints_restored(alembic_runner, alembic_engine, monkeypatch):
+    upgrades = []
+    monkeypatch.setattr(alembic_runner.command_executor, "upgrade", upgrades.append)
+
+    alembic_runner.migrate_up_to("heads")
+    assert upgrades == []
+
+    with alembic_engine.connect() as conn:
+        result = conn.execute(text("SELECT id FROM foo")).fetchall()
+    assert result == [(1,)]
+
+
+def test_checkpoints_not_restored_over_test_data(alembic_runner, alembic_engine):
+    alembic_runner.migrate_up_to("aaaaaaaaaaaa")
+    alembic_runner.insert_into("foo", {"id": 2})
+
+    alembic_runner.migrate_up_to("heads")
+
+    with alembic_engine.connect() as conn:
+        result = conn.execute(text("SELECT id FROM foo ORDER BY id")).fetchall()
+    assert result == [(1,), (2,)]
+
+
+def test_checkpoints_not_restored_over_engine_data(alembic_runner, alembic_engine):
+    alembic_runner.migrate_up_to("aaaaaaaaaaaa")
+    with alembic_engine.begin() as conn:
+        conn.execute(text("INSERT INTO foo (id) VALUES (42)"))
+
+    alembic_runner.migrate_up_to("heads")
+
+    with alembic_engine.connect() as conn:
+        result = conn.execute(text("SELECT id FROM foo ORDER BY id")).fetchall()
+    assert result == [(1,), (42,)]
@@ -0,0 +1,6 @@
+import pytest
+
+
+@pytest.fixture
+def alembic_config():
+    return {"before_revision_data": {"cccccccccccc": {"__tablename__": "foo", "id": 1}}}
@@ -0,0 +1,12 @@
+revision = "cccccccccccc"
+down_revision = "bbbbbbbbbbbb"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    pass
+
+
+def downgrade():
+    pass
@@ -0,0 +1,40 @@
+import pytest
+
+
+@pytest.fixture
+def upgrades(alembic_runner, monkeypatch):
+    upgrades = []
+    upgrade = alembic_runner.command_executor.upgrade
+
+    def record_upgrade(revision):
+        upgrades.append(revision)
+        upgrade(revision)
+
+    monkeypatch.setattr(alembic_runner.command_executor, "upgrade", record_upgrade)
+    return upgrades
+
+
+def test_upgrade_coalesces_steps(alembic_runner, upgrades):
+    assert alembic_runner.migrate_up_to("heads") == "cccccccccccc"
+    assert upgrades == ["bbbbbbbbbbbb", "cccccccccccc", "heads"]
+
+
+def test_upgrade_one_step_at_a_time(alembic_runner, upgrades):
+    assert alembic_runner.managed_upgrade("heads", coalesce=False) == "cccccccccccc"
+    assert upgrades == ["aaaaaaaaaaaa", "bbbbbbbbbbbb", "cccccccccccc", "heads"]
+
+
+def test_downgrade_coalesces_steps(alembic_runner, monkeypatch):
+    alembic_runner.migrate_up_to("heads")
+
+    downgrades = []
+    downgrade = alembic_runner.command_executor.downgrade
+
+    def record_downgrade(revision):
+        downgrades.append(revision)
+        downgrade(revision)
+
+    monkeypatch.setattr(alembic_runner.command_executor, "downgrade", record_downgrade)
+
+    assert alembic_runner.migrate_down_to("base") == "base"
+    assert downgrades == ["base"]
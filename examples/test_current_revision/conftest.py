@@ -0,0 +1,6 @@
+import pytest
+
+
+@pytest.fixture
+def alembic_config():
+    return {"verify_current": True}
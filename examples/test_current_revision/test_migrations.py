@@ -0,0 +1,43 @@
+import pytest
+from sqlalchemy import text
+
+
+def test_current_is_tracked(alembic_runner, monkeypatch):
+    assert alembic_runner.current == "base"
+
+    reads = []
+    monkeypatch.setattr(alembic_runner.command_executor, "read_revision", reads.append)
+
+    alembic_runner.migrate_up_to("aaaaaaaaaaaa")
+    assert alembic_runner.current == "aaaaaaaaaaaa"
+
+    alembic_runner.migrate_up_one()
+    assert alembic_runner.current == "bbbbbbbbbbbb"
+
+    alembic_runner.migrate_down_one()
+    assert alembic_runner.current == "aaaaaaaaaaaa"
+
+    assert reads == []
+
+
+def test_current_is_verified(alembic_runner, alembic_engine):
+    alembic_runner.migrate_up_to("heads")
+
+    with alembic_engine.begin() as conn:
+        conn.execute(text("UPDATE alembic_version SET version_num = 'aaaaaaaaaaaa'"))
+
+    with pytest.raises(RuntimeError, match="does not match"):
+        _ = alembic_runner.current
+
+
+def test_partial_revisions_are_resolved(alembic_runner):
+    alembic_runner.set_revision("aaaa")
+    assert alembic_runner.current == "aaaaaaaaaaaa"
+
+    alembic_runner.migrate_up_to("heads")
+    assert alembic_runner.current == "bbbbbbbbbbbb"
+
+
+def test_set_unknown_revision(alembic_runner):
+    with pytest.raises(RuntimeError, match="Can't locate revision"):
+        alembic_runner.set_revision("zzzzzzzzzzzz")
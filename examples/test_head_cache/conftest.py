@@ -0,0 +1,25 @@
+import pytest
+
+from pytest_alembic import Config
+
+
+@pytest.fixture
+def alembic_config():
+    return Config(
+        head_cache=True,
+        head_cache_validation=3,
+        before_revision_data={"bbbbbbbbbbbb": {"__tablename__": "foo", "id": 1}},
+    )
+
+
+@pytest.fixture
+def upgrades(alembic_runner, monkeypatch):
+    result = []
+    upgrade = alembic_runner.command_executor.upgrade
+
+    def record(revision):
+        result.append(revision)
+        upgrade(revision)
+
+    monkeypatch.setattr(alembic_runner.command_executor, "upgrade", record)
+    return result
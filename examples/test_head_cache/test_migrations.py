@@ -0,0 +1,53 @@
+import sqlite3
+
+from sqlalchemy import text
+
+
+def assert_at_heads(alembic_runner, alembic_engine):
+    assert alembic_runner.current == "bbbbbbbbbbbb"
+    with alembic_engine.connect() as conn:
+        result = conn.execute(text("SELECT id FROM foo")).fetchall()
+    assert result == [(1,)]
+
+
+def test_replayed_without_snapshot(alembic_runner, alembic_engine, upgrades):
+    alembic_runner.migrate_up_to("heads")
+
+    assert upgrades
+    assert_at_heads(alembic_runner, alembic_engine)
+
+
+def test_snapshot_restored(alembic_runner, alembic_engine, upgrades):
+    alembic_runner.migrate_up_to("heads")
+
+    assert upgrades == []
+    assert_at_heads(alembic_runner, alembic_engine)
+
+
+def test_snapshot_restored_again(alembic_runner, alembic_engine, upgrades, request):
+    alembic_runner.migrate_up_to("heads")
+
+    assert upgrades == []
+    assert_at_heads(alembic_runner, alembic_engine)
+
+    # Rows legitimately differ between upgrades (here, through the `CURRENT_TIMESTAMP`
+    # server default), which must not be reported when the snapshot is next validated.
+    directory = request.config.cache.mkdir("pytest-alembic-head-cache")
+    for path in directory.glob("*.sqlite"):
+        snapshot = sqlite3.connect(path)
+        with snapshot:
+            snapshot.execute("UPDATE foo SET created_at = '1999-01-01 00:00:00'")
+        snapshot.close()
+
+
+def test_snapshot_validated(alembic_runner, alembic_engine, upgrades):
+    alembic_runner.migrate_up_to("heads")
+
+    assert upgrades
+    assert_at_heads(alembic_runner, alembic_engine)
+
+
+def test_other_revisions_replayed(alembic_runner, upgrades):
+    alembic_runner.migrate_up_to("aaaaaaaaaaaa")
+
+    assert upgrades
@@ -0,0 +1,13 @@
+revision = "bbbbbbbbbbbb"
+down_revision = "aaaaaaaaaaaa"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    message = "bbbbbbbbbbbb cannot be upgraded"
+    raise RuntimeError(message)
+
+
+def downgrade():
+    pass
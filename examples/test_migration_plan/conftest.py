@@ -0,0 +1,3 @@
+from pytest_alembic import create_alembic_fixture
+
+broken_runner = create_alembic_fixture({"file": "broken.ini"})
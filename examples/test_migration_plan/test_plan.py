@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import inspect
+
+from pytest_alembic import tests
+from pytest_alembic.checkpoint import CheckpointStore
+from pytest_alembic.plugin.error import AlembicTestFailure
+from pytest_alembic.plugin.plan import DEFAULT_CHECKPOINT_BUDGET, migration_plan
+
+
+def record_upgrades(runner, monkeypatch):
+    upgrades = []
+    upgrade = runner.command_executor.upgrade
+
+    def recording_upgrade(revision):
+        upgrades.append(revision)
+        upgrade(revision)
+
+    monkeypatch.setattr(runner.command_executor, "upgrade", recording_upgrade)
+    return upgrades
+
+
+def test_upgrade_is_shared(alembic_runner, alembic_engine, monkeypatch):
+    """The built-in tests already upgraded a database through this history."""
+    upgrades = record_upgrades(alembic_runner, monkeypatch)
+
+    tests.test_upgrade(alembic_runner)
+
+    assert upgrades == []
+    assert alembic_runner.current == "aaaaaaaaaaaa"
+    assert inspect(alembic_engine).has_table("foo")
+
+
+def test_failure_attributed(broken_runner):
+    with pytest.raises(AlembicTestFailure) as e:
+        tests.test_upgrade(broken_runner)
+
+    message = str(e.value)
+    assert "Failed to upgrade to the head revision" in message
+    assert "Failing Revision:\n    bbbbbbbbbbbb" in message
+    assert "bbbbbbbbbbbb cannot be upgraded" in message
+
+
+def test_failure_recorded(broken_runner, monkeypatch):
+    upgrades = record_upgrades(broken_runner, monkeypatch)
+
+    with pytest.raises(AlembicTestFailure) as e:
+        tests.test_up_down_consistency(broken_runner)
+
+    assert upgrades == []
+
+    message = str(e.value)
+    assert "Failed to upgrade through each revision individually" in message
+    assert "Failing Revision:\n    bbbbbbbbbbbb" in message
+
+
+def test_checkpoints_bounded():
+    assert migration_plan.checkpoints.budget == DEFAULT_CHECKPOINT_BUDGET
+    assert migration_plan.checkpoints.size <= DEFAULT_CHECKPOINT_BUDGET
+
+
+def test_failure_attributed_despite_eviction(broken_runner):
+    # Every checkpoint is evicted as soon as it is captured.
+    migration_plan.reset(CheckpointStore(budget=1))
+    try:
+        with pytest.raises(AlembicTestFailure) as e:
+            tests.test_upgrade(broken_runner)
+    finally:
+        migration_plan.reset()
+
+    assert "Failing Revision:\n    bbbbbbbbbbbb" in str(e.value)
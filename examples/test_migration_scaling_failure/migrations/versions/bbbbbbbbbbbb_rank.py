@@ -0,0 +1,20 @@
+import sqlalchemy as sa
+from alembic import op
+
+revision = "bbbbbbbbbbbb"
+down_revision = "aaaaaaaaaaaa"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Rank users through a correlated (unindexed) subquery, which is quadratic.
+    op.add_column("user", sa.Column("rank", sa.Integer(), nullable=True))
+    op.execute(
+        'UPDATE "user" SET rank = '
+        '(SELECT count(*) FROM "user" AS other WHERE other.name < "user".name)'
+    )
+
+
+def downgrade():
+    op.drop_column("user", "rank")
@@ -0,0 +1,6 @@
+import pytest
+
+
+@pytest.fixture
+def alembic_config():
+    return {"scaling_sizes": [1000, 2000, 4000], "scaling_exponent": 1.5}
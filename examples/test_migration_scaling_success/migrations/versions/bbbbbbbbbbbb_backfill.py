@@ -0,0 +1,16 @@
+import sqlalchemy as sa
+from alembic import op
+
+revision = "bbbbbbbbbbbb"
+down_revision = "aaaaaaaaaaaa"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("user", sa.Column("active", sa.Boolean(), nullable=True))
+    op.execute('UPDATE "user" SET active = 1')
+
+
+def downgrade():
+    op.drop_column("user", "active")
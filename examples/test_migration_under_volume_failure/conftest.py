@@ -0,0 +1,6 @@
+import pytest
+
+
+@pytest.fixture
+def alembic_config():
+    return {"data_volume": {"user": 1000}, "upgrade_budget": {"bbbbbbbbbbbb": 0}}
@@ -0,0 +1,20 @@
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import text
+
+revision = "bbbbbbbbbbbb"
+down_revision = "aaaaaaaaaaaa"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+    assert conn.execute(text('SELECT count(*) FROM "user"')).scalar() == 1000
+
+    op.add_column("user", sa.Column("active", sa.Boolean(), nullable=True))
+    op.execute('UPDATE "user" SET active = 1')
+
+
+def downgrade():
+    op.drop_column("user", "active")
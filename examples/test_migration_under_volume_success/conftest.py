@@ -0,0 +1,6 @@
+import pytest
+
+
+@pytest.fixture
+def alembic_config():
+    return {"data_volume": 1000, "upgrade_budget": 30, "upgrade_row_budget": 0.01}
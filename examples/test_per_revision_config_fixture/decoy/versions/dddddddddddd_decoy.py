@@ -0,0 +1,12 @@
+revision = "dddddddddddd"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    raise NotImplementedError
+
+
+def downgrade():
+    raise NotImplementedError
@@ -0,0 +1,24 @@
+import pytest
+from sqlalchemy import create_engine, event
+
+from pytest_alembic import Config, create_alembic_fixture
+
+alembic_unpinned = create_alembic_fixture()
+
+
+@pytest.fixture
+def alembic_config():
+    return Config(pin_connection=True)
+
+
+@pytest.fixture
+def checkouts():
+    return []
+
+
+@pytest.fixture
+def alembic_engine(tmp_path, checkouts):
+    engine = create_engine(f"sqlite:///{tmp_path / 'db.sqlite'}")
+    event.listen(engine, "checkout", lambda *args: checkouts.append(args))
+    yield engine
+    engine.dispose()
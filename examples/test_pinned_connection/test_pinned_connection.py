@@ -0,0 +1,39 @@
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.exc import IntegrityError
+
+
+def test_single_checkout(alembic_runner, alembic_engine, checkouts):
+    alembic_runner.migrate_up_to("heads")
+    alembic_runner.insert_into("user", {"id": 1, "email": "a@example.com"})
+    alembic_runner.generate_data({"order": 10})
+    user = alembic_runner.table_at_revision("user")
+    alembic_runner.migrate_down_to("base")
+    alembic_runner.migrate_up_to("heads")
+    assert len(checkouts) == 1
+
+    # Everything performed by the runner is committed, and visible elsewhere.
+    alembic_runner.insert_into("user", {"id": 2, "email": "b@example.com"})
+    with alembic_engine.connect() as conn:
+        assert conn.execute(select(user.c.email)).scalars().all() == ["b@example.com"]
+
+
+def test_failure_is_rolled_back(alembic_runner, alembic_engine):
+    alembic_runner.migrate_up_to("heads")
+    alembic_runner.insert_into("user", {"id": 1, "email": "a@example.com"})
+    with pytest.raises(IntegrityError):
+        alembic_runner.insert_into("user", {"id": 1, "email": "a@example.com"})
+
+    alembic_runner.insert_into("user", {"id": 2, "email": "b@example.com"})
+    with alembic_engine.connect() as conn:
+        assert conn.execute(text('SELECT count(*) FROM "user"')).scalar() == 2
+
+
+def test_unpinned(alembic_unpinned, alembic_engine, checkouts):
+    """By default, `env.py` receives the engine itself, and connects for each step."""
+    alembic_unpinned.migrate_up_to("heads")
+    alembic_unpinned.migrate_down_to("base")
+    assert len(checkouts) > 1
+
+    attributes = alembic_unpinned.command_executor.alembic_config.attributes
+    assert attributes["connection"] is alembic_engine
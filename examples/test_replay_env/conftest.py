@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture
+def alembic_config():
+    return {
+        "replay_env": True,
+        "before_revision_data": {"cccccccccccc": {"__tablename__": "foo", "id": 1}},
+    }
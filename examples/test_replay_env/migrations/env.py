@@ -0,0 +1,27 @@
+from logging.config import fileConfig
+
+from alembic import context
+from models import Base
+from sqlalchemy import engine_from_config, pool
+
+fileConfig(context.config.config_file_name)
+target_metadata = Base.metadata
+
+attributes = context.config.attributes
+attributes["env_executions"] = attributes.get("env_executions", 0) + 1
+
+
+connectable = context.config.attributes.get("connection", None)
+
+if connectable is None:
+    connectable = engine_from_config(
+        context.config.get_section(context.config.config_ini_section),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+
+with connectable.connect() as connection:
+    context.configure(connection=connection, target_metadata=target_metadata)
+
+    with context.begin_transaction():
+        context.run_migrations()
@@ -0,0 +1,15 @@
+from sqlalchemy import text
+
+
+def test_env_executed_once(alembic_runner, alembic_engine):
+    alembic_runner.migrate_up_to("heads")
+    alembic_runner.migrate_down_to("aaaaaaaaaaaa")
+    alembic_runner.set_revision("bbbbbbbbbbbb")
+    alembic_runner.migrate_up_to("heads")
+
+    attributes = alembic_runner.command_executor.alembic_config.attributes
+    assert attributes["env_executions"] == 1
+
+    with alembic_engine.connect() as conn:
+        result = conn.execute(text("SELECT version_num FROM alembic_version")).fetchall()
+    assert result == [("cccccccccccc",)]
@@ -0,0 +1,25 @@
+import pathlib
+
+import pytest
+
+from pytest_alembic.revision_data import CSVFile
+
+data = pathlib.Path(__file__).parent / "data"
+
+
+def rows():
+    yield {"__tablename__": "foo", "id": 6}
+
+
+@pytest.fixture
+def alembic_config():
+    return {
+        "before_revision_data": {
+            "bbbbbbbbbbbb": [
+                CSVFile(data / "foo.csv"),
+                data / "foo.jsonl",
+                data / "foo.sql",
+                rows,
+            ]
+        }
+    }
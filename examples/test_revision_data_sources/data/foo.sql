@@ -0,0 +1,3 @@
+-- A dump of rows.
+INSERT INTO foo (id)
+VALUES (5);
@@ -0,0 +1,17 @@
+from alembic import op
+from sqlalchemy import text
+
+revision = "bbbbbbbbbbbb"
+down_revision = "aaaaaaaaaaaa"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+    result = conn.execute(text("SELECT id FROM foo ORDER BY id")).fetchall()
+    assert [row.id for row in result] == [1, 2, 3, 4, 5, 6]
+
+
+def downgrade():
+    pass
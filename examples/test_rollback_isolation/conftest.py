@@ -0,0 +1,22 @@
+import pytest
+from sqlalchemy import create_engine
+
+from pytest_alembic import Config
+
+
+@pytest.fixture
+def alembic_config():
+    return Config(
+        pin_connection=True,
+        rollback_isolation=True,
+        at_revision_data={"aaaaaaaaaaaa": {"__tablename__": "foo", "id": 2}},
+    )
+
+
+@pytest.fixture(scope="session")
+def alembic_engine(tmp_path_factory):
+    """Share one database across every test in the session."""
+    path = tmp_path_factory.mktemp("db") / "db.sqlite"
+    engine = create_engine(f"sqlite:///{path}")
+    yield engine
+    engine.dispose()
@@ -0,0 +1,28 @@
+from sqlalchemy import inspect, select
+
+
+def migrate_and_insert(alembic_runner):
+    assert alembic_runner.current == "base"
+
+    alembic_runner.migrate_up_to("heads")
+    alembic_runner.insert_into("foo", {"id": 10})
+
+    foo = alembic_runner.table_at_revision("foo")
+    rows = alembic_runner.connection_executor.run_task(
+        lambda connection: connection.execute(select(foo.c.id).order_by(foo.c.id)).scalars().all()
+    )
+    assert rows == [1, 2, 10]
+
+
+def test_first(alembic_runner):
+    migrate_and_insert(alembic_runner)
+
+
+def test_second(alembic_runner):
+    """Starts from an empty database, despite `test_first` having used the same one."""
+    migrate_and_insert(alembic_runner)
+
+
+def test_database_is_untouched(alembic_engine):
+    with alembic_engine.connect() as connection:
+        assert inspect(connection).get_table_names() == []
@@ -0,0 +1,9 @@
+import pytest
+
+from pytest_alembic.synthetic import SyntheticData
+
+
+@pytest.fixture
+def alembic_config():
+    data = SyntheticData({"user": 100, "order": 1000}, seed=1)
+    return {"before_revision_data": {"bbbbbbbbbbbb": data}}
@@ -0,0 +1,17 @@
+from alembic import op
+from sqlalchemy import text
+
+revision = "bbbbbbbbbbbb"
+down_revision = "aaaaaaaaaaaa"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+    assert conn.execute(text('SELECT count(*) FROM "user"')).scalar() == 100
+    assert conn.execute(text('SELECT count(*) FROM "order"')).scalar() == 1000
+
+
+def downgrade():
+    pass
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, ForeignKey, types
+
+try:
+    from sqlalchemy.orm import declarative_base
+except ImportError:
+    from sqlalchemy.ext.declarative import declarative_base
+
+
+Base = declarative_base()
+
+
+class User(Base):
+    __tablename__ = "user"
+
+    id = Column(types.Integer(), autoincrement=True, primary_key=True)
+    email = Column(types.Unicode(64), nullable=False, unique=True)
+    created_at = Column(types.DateTime(), nullable=True)
+
+
+class Order(Base):
+    __tablename__ = "order"
+
+    id = Column(types.Integer(), autoincrement=True, primary_key=True)
+    user_id = Column(types.Integer(), ForeignKey("user.id"), nullable=False)
+    total = Column(types.Numeric(10, 2), nullable=False)
@@ -0,0 +1,13 @@
+from sqlalchemy import text
+
+
+def test_generate_data(alembic_runner, alembic_engine):
+    alembic_runner.migrate_up_to("heads")
+    alembic_runner.generate_data({"order": 500, "user": 10})
+
+    with alembic_engine.connect() as conn:
+        users = conn.execute(text('SELECT count(*) FROM "user"')).scalar()
+        orders = conn.execute(text('SELECT count(*) FROM "order"')).scalar()
+
+    assert users == 110
+    assert orders == 1500
@@ -0,0 +1,27 @@
+import pytest
+from sqlalchemy import create_engine
+
+from pytest_alembic import Config, create_alembic_fixture
+
+MODES = ["revision", "single", "savepoint"]
+
+alembic_revision = create_alembic_fixture(Config(pin_connection=True, transaction_mode="revision"))
+alembic_single = create_alembic_fixture(Config(pin_connection=True, transaction_mode="single"))
+alembic_savepoint = create_alembic_fixture(
+    Config(pin_connection=True, transaction_mode="savepoint")
+)
+alembic_checkpointed = create_alembic_fixture(
+    Config(pin_connection=True, transaction_mode="single", checkpoints=True)
+)
+
+
+@pytest.fixture(params=MODES)
+def runner(request):
+    return request.getfixturevalue(f"alembic_{request.param}")
+
+
+@pytest.fixture
+def alembic_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'db.sqlite'}")
+    yield engine
+    engine.dispose()
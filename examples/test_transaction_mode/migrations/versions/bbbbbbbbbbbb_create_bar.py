@@ -0,0 +1,17 @@
+import sqlalchemy as sa
+from alembic import op
+
+revision = "bbbbbbbbbbbb"
+down_revision = "aaaaaaaaaaaa"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table("bar", sa.Column("id", sa.Integer(), primary_key=True))
+    op.execute("INSERT INTO foo (id) VALUES (1)")
+
+
+def downgrade():
+    op.execute("DELETE FROM foo")
+    op.drop_table("bar")
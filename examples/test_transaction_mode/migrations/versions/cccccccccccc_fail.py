@@ -0,0 +1,16 @@
+import sqlalchemy as sa
+from alembic import op
+
+revision = "cccccccccccc"
+down_revision = "bbbbbbbbbbbb"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("bar", sa.Column("name", sa.Unicode()))
+    op.execute("INSERT INTO foo (id) VALUES (1)")
+
+
+def downgrade():
+    op.drop_column("bar", "name")
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, types
+
+try:
+    from sqlalchemy.orm import declarative_base
+except ImportError:
+    from sqlalchemy.ext.declarative import declarative_base
+
+
+Base = declarative_base()
+
+
+class Foo(Base):
+    __tablename__ = "foo"
+
+    id = Column(types.Integer(), autoincrement=True, primary_key=True)
+
+
+class Bar(Base):
+    __tablename__ = "bar"
+
+    id = Column(types.Integer(), autoincrement=True, primary_key=True)
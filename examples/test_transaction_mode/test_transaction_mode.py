@@ -0,0 +1,54 @@
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from pytest_alembic.plugin.plan import migration_plan
+
+
+def read_state(url):
+    """Read the committed state of the database, through a separate engine."""
+    engine = create_engine(url)
+    try:
+        with engine.connect() as connection:
+            tables = sorted(inspect(connection).get_table_names())
+            rows = None
+            if "foo" in tables:
+                rows = connection.execute(text("SELECT count(*) FROM foo")).scalar()
+            return tables, rows
+    finally:
+        engine.dispose()
+
+
+def test_roundtrip(runner, alembic_engine):
+    assert runner.migrate_up_to("bbbbbbbbbbbb") == "bbbbbbbbbbbb"
+    assert read_state(alembic_engine.url) == (["alembic_version", "bar", "foo"], 1)
+
+    assert runner.migrate_down_to("base") == "base"
+    assert read_state(alembic_engine.url) == (["alembic_version"], None)
+
+
+@pytest.mark.parametrize(
+    ("fixture", "current", "state"),
+    [
+        ("alembic_revision", "bbbbbbbbbbbb", (["alembic_version", "bar", "foo"], 1)),
+        ("alembic_savepoint", "bbbbbbbbbbbb", (["alembic_version", "bar", "foo"], 1)),
+        ("alembic_single", "base", (["alembic_version"], None)),
+    ],
+)
+def test_failure(request, alembic_engine, fixture, current, state):
+    runner = request.getfixturevalue(fixture)
+    with pytest.raises(Exception, match="UNIQUE constraint failed"):
+        runner.migrate_up_to("heads")
+
+    assert runner.current == current
+    assert read_state(alembic_engine.url) == state
+
+
+def test_checkpoints_rejected(alembic_checkpointed):
+    with pytest.raises(ValueError, match="cannot be combined with `checkpoints`"):
+        alembic_checkpointed.migrate_up_to("heads")
+
+
+def test_built_in_upgrades_not_shared(alembic_revision, alembic_single):
+    """The built-in tests' shared (checkpointed) upgrades would otherwise ignore the mode."""
+    assert migration_plan.shares(alembic_revision)
+    assert not migration_plan.shares(alembic_single)
@@ -0,0 +1,6 @@
+import pytest
+
+
+@pytest.fixture
+def alembic_engine(alembic_worker_engine):
+    return alembic_worker_engine
@@ -0,0 +1,15 @@
+from sqlalchemy import inspect
+
+
+def test_worker_database(alembic_engine, tmp_path_factory):
+    path = tmp_path_factory.getbasetemp() / "alembic-master.sqlite"
+    assert alembic_engine.url.database == str(path)
+
+
+def test_migrate(alembic_runner, alembic_engine):
+    alembic_runner.migrate_up_to("heads")
+    assert inspect(alembic_engine).has_table("foo")
+
+
+def test_database_is_removed(alembic_engine):
+    assert inspect(alembic_engine).get_table_names() == []
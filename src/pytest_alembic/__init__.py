@@ -1,10 +1,14 @@
+from pytest_alembic.async_runner import async_runner, AsyncMigrationContext
 from pytest_alembic.config import Config
-from pytest_alembic.plugin.fixtures import create_alembic_fixture
+from pytest_alembic.plugin.fixtures import create_alembic_fixture, create_async_alembic_fixture
 from pytest_alembic.runner import MigrationContext, runner
 
 __all__ = [
+    "AsyncMigrationContext",
     "Config",
     "MigrationContext",
+    "async_runner",
     "create_alembic_fixture",
+    "create_async_alembic_fixture",
     "runner",
 ]
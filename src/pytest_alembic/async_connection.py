@@ -0,0 +1,148 @@
+import asyncio
+import contextlib
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Coroutine, TypeVar
+
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from pytest_alembic.executor import pinned_transaction
+
+T = TypeVar("T")
+
+
+@dataclass
+class EventLoopThread:
+    """An event loop, running in a dedicated thread, onto which coroutines are dispatched.
+
+    Coroutines can be dispatched from any other thread, whether or not that thread is
+    itself running an event loop. Objects bound to the loop (such as async database
+    connections) therefore outlive any individual `asyncio.run`.
+    """
+
+    loop: asyncio.AbstractEventLoop
+    thread: threading.Thread
+
+    @classmethod
+    def start(cls) -> "EventLoopThread":
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(
+            target=loop.run_forever, name="pytest-alembic-event-loop", daemon=True
+        )
+        thread.start()
+        return cls(loop=loop, thread=thread)
+
+    def run(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        """Run `coroutine` on the loop, blocking until it completes."""
+        if threading.current_thread() is self.thread:
+            coroutine.close()
+            message = "Cannot block on the runner's event loop, from within the loop itself."
+            raise RuntimeError(message)
+
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    async def run_async(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        """Run `coroutine` on the loop, awaiting it from whichever loop is currently running."""
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coroutine, self.loop))
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+class PinnedAsyncEngine(AsyncEngine):
+    """A runner-owned `AsyncConnection`, supplied to `env.py` in place of an `AsyncEngine`.
+
+    The connection is opened on a runner-owned `EventLoopThread`, onto which every use of
+    it is dispatched. Rather than creating (and disposing of) a pool per step:
+
+    - `connect()` (and `begin()`) produce a proxy of the connection, whose `run_sync`
+      dispatches onto the runner's loop, from whichever loop `env.py` runs itself.
+    - `dispose()` does nothing, the engine is disposed of once the runner is done.
+
+    This subclasses `AsyncEngine`, such that `env.py` files which decide whether to run
+    asynchronously through ``isinstance(connectable, AsyncEngine)`` still do so.
+    """
+
+    __slots__ = ("connection", "event_loop")
+
+    def __init__(self, engine: AsyncEngine):
+        super().__init__(engine.sync_engine)
+        self.event_loop = EventLoopThread.start()
+        self.connection: AsyncConnection = self.event_loop.run(engine.connect().start())
+
+    def connect(self) -> "PinnedAsyncConnection":  # type: ignore[override]
+        return PinnedAsyncConnection(self)
+
+    @contextlib.asynccontextmanager
+    async def begin(self):
+        yield self.connect()
+
+    async def dispose(self, close: bool = True):  # noqa: FBT001, FBT002
+        pass
+
+    def run_sync(self, fn: Callable[..., T], **kwargs) -> T:
+        """Run `fn` with the pinned (sync) `Connection`, blocking until it completes."""
+        return self.event_loop.run(self.connection.run_sync(fn, **kwargs))
+
+    def run_task(self, fn: Callable[..., T], **kwargs) -> T:
+        """Run `fn` with the pinned `Connection`, committing (or on failure, rolling back) after."""
+
+        def run_task(connection: Connection) -> T:
+            with pinned_transaction(connection):
+                return fn(connection=connection, **kwargs)
+
+        return self.run_sync(run_task)
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """Settle the pinned connection's transaction around a step executed through `env.py`."""
+        self.run_sync(_end_transaction, commit=True)
+        try:
+            yield
+        except BaseException:
+            self.run_sync(_end_transaction, commit=False)
+            raise
+        self.run_sync(_end_transaction, commit=True)
+
+    def close(self):
+        self.event_loop.run(self.connection.close())
+        # The pool's connections are bound to the runner's loop, so can't outlive it.
+        self.event_loop.run(AsyncEngine.dispose(self))
+        self.event_loop.close()
+
+
+@dataclass
+class PinnedAsyncConnection:
+    """Stand in for an `AsyncConnection`, dispatching onto a `PinnedAsyncEngine`'s connection."""
+
+    engine: PinnedAsyncEngine
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    async def run_sync(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        connection = self.engine.connection
+        return await self.engine.event_loop.run_async(connection.run_sync(fn, *args, **kwargs))
+
+    async def commit(self):
+        await self.engine.event_loop.run_async(self.engine.connection.commit())
+
+    async def rollback(self):
+        await self.engine.event_loop.run_async(self.engine.connection.rollback())
+
+    def __getattr__(self, attr):
+        return getattr(self.engine.connection, attr)
+
+
+def _end_transaction(connection: Connection, *, commit: bool):
+    if connection.in_transaction():
+        if commit:
+            connection.commit()
+        else:
+            connection.rollback()
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import inspect
+import weakref
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, TYPE_CHECKING, TypeVar
+
+from pytest_alembic.executor import (
+    _is_async_engine,
+    CommandExecutor,
+    ConnectionExecutor,
+    PinnedConnection,
+)
+from pytest_alembic.runner import MigrationContext
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+    from pytest_alembic.config import Config
+    from pytest_alembic.history import AlembicHistory
+    from pytest_alembic.revision_data import DataSource
+
+T = TypeVar("T")
+
+# Alembic installs its `context` and `op` proxies globally, so executions of `env.py` by
+# runners sharing an event loop must not interleave.
+_env_locks: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock] = (
+    weakref.WeakKeyDictionary()
+)
+
+# The errors raised by asyncio, when a loop is started (e.g. `asyncio.run`) while one is running.
+_nested_loop_errors = (
+    "cannot be called from a running event loop",
+    "This event loop is already running",
+    "Cannot run the event loop while another loop is running",
+)
+
+
+@contextlib.asynccontextmanager
+async def async_runner(config: Config, engine: AsyncEngine) -> AsyncIterator[AsyncMigrationContext]:
+    """Manage the alembic execution context, over a single connection of an `AsyncEngine`.
+
+    Yields:
+        `AsyncMigrationContext` to the caller.
+    """
+    if not _is_async_engine(engine):
+        message = (
+            f"An `AsyncEngine` is required to produce an `AsyncMigrationContext`, got {engine!r}."
+        )
+        raise TypeError(message)
+
+    async with engine.connect() as connection:
+        sync_connection = connection.sync_connection
+        assert sync_connection is not None
+
+        command_executor = CommandExecutor.from_config(config)
+        command_executor.configure(connection=PinnedConnection(sync_connection))
+        connection_executor = ConnectionExecutor(sync_connection, pinned=True)
+
+        context = MigrationContext.from_config(config, command_executor, connection_executor)
+        yield AsyncMigrationContext(context=context, connection=connection)
+
+
+@dataclass
+class AsyncMigrationContext:
+    """Within a given environment/execution context, executes alembic commands from async code.
+
+    Each method awaits its equivalent on the wrapped (synchronous) `MigrationContext`,
+    executed through `AsyncConnection.run_sync` on a single connection. The database is
+    therefore only ever accessed on the caller's event loop, without nesting loops.
+
+    `env.py` is supplied that connection's sync `Connection`, so it must be able to run
+    migrations synchronously, when given one (see :ref:`A slightly more versatile setup`).
+    An `env.py` which unconditionally calls `asyncio.run` (as alembic's async template
+    does) raises a `RuntimeError`.
+
+    Independent runners (for example, of different histories) can run concurrently,
+    such as through `asyncio.gather`. Only the executions of `env.py` are serialized.
+
+    Examples:
+        >>> async def test_specific_migration(async_alembic_runner):
+        ...     await async_alembic_runner.migrate_up_to('xxxxxxx')
+        ...     assert await async_alembic_runner.current == 'xxxxxxx'
+    """
+
+    context: MigrationContext
+    connection: AsyncConnection
+
+    @property
+    def config(self) -> Config:
+        return self.context.config
+
+    @property
+    def history(self) -> AlembicHistory:
+        return self.context.history
+
+    @property
+    def heads(self) -> list[str]:
+        """Get the list of revision heads."""
+        return self.context.heads
+
+    @property
+    def current(self) -> Awaitable[str]:
+        """Get the current revision, as an awaitable."""
+        return self.run(lambda context: context.current)
+
+    async def migrate_up_to(self, revision: str, *, return_current: bool = True):
+        """Migrate up to, and including the given `revision`."""
+        return await self.run(
+            MigrationContext.migrate_up_to, revision, return_current=return_current
+        )
+
+    async def migrate_down_to(self, revision: str, *, return_current: bool = True):
+        """Migrate down to, and including the given `revision`."""
+        return await self.run(
+            MigrationContext.migrate_down_to, revision, return_current=return_current
+        )
+
+    async def insert_into(
+        self, table: str | None, data: dict | list | DataSource | None = None, revision=None
+    ):
+        """Insert data into a given table.
+
+        See :meth:`pytest_alembic.runner.MigrationContext.insert_into`.
+        """
+        await self.run(
+            MigrationContext.insert_into, table, data, revision, exclusive=revision is None
+        )
+
+    async def table_at_revision(self, name, *, revision=None, schema=None):
+        """Return a reference to a `sqlalchemy.Table` at the given revision.
+
+        See :meth:`pytest_alembic.runner.MigrationContext.table_at_revision`.
+        """
+        return await self.run(
+            MigrationContext.table_at_revision,
+            name,
+            revision=revision,
+            schema=schema,
+            exclusive=revision is None,
+        )
+
+    async def run(
+        self, fn: Callable[..., T], *args: Any, exclusive: bool = True, **kwargs: Any
+    ) -> T:
+        """Call `fn` with the synchronous `MigrationContext`, through `AsyncConnection.run_sync`.
+
+        This allows any `MigrationContext` method to be awaited, for example
+        ``await async_alembic_runner.run(MigrationContext.roundtrip_next_revision)``.
+
+        Args:
+            fn: Called with the `MigrationContext`, followed by `args` and `kwargs`.
+            *args: Positional arguments to `fn`.
+            **kwargs: Keyword arguments to `fn`.
+            exclusive: Whether `fn` may execute `env.py`, and so must not run concurrently
+                with any other runner's use of `env.py`.
+        """
+
+        def run_sync(_) -> T:
+            try:
+                return fn(self.context, *args, **kwargs)
+            except RuntimeError as e:
+                if not any(error in str(e) for error in _nested_loop_errors):
+                    raise
+
+                _close_unstarted(e.__traceback__)
+                message = (
+                    "`env.py` attempted to start an event loop (such as through `asyncio.run`), "
+                    "from within `async_alembic_runner`'s. `env.py` is executed on the test's "
+                    "running event loop, and so must run migrations synchronously when given a "
+                    "sync `Connection` (see 'A slightly more versatile setup', in the asyncio "
+                    "docs). Alternatively, use the (sync) `alembic_runner` fixture."
+                )
+                raise RuntimeError(message) from e
+
+        if not exclusive:
+            return await self.connection.run_sync(run_sync)
+
+        async with _env_lock():
+            return await self.connection.run_sync(run_sync)
+
+
+def _env_lock() -> asyncio.Lock:
+    loop = asyncio.get_running_loop()
+    lock = _env_locks.get(loop)
+    if lock is None:
+        lock = _env_locks[loop] = asyncio.Lock()
+    return lock
+
+
+def _close_unstarted(traceback: TracebackType | None):
+    """Close the coroutine given to an `asyncio.run` which failed, as it will never be awaited."""
+    while traceback is not None:
+        frame = traceback.tb_frame
+        if frame.f_code is asyncio.run.__code__:
+            coroutine = frame.f_locals.get("main")
+            if inspect.iscoroutine(coroutine):
+                coroutine.close()
+        traceback = traceback.tb_next
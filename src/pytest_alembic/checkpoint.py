@@ -0,0 +1,633 @@
+import abc
+import collections
+import contextlib
+import hashlib
+import os
+import shutil
+import sqlite3
+import uuid
+import warnings
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, OrderedDict, Tuple, TYPE_CHECKING
+
+from sqlalchemy.engine import Connection
+
+from pytest_alembic.revision_data import RevisionData
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from pytest_alembic.config import Config
+    from pytest_alembic.runner import MigrationContext
+
+HEAD_CACHE_DIR = "pytest-alembic-head-cache"
+HEAD_CACHE_KEY = "pytest-alembic/head-cache"
+
+
+class CheckpointBackend(abc.ABC):
+    """Snapshot and restore the complete contents of a database.
+
+    Backends are selected per-connection through :meth:`supports`, such that a
+    `CheckpointStore` can hold snapshots for whichever database the runner is
+    pointed at, and silently disable checkpointing for those it cannot handle.
+    """
+
+    @abc.abstractmethod
+    def supports(self, connection: Connection) -> bool:
+        """Whether the backend can checkpoint the database of `connection`."""
+
+    @abc.abstractmethod
+    def fingerprint(self, connection: Connection) -> str:
+        """Produce a stable identifier of the database's current contents."""
+
+    @abc.abstractmethod
+    def snapshot(self, connection: Connection) -> Tuple[Any, int]:
+        """Capture the database, returning the snapshot and its size in bytes."""
+
+    @abc.abstractmethod
+    def restore(self, connection: Connection, snapshot: Any):
+        """Replace the contents of the database with a previously captured `snapshot`."""
+
+    @abc.abstractmethod
+    def snapshot_fingerprint(self, snapshot: Any) -> str:
+        """Produce the :meth:`fingerprint` of the database `snapshot` was captured from."""
+
+    def release(self, snapshot: Any):  # noqa: B027
+        """Free any resources held by a `snapshot` which is no longer needed.
+
+        By default, nothing is held.
+        """
+
+
+class SQLiteBackend(CheckpointBackend):
+    """Checkpoint SQLite databases through the sqlite3 online backup API.
+
+    Snapshots are held as in-memory sqlite3 connections, and are copied page-by-page
+    in either direction, which works identically for in-memory and file-backed databases.
+    """
+
+    def supports(self, connection: Connection) -> bool:
+        return isinstance(dbapi_connection(connection), sqlite3.Connection)
+
+    def fingerprint(self, connection: Connection) -> str:
+        return self.snapshot_fingerprint(dbapi_connection(connection))
+
+    def snapshot(self, connection: Connection) -> Tuple[Any, int]:
+        snapshot = sqlite3.connect(":memory:", check_same_thread=False)
+        dbapi_connection(connection).backup(snapshot)
+
+        page_count = snapshot.execute("PRAGMA page_count").fetchone()[0]
+        page_size = snapshot.execute("PRAGMA page_size").fetchone()[0]
+        return snapshot, page_count * page_size
+
+    def restore(self, connection: Connection, snapshot: Any):
+        snapshot.backup(dbapi_connection(connection))
+
+    def snapshot_fingerprint(self, snapshot: Any) -> str:
+        digest = hashlib.sha1()  # noqa: S324
+        for statement in snapshot.iterdump():
+            digest.update(statement.encode("utf-8"))
+        return digest.hexdigest()
+
+    def release(self, snapshot: Any):
+        snapshot.close()
+
+
+@dataclass
+class Checkpoint:
+    key: str
+    revision: str
+    backend: CheckpointBackend
+    snapshot: Any
+    size: int
+
+    # The backend's fingerprint of the snapshot, once computed.
+    fingerprint: Optional[str] = None
+
+
+@dataclass
+class CheckpointStore:
+    """Hold database snapshots, taken after each revision of an upgrade.
+
+    Checkpoints are keyed by a chain of revision ids and revision file hashes, starting
+    from a fingerprint of the database at "base". A checkpoint's key therefore
+    changes if any revision (or the starting state) which lead up to it changes.
+
+    Checkpoints are evicted in least-recently-used order, once the total size of the
+    stored snapshots exceeds `budget` bytes (if set).
+    """
+
+    budget: Optional[int] = None
+    backends: List[CheckpointBackend] = field(default_factory=lambda: [SQLiteBackend()])
+
+    checkpoints: OrderedDict[str, Checkpoint] = field(default_factory=collections.OrderedDict)
+    file_hashes: Dict[str, str] = field(default_factory=dict)
+    size: int = 0
+
+    @classmethod
+    def from_config(cls, config: "Config") -> Optional["CheckpointStore"]:
+        if isinstance(config.checkpoints, CheckpointStore):
+            return config.checkpoints
+
+        if config.checkpoints:
+            return checkpoint_cache.store(config.checkpoint_budget)
+        return None
+
+    def backend(self, connection: Connection) -> Optional[CheckpointBackend]:
+        for backend in self.backends:
+            if backend.supports(connection):
+                return backend
+        return None
+
+    def base_key(self, connection: Connection, config: "Config") -> Optional[str]:
+        """Produce the root of the key chain, or `None` if no backend supports `connection`.
+
+        Alongside the database's own contents, the configured revision data (through the
+        contents of its sources, see `DataSource.fingerprint`) and skipped revisions are
+        included, as they affect the state produced by an upgrade. Revision data which
+        cannot be identified also produces `None`.
+        """
+        backend = self.backend(connection)
+        if backend is None:
+            return None
+
+        revision_data = RevisionData.from_config(config).fingerprint()
+        if revision_data is None:
+            return None
+
+        fingerprint = backend.fingerprint(connection)
+        return _hash("base", fingerprint, revision_data, repr(config.skip_revisions))
+
+    def key(self, parent_key: str, revision: str, path: Optional[str] = None) -> str:
+        """Produce the key of `revision`, given the key of the revision preceding it."""
+        file_hash = ""
+        if path is not None:
+            file_hash = _file_hash(path, self.file_hashes)
+
+        return _hash(parent_key, revision, file_hash)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.checkpoints
+
+    def get(self, key: str) -> Optional[Checkpoint]:
+        checkpoint = self.checkpoints.get(key)
+        if checkpoint is not None:
+            self.checkpoints.move_to_end(key)
+        return checkpoint
+
+    def put(self, checkpoint: Checkpoint):
+        existing = self.checkpoints.pop(checkpoint.key, None)
+        if existing is not None:
+            self.size -= existing.size
+            if existing is not checkpoint:
+                existing.backend.release(existing.snapshot)
+
+        self.checkpoints[checkpoint.key] = checkpoint
+        self.size += checkpoint.size
+
+        while self.budget is not None and self.size > self.budget and self.checkpoints:
+            self.discard(next(iter(self.checkpoints)))
+
+    def discard(self, key: str):
+        checkpoint = self.checkpoints.pop(key, None)
+        if checkpoint is not None:
+            self.size -= checkpoint.size
+            checkpoint.backend.release(checkpoint.snapshot)
+
+    def clear(self):
+        for checkpoint in self.checkpoints.values():
+            checkpoint.backend.release(checkpoint.snapshot)
+        self.checkpoints.clear()
+        self.size = 0
+
+    def matches(self, connection: Connection, key: str) -> bool:
+        """Whether the database's contents are exactly those of the checkpoint at `key`.
+
+        The database may have been written to since the checkpoint was captured or restored,
+        other than through the runner (for example, through the `alembic_engine`).
+        """
+        checkpoint = self.checkpoints.get(key)
+        if checkpoint is None:
+            return False
+
+        if checkpoint.fingerprint is None:
+            checkpoint.fingerprint = checkpoint.backend.snapshot_fingerprint(checkpoint.snapshot)
+        return checkpoint.backend.fingerprint(connection) == checkpoint.fingerprint
+
+    def namespace(self, script_dir: str, history: str) -> "CheckpointStore":  # noqa: ARG002
+        """Produce the store to use for the history identified by `script_dir` and `history`.
+
+        By default, every history shares the one store.
+        """
+        return self
+
+    def capture(self, connection: Connection, key: str, revision: str) -> Optional[Checkpoint]:
+        """Snapshot the database at `revision`, if a backend supports it."""
+        backend = self.backend(connection)
+        if backend is None:
+            return None
+
+        snapshot, size = backend.snapshot(connection)
+        checkpoint = Checkpoint(
+            key=key, revision=revision, backend=backend, snapshot=snapshot, size=size
+        )
+        self.put(checkpoint)
+        return checkpoint
+
+    def restore(self, connection: Connection, key: str) -> Optional[Checkpoint]:
+        """Restore the database to the checkpoint at `key`, if one exists."""
+        checkpoint = self.get(key)
+        if checkpoint is None:
+            return None
+
+        checkpoint.backend.restore(connection, checkpoint.snapshot)
+        return checkpoint
+
+
+@dataclass
+class CheckpointCache:
+    """Share a `CheckpointStore` between every runner configured with `checkpoints=True`.
+
+    One store is held per `checkpoint_budget`, for the session. Checkpoint keys already
+    identify the database, revisions and revision data they were captured from, such
+    that runners of different configurations (or histories) can safely share a store.
+    """
+
+    stores: Dict[Optional[int], CheckpointStore] = field(default_factory=dict)
+
+    def store(self, budget: Optional[int] = None) -> CheckpointStore:
+        store = self.stores.get(budget)
+        if store is None:
+            store = self.stores[budget] = CheckpointStore(budget=budget)
+        return store
+
+    def clear(self):
+        for store in self.stores.values():
+            store.clear()
+        self.stores.clear()
+
+
+@dataclass
+class FileCheckpointStore(CheckpointStore):
+    """Publish checkpoints as SQLite database files, shared between processes.
+
+    Each checkpoint is published by whichever process first captures it, and is restored
+    by any other process (such as another pytest-xdist worker) which reaches the same key,
+    rather than it re-executing the revisions leading up to it. Snapshots are written to a
+    temporary file and hard-linked into place, such that a published file is always
+    complete, and concurrent publications of the same checkpoint leave the first in place.
+
+    Through :meth:`namespace`, each history is stored in its own directory. Whenever a
+    history's directory is opened, the directories of other histories of the same script
+    directory, which have not been used by the current run (`run_id`), are removed.
+
+    Only SQLite databases are checkpointed to files. Snapshots of any other database are
+    held in memory, as with `CheckpointStore`.
+    """
+
+    directory: Path = Path(".pytest_cache", "d", "pytest-alembic-checkpoints")
+    run_id: str = ""
+
+    published: Dict[str, Path] = field(default_factory=dict)
+    fingerprints: Dict[str, str] = field(default_factory=dict)
+    namespaces: Dict[Path, "FileCheckpointStore"] = field(default_factory=dict)
+    listed_mtime: Optional[int] = None
+
+    def namespace(self, script_dir: str, history: str) -> "FileCheckpointStore":
+        root = self.directory / _hash(os.path.abspath(script_dir))  # noqa: PTH100
+        directory = root / history
+
+        store = self.namespaces.get(directory)
+        if store is None:
+            store = self.namespaces[directory] = FileCheckpointStore(
+                budget=self.budget, backends=self.backends, directory=directory, run_id=self.run_id
+            )
+            store.file_hashes = self.file_hashes
+            _collect_garbage(root, directory, self.run_id)
+        return store
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.checkpoints or self._published_path(key) is not None
+
+    def clear(self):
+        super().clear()
+        self.published.clear()
+        self.fingerprints.clear()
+        self.namespaces.clear()
+        self.listed_mtime = None
+
+    def matches(self, connection: Connection, key: str) -> bool:
+        if key in self.checkpoints:
+            return super().matches(connection, key)
+
+        path = self._published_path(key)
+        backend = self.backend(connection)
+        if path is None or not isinstance(backend, SQLiteBackend):
+            return False
+
+        fingerprint = self.fingerprints.get(key)
+        if fingerprint is None:
+            try:
+                snapshot = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+            except sqlite3.OperationalError:
+                return False
+
+            try:
+                fingerprint = self.fingerprints[key] = backend.snapshot_fingerprint(snapshot)
+            finally:
+                snapshot.close()
+
+        return backend.fingerprint(connection) == fingerprint
+
+    def capture(self, connection: Connection, key: str, revision: str) -> Optional[Checkpoint]:
+        backend = self.backend(connection)
+        if not isinstance(backend, SQLiteBackend):
+            return super().capture(connection, key, revision)
+
+        path = self._published_path(key)
+        if path is None:
+            path = self.directory / f"{key}.{revision}.sqlite"
+            _publish(connection, path)
+            self.published[key] = path
+
+        return Checkpoint(
+            key=key, revision=revision, backend=backend, snapshot=path, size=path.stat().st_size
+        )
+
+    def restore(self, connection: Connection, key: str) -> Optional[Checkpoint]:
+        if key in self.checkpoints:
+            return super().restore(connection, key)
+
+        path = self._published_path(key)
+        backend = self.backend(connection)
+        if path is None or not isinstance(backend, SQLiteBackend):
+            return None
+
+        try:
+            snapshot = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+        except sqlite3.OperationalError:
+            # Removed since being listed, by another run's garbage collection.
+            self.published.pop(key, None)
+            return None
+
+        try:
+            backend.restore(connection, snapshot)
+        finally:
+            snapshot.close()
+
+        revision = path.name[len(key) + 1 : -len(".sqlite")]
+        return Checkpoint(
+            key=key, revision=revision, backend=backend, snapshot=path, size=path.stat().st_size
+        )
+
+    def _published_path(self, key: str) -> Optional[Path]:
+        path = self.published.get(key)
+        if path is not None:
+            return path
+
+        # Other processes may have published checkpoints since the directory was last
+        # listed, which is only the case if its modification time has changed.
+        try:
+            mtime = self.directory.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+        if mtime != self.listed_mtime:
+            self.listed_mtime = mtime
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".sqlite") and not entry.name.startswith("."):
+                    self.published[entry.name.split(".")[0]] = Path(entry.path)
+
+        return self.published.get(key)
+
+
+@dataclass
+class HeadCache:
+    """Persist a snapshot of each history's SQLite database at "heads", across sessions.
+
+    Snapshots are held in `cache` (pytest's `config.cache`), one per script directory, keyed
+    on the database at "base", the hash of every revision file and `env.py`, and the
+    configured revision data and skipped revisions. While the key matches, an upgrade from
+    "base" to "heads" restores the snapshot rather than replaying the history.
+
+    Every `validation`-th consecutive restore instead replays the history, and replaces the
+    snapshot with the result, warning if its schema (or the number of rows of any table)
+    differs from the snapshot's. The rows themselves are not compared, as they may
+    legitimately differ between upgrades (for example, through `CURRENT_TIMESTAMP` server
+    defaults).
+    """
+
+    cache: Optional[Any] = None
+    file_hashes: Dict[str, str] = field(default_factory=dict)
+
+    def reset(self, cache: Optional[Any] = None):
+        """Use `cache`, discarding the file hashes memoized by any earlier session."""
+        self.cache = cache
+        self.file_hashes = {}
+
+    def key(self, alembic_runner: "MigrationContext") -> Optional[str]:
+        """Produce the key of `alembic_runner`'s database at "heads", if it can be cached.
+
+        The database is assumed to be at "base".
+        """
+        connection_executor = alembic_runner.connection_executor
+        if self.cache is None or connection_executor.isolated:
+            return None
+
+        backend = SQLiteBackend()
+        base = connection_executor.run_task(
+            lambda connection: (
+                backend.fingerprint(connection) if backend.supports(connection) else None
+            )
+        )
+        if base is None:
+            return None
+
+        config = alembic_runner.config
+        revision_data = RevisionData.from_config(config).fingerprint()
+        if revision_data is None:
+            return None
+
+        script = alembic_runner.command_executor.script
+        revisions = []
+        for revision in alembic_runner.history.revision_range("base", "heads")[1:]:
+            path = getattr(script.revision_map.get_revision(revision), "path", None)
+            file_hash = _file_hash(path, self.file_hashes) if path is not None else ""
+            revisions.append((revision, file_hash))
+
+        return _hash(
+            "heads",
+            base,
+            repr(revisions),
+            _file_hash(script.env_py_location, self.file_hashes),
+            revision_data,
+            repr(config.skip_revisions),
+        )
+
+    def restore(self, alembic_runner: "MigrationContext", key: str) -> bool:
+        """Restore the snapshot at `key`, unless it is missing, stale or due to be validated.
+
+        Returns:
+            Whether the snapshot was restored.
+        """
+        if self.cache is None:
+            return False
+
+        entry = self.cache.get(self._cache_key(alembic_runner), None)
+        if not entry or entry["key"] != key:
+            return False
+
+        if entry["restores"] + 1 >= alembic_runner.config.head_cache_validation:
+            return False
+
+        path = self._path(alembic_runner)
+        try:
+            snapshot = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+        except sqlite3.OperationalError:
+            return False
+
+        try:
+            alembic_runner.connection_executor.run_task(
+                lambda connection: SQLiteBackend().restore(connection, snapshot)
+            )
+        finally:
+            snapshot.close()
+
+        entry["restores"] += 1
+        self.cache.set(self._cache_key(alembic_runner), entry)
+        return True
+
+    def save(self, alembic_runner: "MigrationContext", key: str):
+        """Snapshot `alembic_runner`'s database, having been upgraded to "heads" from "base"."""
+        assert self.cache is not None
+
+        connection_executor = alembic_runner.connection_executor
+        fingerprint = connection_executor.run_task(_structure_fingerprint)
+
+        cache_key = self._cache_key(alembic_runner)
+        entry = self.cache.get(cache_key, None)
+        if entry and entry["key"] == key and entry["fingerprint"] != fingerprint:
+            message = (
+                f"The schema upgraded to 'heads' differs from the cached snapshot (at {key}), "
+                "despite its revisions being unchanged. The snapshot has been replaced."
+            )
+            warnings.warn(message, stacklevel=2)
+
+        path = self._path(alembic_runner)
+        connection_executor.run_task(lambda connection: _publish(connection, path, replace=True))
+        self.cache.set(cache_key, {"key": key, "fingerprint": fingerprint, "restores": 0})
+
+    def _cache_key(self, alembic_runner: "MigrationContext") -> str:
+        return HEAD_CACHE_KEY + "/" + self._script_hash(alembic_runner)
+
+    def _path(self, alembic_runner: "MigrationContext") -> Path:
+        assert self.cache is not None
+        directory = self.cache.mkdir(HEAD_CACHE_DIR)
+        return Path(directory) / f"{self._script_hash(alembic_runner)}.sqlite"
+
+    def _script_hash(self, alembic_runner: "MigrationContext") -> str:
+        return _hash(os.path.abspath(alembic_runner.command_executor.script.dir))  # noqa: PTH100
+
+
+def _publish(connection: Connection, path: Path, *, replace: bool = False):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f".{path.name}.{uuid.uuid4().hex}")
+
+    snapshot = sqlite3.connect(temporary)
+    try:
+        dbapi_connection(connection).backup(snapshot)
+    finally:
+        snapshot.close()
+
+    if replace:
+        temporary.replace(path)
+        return
+
+    try:
+        os.link(temporary, path)
+    except FileExistsError:
+        # Another process published the same checkpoint first.
+        pass
+    except OSError:
+        # The filesystem does not support hard links.
+        temporary.replace(path)
+    finally:
+        temporary.unlink(missing_ok=True)
+
+
+def _collect_garbage(root: Path, directory: Path, run_id: str):
+    """Remove the histories under `root`, other than `directory`, not used by `run_id`."""
+    root.mkdir(parents=True, exist_ok=True)
+    with _locked(root / ".lock"):
+        directory.mkdir(exist_ok=True)
+        (directory / ".run").write_text(run_id)
+
+        for path in root.iterdir():
+            if path == directory or not path.is_dir():
+                continue
+
+            try:
+                last_run_id = (path / ".run").read_text()
+            except FileNotFoundError:
+                last_run_id = None
+
+            if last_run_id != run_id:
+                shutil.rmtree(path, ignore_errors=True)
+
+
+@contextlib.contextmanager
+def _locked(path: Path):
+    with path.open("a") as f:
+        if fcntl is None:  # pragma: no cover
+            yield
+            return
+
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def dbapi_connection(connection: Connection):
+    """Retrieve the raw DBAPI connection underlying a SQLAlchemy `Connection`."""
+    connection_fairy = connection.connection
+    return getattr(connection_fairy, "dbapi_connection", None) or getattr(
+        connection_fairy, "connection", None
+    )
+
+
+def _structure_fingerprint(connection: Connection) -> str:
+    """Hash the schema, and the number of rows of each table, of a SQLite database."""
+    cursor = dbapi_connection(connection).cursor()
+    digest = hashlib.sha1()  # noqa: S324
+
+    query = "SELECT type, name, sql FROM sqlite_master ORDER BY type, name"
+    objects = cursor.execute(query).fetchall()
+    for type_, name, sql in objects:
+        digest.update(repr((type_, name, sql)).encode("utf-8"))
+        if type_ == "table":
+            quoted = name.replace('"', '""')
+            count = cursor.execute(f'SELECT count(*) FROM "{quoted}"').fetchone()[0]  # noqa: S608
+            digest.update(repr((name, count)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _file_hash(path: str, memo: Dict[str, str]) -> str:
+    file_hash = memo.get(path)
+    if file_hash is None:
+        with open(path, "rb") as f:  # noqa: PTH123
+            file_hash = memo[path] = hashlib.sha1(f.read()).hexdigest()  # noqa: S324
+    return file_hash
+
+
+def _hash(*parts: str) -> str:
+    return hashlib.sha1("\0".join(parts).encode("utf-8")).hexdigest()  # noqa: S324
+
+
+checkpoint_cache = CheckpointCache()
+head_cache = HeadCache()
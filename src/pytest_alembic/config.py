@@ -1,11 +1,12 @@
 from dataclasses import dataclass, field
-from typing import Any, cast, Dict, List, Optional, TYPE_CHECKING, Union
+from typing import Any, cast, Dict, List, Literal, Optional, Sequence, TYPE_CHECKING, Union
 
 import alembic.config
 
 if TYPE_CHECKING:
     from alembic.util import immutabledict
 
+    from pytest_alembic.checkpoint import CheckpointStore
     from pytest_alembic.revision_data import RevisionSpec
 
 
@@ -37,6 +38,69 @@ class Config:
       "dangerous", because either DDL or data differences could lead to migrations which
       pass in tests, but fail in practice.
 
+    - :code:`checkpoints` enables snapshotting the database after each revision during an
+      upgrade, such that later upgrades (to the same or later revisions) restore the nearest
+      snapshot rather than replaying the history from "base". Either `True`, to share a
+      store between every test of the session (per :code:`checkpoint_budget`), or a
+      :class:`pytest_alembic.checkpoint.CheckpointStore` of your own.
+      :code:`checkpoint_budget` bounds the total size (in bytes) of the retained snapshots.
+
+    - :code:`coalesce_steps` (default `True`) executes consecutive revisions which need
+      no revision data, through a single execution of `env.py`. Set `False` to always migrate
+      one revision at a time.
+
+    - :code:`replay_env` executes `env.py` only once per test, recording the arguments it
+      passes to ``context.configure``, and configures alembic directly with them for all
+      subsequent migrations. Falls back to executing `env.py` for every migration, if it
+      does something which cannot be replayed (for example, configuring multiple databases).
+
+    - :code:`verify_current` checks the in-process tracked revision against the database's
+      version table on every read of :attr:`MigrationContext.current`. Useful if tests
+      migrate the database through means other than the `MigrationContext`.
+
+    - :code:`pin_connection` checks out a single connection from the
+      `alembic_engine` for the lifetime of the runner, through which every migration,
+      insert and reflection is performed (and committed). It is supplied to `env.py` as
+      the "connection" attribute, wrapped such that `connect()` produces the connection
+      itself. By default, `env.py` is supplied the `alembic_engine` as given, and connects
+      for each step.
+
+    - :code:`transaction_mode` controls how often a pinned connection commits, while
+      migrating. By default (``"revision"``) each revision is committed as it's applied.
+      ``"single"`` upgrades or downgrades the whole window of revisions within a single
+      transaction, committed once at the end (and rolled back entirely, on failure).
+      ``"savepoint"`` additionally applies each revision within a savepoint, such that a
+      failing revision is rolled back alone, and the revisions before it are committed.
+      Only useful for databases with transactional DDL, and only ``"single"`` is faster
+      than the default (``"savepoint"`` is slower, given the savepoint per revision). Raises
+      a `ValueError` when combined with :code:`checkpoints`, and prevents the built-in
+      tests from sharing their upgrades (see :ref:`Shared upgrades`).
+
+    - :code:`rollback_isolation` wraps everything a runner does (with a pinned connection
+      to a sync `Engine`) in a transaction, rolled back once the test is done, with each
+      step executed in a savepoint rather than committed. The database is therefore left
+      as it was found, and can be shared across the session (for example, through a
+      session-scoped `alembic_engine`). Disables :code:`checkpoints`.
+
+    - :code:`head_cache` persists a snapshot of the (SQLite) database at "heads" in pytest's
+      cache, across sessions, keyed on the database at "base", every revision file, `env.py`
+      and the configured revision data. While the key is unchanged, ``migrate_up_to("heads")`` from
+      "base" restores the snapshot rather than replaying the history. Every
+      :code:`head_cache_validation`-th (default 10) consecutive restore instead replays the
+      history, and replaces the snapshot, warning if the resulting schema differs from it.
+
+    - :code:`data_volume`, :code:`upgrade_budget` and :code:`upgrade_row_budget` configure
+      the experimental ``test_migration_under_volume``. Before each revision, every table
+      is filled to :code:`data_volume` rows (or a count per table name, given a `dict`), and
+      the revision's upgrade must complete within :code:`upgrade_budget` seconds (or a
+      budget per revision, given a `dict`) and :code:`upgrade_row_budget` seconds per row.
+
+    - :code:`scaling_sizes`, :code:`scaling_exponent` and :code:`scaling_revisions` configure
+      the experimental ``test_migration_scaling``. Each of :code:`scaling_revisions` (by
+      default, every revision) is timed against tables filled to each of the
+      :code:`scaling_sizes`, and fails if its duration grows faster than
+      ``rows ** scaling_exponent``.
+
     For example:
         >>> import pytest
 
@@ -63,6 +127,28 @@ class Config:
     minimum_downgrade_revision: Optional[str] = None
     skip_revisions: Optional[List[str]] = None
 
+    checkpoints: Union[bool, "CheckpointStore"] = False
+    checkpoint_budget: Optional[int] = None
+
+    coalesce_steps: bool = True
+    replay_env: bool = False
+    verify_current: bool = False
+
+    data_volume: Union[int, Dict[str, int]] = 10_000
+    upgrade_budget: Union[float, Dict[str, float], None] = None
+    upgrade_row_budget: Optional[float] = None
+
+    scaling_sizes: Sequence[int] = (1_000, 10_000, 100_000)
+    scaling_exponent: float = 1.5
+    scaling_revisions: Optional[List[str]] = None
+
+    pin_connection: bool = False
+    transaction_mode: Literal["revision", "single", "savepoint"] = "revision"
+    rollback_isolation: bool = False
+
+    head_cache: bool = False
+    head_cache_validation: int = 10
+
     @classmethod
     def from_raw_config(
         cls,
@@ -75,13 +161,13 @@ class Config:
 
         Examples:
             >>> Config.from_raw_config()
-            Config(config_options={}, alembic_config=None, before_revision_data=None, at_revision_data=None, minimum_downgrade_revision=None, skip_revisions=None)
+            Config(config_options={}, alembic_config=None, before_revision_data=None, at_revision_data=None, minimum_downgrade_revision=None, skip_revisions=None, checkpoints=False, checkpoint_budget=None, coalesce_steps=True, replay_env=False, verify_current=False, data_volume=10000, upgrade_budget=None, upgrade_row_budget=None, scaling_sizes=(1000, 10000, 100000), scaling_exponent=1.5, scaling_revisions=None, pin_connection=False, transaction_mode='revision', rollback_isolation=False, head_cache=False, head_cache_validation=10)
 
             >>> Config.from_raw_config({'minimum_downgrade_revision': 'abc123'})
-            Config(config_options={}, alembic_config=None, before_revision_data=None, at_revision_data=None, minimum_downgrade_revision='abc123', skip_revisions=None)
+            Config(config_options={}, alembic_config=None, before_revision_data=None, at_revision_data=None, minimum_downgrade_revision='abc123', skip_revisions=None, checkpoints=False, checkpoint_budget=None, coalesce_steps=True, replay_env=False, verify_current=False, data_volume=10000, upgrade_budget=None, upgrade_row_budget=None, scaling_sizes=(1000, 10000, 100000), scaling_exponent=1.5, scaling_revisions=None, pin_connection=False, transaction_mode='revision', rollback_isolation=False, head_cache=False, head_cache_validation=10)
 
             >>> Config.from_raw_config(Config(minimum_downgrade_revision='abc123'))
-            Config(config_options={}, alembic_config=None, before_revision_data=None, at_revision_data=None, minimum_downgrade_revision='abc123', skip_revisions=None)
+            Config(config_options={}, alembic_config=None, before_revision_data=None, at_revision_data=None, minimum_downgrade_revision='abc123', skip_revisions=None, checkpoints=False, checkpoint_budget=None, coalesce_steps=True, replay_env=False, verify_current=False, data_volume=10000, upgrade_budget=None, upgrade_row_budget=None, scaling_sizes=(1000, 10000, 100000), scaling_exponent=1.5, scaling_revisions=None, pin_connection=False, transaction_mode='revision', rollback_isolation=False, head_cache=False, head_cache_validation=10)
         """
         if raw_config is None:
             return cls()
@@ -96,6 +182,22 @@ class Config:
         at_data = raw_config.pop("at_revision_data", None)
         minimum_downgrade_revision = raw_config.pop("minimum_downgrade_revision", None)
         skip_revisions = raw_config.pop("skip_revisions", None)
+        checkpoints = raw_config.pop("checkpoints", False)
+        checkpoint_budget = raw_config.pop("checkpoint_budget", None)
+        coalesce_steps = raw_config.pop("coalesce_steps", True)
+        replay_env = raw_config.pop("replay_env", False)
+        verify_current = raw_config.pop("verify_current", False)
+        data_volume = raw_config.pop("data_volume", 10_000)
+        upgrade_budget = raw_config.pop("upgrade_budget", None)
+        upgrade_row_budget = raw_config.pop("upgrade_row_budget", None)
+        scaling_sizes = raw_config.pop("scaling_sizes", (1_000, 10_000, 100_000))
+        scaling_exponent = raw_config.pop("scaling_exponent", 1.5)
+        scaling_revisions = raw_config.pop("scaling_revisions", None)
+        pin_connection = raw_config.pop("pin_connection", False)
+        transaction_mode = raw_config.pop("transaction_mode", "revision")
+        rollback_isolation = raw_config.pop("rollback_isolation", False)
+        head_cache = raw_config.pop("head_cache", False)
+        head_cache_validation = raw_config.pop("head_cache_validation", 10)
         return cls(
             config_options=raw_config,
             alembic_config=None,
@@ -103,6 +205,22 @@ class Config:
             at_revision_data=at_data,
             minimum_downgrade_revision=minimum_downgrade_revision,
             skip_revisions=skip_revisions,
+            checkpoints=checkpoints,
+            checkpoint_budget=checkpoint_budget,
+            coalesce_steps=coalesce_steps,
+            replay_env=replay_env,
+            verify_current=verify_current,
+            data_volume=data_volume,
+            upgrade_budget=upgrade_budget,
+            upgrade_row_budget=upgrade_row_budget,
+            scaling_sizes=scaling_sizes,
+            scaling_exponent=scaling_exponent,
+            scaling_revisions=scaling_revisions,
+            pin_connection=pin_connection,
+            transaction_mode=transaction_mode,
+            rollback_isolation=rollback_isolation,
+            head_cache=head_cache,
+            head_cache_validation=head_cache_validation,
         )
 
     def make_alembic_config(self, stdout):
@@ -1,17 +1,39 @@
 import contextlib
+import copy
 import io
+import itertools
+import os
+import types
 from dataclasses import dataclass, field
 from io import StringIO
-from typing import Dict, List, Optional, Union
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TYPE_CHECKING,
+    Union,
+)
 
 import alembic
 import alembic.config
+import alembic.migration
 from alembic.runtime.environment import EnvironmentContext
 from alembic.script.base import ScriptDirectory
-from sqlalchemy import MetaData, Table
-from sqlalchemy.engine import Connectable, Connection, Engine
+from alembic.script.revision import RevisionMap
+from sqlalchemy import bindparam, func, inspect, MetaData, select, Table, table
+from sqlalchemy.engine import Connectable, Connection, Engine, Transaction
+from sqlalchemy.sql import ClauseElement
 
 from pytest_alembic.config import Config
+from pytest_alembic.history import AlembicHistory, RevisionLoader
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
 
 
 @dataclass
@@ -21,6 +43,18 @@ class CommandExecutor:
     stream_position: int
     script: ScriptDirectory
 
+    # The current revision of the database, as tracked through the commands executed here.
+    # `None` means it is unknown, and must be read from the database.
+    revision: Optional[str] = None
+
+    # The location of the version table, as configured by `env.py`, once known.
+    version_table: Optional[str] = None
+    version_table_schema: Optional[str] = None
+
+    # Whether to execute `env.py` only once, replaying its configuration thereafter.
+    replay_env: bool = False
+    env_configuration: Optional["EnvConfiguration"] = None
+
     @classmethod
     def from_config(cls, config: Config):
         stdout = StringIO()
@@ -29,7 +63,8 @@ class CommandExecutor:
             alembic_config=alembic_config,
             stdout=stdout,
             stream_position=0,
-            script=ScriptDirectory.from_config(alembic_config),
+            script=script_cache.script(ScriptDirectory.from_config(alembic_config)),
+            replay_env=config.replay_env,
         )
 
     def configure(self, **kwargs):
@@ -37,10 +72,30 @@ class CommandExecutor:
             self.alembic_config.attributes[key] = value
 
     def execute_fn(self, fn):
-        with EnvironmentContext(self.alembic_config, self.script, fn=fn):
-            self.script.run_env()
+        with self._settle_connection(), EnvironmentContext(self.alembic_config, self.script, fn=fn):
+            env_script_cache.run(self.script)
+
+    def read_revision(self) -> Tuple[str, ...]:
+        """Read the current heads of the database by executing `env.py`.
+
+        As a side-effect, records the version table's location, enabling subsequent
+        reads directly against the database (see `ConnectionExecutor.current_heads`).
+        """
+        heads: Tuple[str, ...] = ()
+
+        def get_current(rev, context):
+            nonlocal heads
+            heads = tuple(rev)
+            self.version_table = context.version_table
+            self.version_table_schema = context.version_table_schema
+            return []
+
+        self._run_env(get_current, dont_mutate=False)
+        return heads
 
     def run_command(self, command, *args, **kwargs):
+        # Arbitrary commands may leave the database at any revision.
+        self.revision = None
         self.stream_position = self.stdout.tell()
 
         executable_command = getattr(alembic.command, command)
@@ -65,7 +120,9 @@ class CommandExecutor:
         def upgrade(rev, _):
             return self.script._upgrade_revs(revision, rev)  # noqa: SLF001
 
+        self.revision = None
         self._run_env(upgrade, revision)
+        self.revision = self.resolve_revision(revision)
 
     def downgrade(self, revision):
         """Downgrade to the given `revision`."""
@@ -73,28 +130,626 @@ class CommandExecutor:
         def downgrade(rev, _):
             return self.script._downgrade_revs(revision, rev)  # noqa: SLF001
 
+        self.revision = None
         self._run_env(downgrade, revision)
+        self.revision = self.resolve_revision(revision)
 
     def stamp(self, revision: str):
-        return self.run_command("stamp", revision)
+        """Stamp the given `revision`, equivalently to alembic's `stamp` command."""
+
+        def stamp(rev, _):
+            return self.script._stamp_revs((revision,), rev)  # noqa: SLF001
+
+        self.revision = None
+        try:
+            self._run_env(stamp, (revision,))
+        except alembic.util.exc.CommandError as e:
+            raise RuntimeError(e)
 
-    def _run_env(self, fn, revision=None):
-        """Execute the migrations' env.py, given some function to execute."""
-        dont_mutate = revision is None
-        with EnvironmentContext(
+        self.revision = self.resolve_revision(revision)
+        return []
+
+    def resolve_revision(self, revision: str) -> Optional[str]:
+        """Produce the revision the database will report, having moved to `revision`.
+
+        Partial revision ids (and "heads", for a single-headed history) resolve to the full
+        revision id. Anything else which is not a single revision (such as a relative
+        revision) resolves to `None`, leaving it to be read from the database.
+        """
+        if revision == "base":
+            return revision
+
+        try:
+            script = self.script.get_revision(revision)
+        except alembic.util.exc.CommandError:
+            return None
+
+        if script is None:
+            return None
+        return script.revision
+
+    def _run_env(self, fn, revision=None, *, dont_mutate=None):
+        """Execute the migrations' env.py, given some function to execute.
+
+        With `replay_env`, `env.py` is only executed the first time. The arguments
+        it supplies to `context.configure` are recorded, and subsequently used to
+        configure and run the migrations directly, unless they cannot be replayed.
+        """
+        if dont_mutate is None:
+            dont_mutate = revision is None
+
+        with self._settle_connection():
+            env_configuration = self.env_configuration
+            if self.replay_env and env_configuration and env_configuration.replayable:
+                self._replay_env(env_configuration, fn, revision, dont_mutate=dont_mutate)
+            else:
+                self._execute_env(fn, revision, dont_mutate=dont_mutate)
+
+    def _execute_env(self, fn, revision=None, *, dont_mutate=True):
+        environment_context = EnvironmentContext(
             self.alembic_config,
             self.script,
             fn=fn,
             destination_rev=revision,
             dont_mutate=dont_mutate,
-        ):
-            self.script.run_env()
+        )
+
+        configure_calls = None
+        if self.replay_env:
+            configure_calls = _record_configure_calls(environment_context)
+
+        with environment_context:
+            env_script_cache.run(self.script)
+
+        if configure_calls is not None:
+            self.env_configuration = EnvConfiguration.from_calls(
+                configure_calls, self.alembic_config.attributes.get("connection")
+            )
+
+    def _settle_connection(self):
+        """Settle the transaction of a runner-owned connection, around the execution of `env.py`."""
+        connection = self.alembic_config.attributes.get("connection")
+        if isinstance(connection, PinnedConnection):
+            return pinned_transaction(connection.connection)
+        if _is_pinned_async_engine(connection):
+            return connection.transaction()
+        return contextlib.nullcontext()
+
+    def _replay_env(
+        self, env_configuration: "EnvConfiguration", fn, revision=None, *, dont_mutate=True
+    ):
+        connectable: Any = (
+            self.alembic_config.attributes.get("connection") or env_configuration.engine
+        )
+        assert connectable is not None
+
+        def replay(connection: Connection):
+            with EnvironmentContext(
+                self.alembic_config,
+                self.script,
+                fn=fn,
+                destination_rev=revision,
+                dont_mutate=dont_mutate,
+            ) as environment_context:
+                environment_context.configure(connection=connection, **env_configuration.kwargs)
+                with environment_context.begin_transaction():
+                    environment_context.run_migrations()
+
+        if _is_pinned_async_engine(connectable):
+            connectable.run_sync(replay)
+        elif isinstance(connectable, Connection):
+            replay(connectable)
+        else:
+            with connectable.connect() as connection:
+                replay(connection)
+
+
+@dataclass
+class PinnedConnection:
+    """A runner-owned `Connection`, supplied to `env.py` in place of an `Engine`.
+
+    `env.py` files commonly call `connect()` (or `begin()`) on the configured "connection"
+    attribute, as they would an `Engine`. Here, both produce the pinned connection itself,
+    and leave it open afterwards.
+    """
+
+    connection: Connection
+
+    @contextlib.contextmanager
+    def connect(self):
+        yield self.connection
+
+    @contextlib.contextmanager
+    def begin(self):
+        info = self.connection.info
+        if info.get(HELD_TRANSACTION) or info.get(ISOLATED_TRANSACTION):
+            yield self.connection
+            return
+
+        with self.connection.begin():
+            yield self.connection
+
+    def __getattr__(self, attr):
+        return getattr(self.connection, attr)
+
+
+# The `Connection.info` keys, flagging that a `held_transaction` (or `isolated_transaction`)
+# is open on the connection.
+HELD_TRANSACTION = "pytest_alembic.held_transaction"
+ISOLATED_TRANSACTION = "pytest_alembic.isolated_transaction"
+
+
+@contextlib.contextmanager
+def pinned_transaction(connection: Connection):
+    """Commit whatever is executed over a long-lived `connection`, or roll it back on failure.
+
+    Equivalently to having used a fresh connection through `engine.begin()`, nothing is
+    left pending on the connection between the runner's operations. Anything pending
+    beforehand (for example, from reflection) is committed first.
+
+    Within a `held_transaction`, work is instead left pending, to be committed all at once.
+    Within an `isolated_transaction`, a savepoint stands in for the transaction.
+    """
+    if connection.info.get(HELD_TRANSACTION):
+        yield connection
+        return
+
+    if connection.info.get(ISOLATED_TRANSACTION):
+        with connection.begin_nested():
+            yield connection
+        return
+
+    if connection.in_transaction():
+        connection.commit()
+
+    try:
+        yield connection
+    except BaseException:
+        if connection.in_transaction():
+            connection.rollback()
+        raise
+
+    if connection.in_transaction():
+        connection.commit()
+
+
+@contextlib.contextmanager
+def held_transaction(connection: Connection, *, commit_on_failure: bool = False):
+    """Hold a single transaction open on a long-lived `connection`, committing it once on exit.
+
+    Alembic treats the connection as being in an external transaction, and so leaves it
+    to be committed here. On failure, the transaction is rolled back, unless
+    `commit_on_failure` (for example, the failing work was rolled back to a savepoint).
+    """
+    if connection.info.get(HELD_TRANSACTION):
+        yield connection
+        return
+
+    transaction: Transaction
+    if connection.info.get(ISOLATED_TRANSACTION):
+        transaction = connection.begin_nested()
+    else:
+        if connection.in_transaction():
+            connection.commit()
+
+        transaction = connection.begin()
+        _begin_sqlite_transaction(connection)
+
+    connection.info[HELD_TRANSACTION] = True
+    try:
+        yield connection
+    except BaseException:
+        del connection.info[HELD_TRANSACTION]
+        if commit_on_failure:
+            transaction.commit()
+        else:
+            transaction.rollback()
+        raise
+
+    del connection.info[HELD_TRANSACTION]
+    transaction.commit()
+
+
+@contextlib.contextmanager
+def isolated_transaction(connection: Connection):
+    """Hold a transaction open on a long-lived `connection`, rolled back on exit.
+
+    Meanwhile, the runner's operations (see `pinned_transaction`) are executed within
+    savepoints of that transaction, rather than being committed. Everything executed over
+    the connection is therefore discarded at once, leaving the database as it was found.
+    """
+    if connection.in_transaction():
+        connection.commit()
+
+    transaction = connection.begin()
+    _begin_sqlite_transaction(connection)
+    connection.info[ISOLATED_TRANSACTION] = True
+    try:
+        yield connection
+    finally:
+        del connection.info[ISOLATED_TRANSACTION]
+        transaction.rollback()
+
+
+def _begin_sqlite_transaction(connection: Connection):
+    """Explicitly begin the transaction of a (py/aio)sqlite connection.
+
+    In its default (legacy) transaction control, the driver only begins a transaction
+    ahead of DML, leaving DDL and savepoints to execute outside of it.
+    """
+    if connection.dialect.name != "sqlite":
+        return
+
+    dbapi_connection = connection.connection.dbapi_connection
+    legacy = getattr(dbapi_connection, "isolation_level", None) is not None
+    if legacy and not getattr(dbapi_connection, "in_transaction", False):
+        connection.exec_driver_sql("BEGIN")
+
+
+@dataclass
+class EnvConfiguration:
+    """The configuration supplied by `env.py`, in a form which can be replayed.
+
+    `env.py` is only considered replayable if it configured the context exactly once,
+    with a synchronous `connection`. Anything else (offline mode, multiple databases,
+    async connections) requires `env.py` itself to be executed for every command.
+    """
+
+    kwargs: Dict[str, Any]
+    engine: Optional[Engine] = None
+    replayable: bool = True
+
+    @classmethod
+    def from_calls(
+        cls, calls: List[Tuple[Tuple[Any, ...], Dict[str, Any]]], connectable=None
+    ) -> "EnvConfiguration":
+        if len(calls) != 1:
+            return cls({}, replayable=False)
+
+        args, kwargs = calls[0]
+        connection = kwargs.get("connection")
+        if args or not isinstance(connection, Connection) or kwargs.get("as_sql"):
+            return cls({}, replayable=False)
+
+        # Async connections can only be replayed through the runner's own event loop, or
+        # from within `run_sync` on a runner-owned connection.
+        is_async = connection.dialect.is_async or _is_async_engine(connectable)
+        pinned = _is_pinned_async_engine(connectable) or isinstance(connectable, PinnedConnection)
+        if is_async and not pinned:
+            return cls({}, replayable=False)
+
+        if is_async:
+            kwargs = {k: v for k, v in kwargs.items() if k != "connection"}
+            return cls(kwargs)
+
+        kwargs = {k: v for k, v in kwargs.items() if k != "connection"}
+        return cls(kwargs, engine=connection.engine)
+
+
+@dataclass
+class EnvScriptCache:
+    """Cache the compiled code of `env.py` files, across all runners in the process.
+
+    Alembic's own `ScriptDirectory.run_env` loads (and compiles, or unmarshals) `env.py`
+    from disk every time it is executed. A cached code object is reused until the file's
+    modification time or size change.
+
+    `compilations` and `executions` count the number of times `env.py` files were
+    compiled and executed, respectively.
+    """
+
+    code: Dict[str, Tuple[Tuple[int, int], types.CodeType]] = field(default_factory=dict)
+    compilations: int = 0
+    executions: int = 0
+
+    def run(self, script: ScriptDirectory):
+        """Execute the `env.py` of `script`, as `ScriptDirectory.run_env` would."""
+        path = script.env_py_location
+        if not os.path.exists(path):  # noqa: PTH110
+            # Sourceless (.pyc-only) environments are left to alembic.
+            self.executions += 1
+            script.run_env()
+            return
+
+        module = types.ModuleType("env_py")
+        module.__file__ = path
+
+        code = self.compile(path)
+        self.executions += 1
+        exec(code, module.__dict__)  # noqa: S102
+
+    def compile(self, path: str) -> types.CodeType:
+        stat = os.stat(path)  # noqa: PTH116
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        cached = self.code.get(path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        with open(path, "rb") as f:  # noqa: PTH123
+            source = f.read()
+
+        code = compile(source, path, "exec", dont_inherit=True)
+        self.compilations += 1
+        self.code[path] = (version, code)
+        return code
+
+    def reset_counts(self):
+        self.compilations = 0
+        self.executions = 0
+
+
+env_script_cache = EnvScriptCache()
+
+
+@dataclass
+class ScriptCache:
+    """Share `ScriptDirectory`s, and their parsed `AlembicHistory`, across runners.
+
+    Every runner constructs its own (cheap) `ScriptDirectory` from its own alembic
+    config, and then swaps it for the first equivalently configured one seen in the
+    session. The revision map (and with it every imported revision module and the
+    history parsed from it) is therefore only loaded once per session, and thereafter
+    only refreshed (see `refresh`) with the revision files added, modified or removed
+    since.
+
+    The alembic config itself is never shared, as it holds per-test attributes, such
+    as the connection.
+
+    Revisions are loaded through a `RevisionLoader`, which persists their headers to
+    `history_cache` (pytest's `config.cache`), if set.
+    """
+
+    scripts: Dict[Tuple[Any, ...], ScriptDirectory] = field(default_factory=dict)
+    histories: Dict[int, Tuple[RevisionMap, AlembicHistory]] = field(default_factory=dict)
+    loaders: Dict[int, RevisionLoader] = field(default_factory=dict)
+    history_cache: Optional[Any] = None
+
+    def script(self, script: ScriptDirectory) -> ScriptDirectory:
+        """Produce the shared equivalent of `script`, or `script` itself if it is the first.
+
+        A shared script is first refreshed, such that revision files written or removed
+        since (for example, by an earlier test's `generate_revision`) are reflected.
+        """
+        key = (
+            os.path.abspath(script.dir),  # noqa: PTH100
+            tuple(script._version_locations),  # noqa: SLF001
+            script.recursive_version_locations,
+            script.sourceless,
+            script.file_template,
+            script.truncate_slug_length,
+            script.output_encoding,
+            script.timezone,
+            repr(script.hook_config),
+        )
+        shared_script = self.scripts.get(key)
+        if shared_script is None:
+            shared_script = self.scripts[key] = script
+            self.loaders[id(script)] = RevisionLoader(script, cache=self.history_cache).install()
+        else:
+            self.refresh(shared_script)
+        return shared_script
+
+    def history(self, script: ScriptDirectory) -> AlembicHistory:
+        """Produce the `AlembicHistory` of `script`'s current revision map.
+
+        A history is reparsed whenever the script's revision map is replaced, such as
+        through `MigrationContext.refresh_history`.
+        """
+        revision_map = script.revision_map
+
+        cached = self.histories.get(id(script))
+        if cached is not None and cached[0] is revision_map:
+            return cached[1]
+
+        history = AlembicHistory.parse(revision_map)
+        self.histories[id(script)] = (revision_map, history)
+        return history
+
+    def refresh(self, script: ScriptDirectory) -> AlembicHistory:
+        """Reload the revisions of `script` from disk, producing the refreshed history.
+
+        Only revision files which were added, modified or removed since they were last
+        loaded are reread.
+        """
+        loader = self.loaders.get(id(script))
+        if loader is None:
+            script.revision_map = RevisionMap(script._load_revisions)  # noqa: SLF001
+            return self.history(script)
+
+        added = loader.refresh()
+        history = self.history(script)
+        if added and not history.extend(added):
+            history = AlembicHistory.parse(script.revision_map)
+            self.histories[id(script)] = (script.revision_map, history)
+        return history
+
+    def clear(self):
+        self.scripts.clear()
+        self.histories.clear()
+        self.loaders.clear()
+
+
+script_cache = ScriptCache()
+
+
+def _record_configure_calls(environment_context: EnvironmentContext):
+    """Record the calls `env.py` makes to `context.configure`.
+
+    The method is replaced on the instance (rather than by subclassing), because alembic
+    only installs the `alembic.context` module proxy for `EnvironmentContext` itself.
+    """
+    calls: List[Tuple[Tuple[Any, ...], Dict[str, Any]]] = []
+    configure = environment_context.configure
+
+    def recording_configure(*args, **kwargs):
+        calls.append((args, kwargs))
+        return configure(*args, **kwargs)
+
+    environment_context.configure = recording_configure  # type: ignore[method-assign]
+    return calls
+
+
+def _group_rows(
+    data: Iterable[Dict], tablename: Optional[str], schema: Optional[str], *, chunk_size: int
+) -> Iterator[Tuple[Tuple[Optional[str], str], List[Dict]]]:
+    """Group consecutive rows destined for the same table, with the same set of columns.
+
+    Only consecutive rows are grouped, so that the order of insertion between tables
+    (for example, for foreign keys) is retained. Rows containing SQL expressions are
+    never grouped, as they cannot be executed as "executemany" parameters.
+    """
+    key: Optional[Tuple[Any, ...]] = None
+    rows: List[Dict] = []
+
+    for item in data:
+        table = item.get("__tablename__", None) or tablename
+        if table is None:
+            message = "No table name provided as either `table` argument, or '__tablename__' key in `data`."
+            raise ValueError(message)
+
+        table_schema = schema
+        if "." in table:
+            # Attempt to parse the schema out of the tablename.
+            table_schema, table = table.split(".", 1)
+
+        values = {k: v for k, v in item.items() if k != "__tablename__"}
+        item_key: Tuple[Any, ...] = (table_schema, table, frozenset(values))
+        if any(isinstance(value, ClauseElement) for value in values.values()):
+            item_key += (object(),)
+
+        if rows and (item_key != key or len(rows) >= chunk_size):
+            assert key is not None
+            yield (key[0], key[1]), rows
+            rows = []
+
+        key = item_key
+        rows.append(values)
+
+    if rows:
+        assert key is not None
+        yield (key[0], key[1]), rows
+
+
+# The positional paramstyle which drivers of each named paramstyle also accept.
+POSITIONAL_PARAMSTYLES = {"pyformat": "format", "named": "numeric"}
+
+
+def compile_positional_insert(
+    insert, dialect, names: List[str], *, column_keys: Optional[List[str]] = None
+) -> Optional[Tuple[str, List[int]]]:
+    """Compile `insert` with positional binds, for `dialect`'s driver.
+
+    Args:
+        insert: The statement to compile.
+        dialect: The dialect to compile the statement for.
+        names: The names of the statement's binds, in the order their values are supplied.
+        column_keys: The columns to compile a single-row insert of (see `Insert.compile`).
+
+    Returns:
+        The statement, and the index in `names` of each of its binds, or `None` if the
+        driver's paramstyle has no positional equivalent.
+    """
+    if not dialect.positional:
+        paramstyle = POSITIONAL_PARAMSTYLES.get(dialect.paramstyle)
+        if paramstyle is None:
+            return None
+
+        # The compiler renders binds according to the dialect's paramstyle alone.
+        dialect = copy.copy(dialect)
+        dialect.paramstyle = paramstyle
+        dialect.positional = True
+
+    compiled = insert.compile(dialect=dialect, column_keys=column_keys)
+    if compiled.positiontup is None:
+        return None
+
+    indexes = {name: index for index, name in enumerate(names)}
+    try:
+        positions = [indexes[name] for name in compiled.positiontup]
+    except KeyError:
+        return None
+    return str(compiled), positions
+
+
+def _execute_insert_pages(
+    connection: Connection,
+    table: Table,
+    columns: List[str],
+    chunks: Iterable[Iterable[Sequence]],
+):
+    """Insert chunks of (processed) positional rows through multi-row `VALUES` statements.
+
+    Pages are bounded by the dialect's `insertmanyvalues_page_size` (and its maximum
+    number of parameters), as with SQLAlchemy's own "insertmanyvalues".
+    """
+    dialect = connection.dialect
+    page_size = max(
+        1,
+        min(
+            dialect.insertmanyvalues_page_size,
+            dialect.insertmanyvalues_max_parameters // max(len(columns), 1),
+        ),
+    )
+
+    statements: Dict[int, Tuple[str, List[int]]] = {}
+    for chunk in chunks:
+        rows = iter(chunk)
+        while True:
+            page = list(itertools.islice(rows, page_size))
+            if not page:
+                break
+
+            if len(page) not in statements:
+                statements[len(page)] = _compile_insert_page(table, dialect, columns, len(page))
+
+            statement, positions = statements[len(page)]
+            values = [value for row in page for value in row]
+            connection.exec_driver_sql(statement, tuple(values[i] for i in positions))
+
+
+def _compile_insert_page(
+    table: Table, dialect, columns: List[str], size: int
+) -> Tuple[str, List[int]]:
+    """Compile a multi-row insert of `size` rows, whose values are supplied row after row."""
+    names = [f"p{row}_{column}" for row in range(size) for column in range(len(columns))]
+    rows = [
+        {
+            name: bindparam(names[row * len(columns) + column], type_=table.c[name].type)
+            for column, name in enumerate(columns)
+        }
+        for row in range(size)
+    ]
+    compiled = compile_positional_insert(table.insert().values(rows), dialect, names)
+    assert compiled is not None
+    return compiled
+
+
+def _is_async_engine(connectable):
+    AsyncEngine = None  # noqa: N806
+    with contextlib.suppress(ImportError):
+        from sqlalchemy.ext.asyncio import AsyncEngine
+
+    return bool(AsyncEngine) and isinstance(connectable, AsyncEngine)
+
+
+def _is_pinned_async_engine(connectable):
+    if not _is_async_engine(connectable):
+        return False
+
+    from pytest_alembic.async_connection import PinnedAsyncEngine
+
+    return isinstance(connectable, PinnedAsyncEngine)
 
 
 @dataclass
 class ConnectionExecutor:
-    connection: Connectable
+    connection: Union[Connectable, "AsyncEngine"]
     metadatas: Dict[str, MetaData] = field(default_factory=dict)
+    insert_chunk_size: int = 1000
+
+    # Whether `connection` is a runner-owned `Connection`, whose tasks must be committed.
+    pinned: bool = False
 
     def metadata(self, revision: str) -> MetaData:
         metadata = self.metadatas.get(revision)
@@ -115,45 +770,225 @@ class ConnectionExecutor:
         if name in meta.tables:
             return meta.tables[name]
 
-        autoload_with = connection or self.connection
+        if connection is None:
+            return self.run_task(
+                lambda connection: Table(name, meta, schema=schema, autoload_with=connection)
+            )
+
+        assert isinstance(connection, (Engine, Connection)), connection
+        return Table(name, meta, schema=schema, autoload_with=connection)
+
+    def current_heads(
+        self, version_table: str, version_table_schema: Optional[str] = None
+    ) -> Tuple[str, ...]:
+        """Read the current heads directly from the version table, without running `env.py`."""
+
+        def current_heads(connection: Connection):
+            migration_context = alembic.migration.MigrationContext.configure(
+                connection,
+                opts={"version_table": version_table, "version_table_schema": version_table_schema},
+            )
+            return migration_context.get_current_heads()
+
+        return self.run_task(current_heads)
+
+    def row_counts(
+        self, tablenames: Optional[Iterable[str]] = None, exclude: Iterable[str] = ()
+    ) -> Dict[str, int]:
+        """Count the rows of each of `tablenames` (optionally "schema.table") which exist.
+
+        By default, every table in the default schema is counted, other than those in `exclude`.
+        """
+
+        def row_counts(connection: Connection):
+            inspector = inspect(connection)
+            names = tablenames
+            if names is None:
+                names = inspector.get_table_names()
+
+            counts = {}
+            for name in names:
+                if name in exclude:
+                    continue
+
+                schema = None
+                tablename = name
+                if "." in name:
+                    schema, tablename = name.split(".", 1)
+
+                if not inspector.has_table(tablename, schema=schema):
+                    continue
 
-        assert isinstance(autoload_with, (Engine, Connection)), autoload_with
-        return Table(name, meta, schema=schema, autoload_with=autoload_with)
+                query = select(func.count()).select_from(table(tablename, schema=schema))
+                counts[name] = connection.execute(query).scalar() or 0
+            return counts
+
+        return self.run_task(row_counts)
 
     def table_insert(
         self,
         revision: str,
-        data: Union[Dict, List],
+        data: Union[Dict, Iterable[Dict]],
         tablename: Optional[str] = None,
         schema: Optional[str] = None,
     ):
+        """Insert `data` (a row, or an iterable of rows) into the database.
+
+        Consecutive rows for the same table, with the same set of columns, are inserted
+        through a single "executemany" insert, in chunks of at most `insert_chunk_size` rows.
+        Rows are consumed from `data` as they are inserted, so it may be a generator.
+        """
+
         def table_insert(
             connection: Connection,
-            data: Union[Dict, List],
+            data: Union[Dict, Iterable[Dict]],
             tablename: Optional[str] = None,
             schema: Optional[str] = None,
         ):
             if isinstance(data, dict):
                 data = [data]
 
-            for item in data:
-                _tablename = item.get("__tablename__", None)
-                table = _tablename or tablename
+            groups = _group_rows(data, tablename, schema, chunk_size=self.insert_chunk_size)
+            for (table_schema, table_name), rows in groups:
+                table = self.table(revision, table_name, schema=table_schema, connection=connection)
+                if len(rows) == 1:
+                    connection.execute(table.insert().values(rows[0]))
+                else:
+                    connection.execute(table.insert(), rows)
 
-                if table is None:
-                    message = "No table name provided as either `table` argument, or '__tablename__' key in `data`."
-                    raise ValueError(message)
+        self.run_task(table_insert, data=data, tablename=tablename, schema=schema)
 
-                with contextlib.suppress(ValueError):
-                    # Attempt to parse the schema out of the tablename
-                    # However, if it doesn't work, both `table` and `schema` are in scope, so failure is fine.
-                    schema, table = table.split(".", 1)
+    def table_insert_columns(
+        self,
+        revision: str,
+        tablename: str,
+        columns: List[str],
+        chunks: Iterable[Sequence[Sequence]],
+        schema: Optional[str] = None,
+    ):
+        """Insert positional rows (in `chunks` of rows), whose values are ordered as `columns`.
 
-                table = self.table(revision, table, schema=schema, connection=connection)
-                values = {k: v for k, v in item.items() if k != "__tablename__"}
-                connection.execute(table.insert().values(values))
+        For drivers with a positional paramstyle (such as sqlite3), the rows are passed
+        directly through to the DBAPI's `executemany`, without conversion to `dict`s.
+        """
 
-        self.run_task(table_insert, data=data, tablename=tablename, schema=schema)
+        def table_insert_columns(
+            connection: Connection,
+            tablename: str,
+            columns: List[str],
+            chunks: Iterable[Sequence[Sequence]],
+            schema: Optional[str] = None,
+        ):
+            if schema is None and "." in tablename:
+                schema, tablename = tablename.split(".", 1)
+
+            table = self.table(revision, tablename, schema=schema, connection=connection)
+            self.execute_insert_columns(connection, table, columns, chunks)
+
+        self.run_task(
+            table_insert_columns,
+            tablename=tablename,
+            columns=columns,
+            chunks=chunks,
+            schema=schema,
+        )
+
+    @staticmethod
+    def execute_insert_columns(
+        connection: Connection,
+        table: Table,
+        columns: List[str],
+        chunks: Iterable[Sequence[Sequence]],
+    ):
+        """Insert chunks of positional rows into `table`, over an existing `connection`.
+
+        As rows bypass SQLAlchemy's parameter handling, the bind processors of column
+        types which require them (for example, `Numeric` on SQLite) are applied here.
+
+        Drivers with a named paramstyle (such as psycopg2's "pyformat") are supplied the
+        statement compiled with their equivalent positional paramstyle (see
+        `compile_positional_insert`), such that rows never need to be converted to dicts.
+        As SQLAlchemy itself does, drivers whose `executemany` executes each row
+        individually (again, such as psycopg2) are instead supplied pages of rows through
+        multi-row `VALUES` statements.
+        """
+        dialect = connection.dialect
+        insert = table.insert()
+
+        compiled = compile_positional_insert(insert, dialect, columns, column_keys=columns)
+        if compiled is None:
+            for chunk in chunks:
+                connection.execute(insert, [dict(zip(columns, row)) for row in chunk])
+            return
+
+        processors = [
+            table.c[name].type.dialect_impl(dialect).bind_processor(dialect) for name in columns
+        ]
+
+        def process(row: Sequence) -> Sequence:
+            if not any(processors):
+                return row
+            return tuple(
+                value if processor is None or value is None else processor(value)
+                for value, processor in zip(row, processors)
+            )
+
+        if getattr(dialect, "use_insertmanyvalues_wo_returning", False):
+            _execute_insert_pages(connection, table, columns, (map(process, c) for c in chunks))
+            return
+
+        statement, positions = compiled
+        in_order = positions == list(range(len(columns)))
+        for chunk in chunks:
+            rows: List[Any]
+            if in_order:
+                rows = [process(row) for row in chunk] if any(processors) else list(chunk)
+            else:
+                rows = [tuple(process(row)[i] for i in positions) for row in chunk]
+            connection.exec_driver_sql(statement, rows)
+
+    @property
+    def isolated(self) -> bool:
+        """Whether the connection is within an `isolated_transaction`."""
+        connection = self.connection
+        return isinstance(connection, Connection) and bool(
+            connection.info.get(ISOLATED_TRANSACTION)
+        )
+
+    @contextlib.contextmanager
+    def hold_transaction(self, *, commit_on_failure: bool = False):
+        """Execute everything within a single transaction, committed once on exit.
+
+        Only applies to a pinned (sync) `Connection`, and otherwise does nothing.
+        See :func:`held_transaction`.
+        """
+        connection = self.connection
+        if not (self.pinned and isinstance(connection, Connection)):
+            yield
+            return
+
+        with held_transaction(connection, commit_on_failure=commit_on_failure):
+            yield
+
+    @contextlib.contextmanager
+    def savepoint(self):
+        """Within a held transaction, roll back only the work of this block, on failure."""
+        connection = self.connection
+        if not (isinstance(connection, Connection) and connection.info.get(HELD_TRANSACTION)):
+            yield
+            return
+
+        with connection.begin_nested():
+            yield
+
+    def execute_statements(self, statements: Iterable[str]):
+        """Execute raw SQL `statements`, consuming them as they are executed."""
+
+        def execute_statements(connection: Connection, statements: Iterable[str]):
+            for statement in statements:
+                connection.exec_driver_sql(statement)
+
+        self.run_task(execute_statements, statements=statements)
 
     def run_task(self, fn, **kwargs):
         """Run a given task on the provided connect, with the correct async/sync context.
@@ -162,13 +997,12 @@ class ConnectionExecutor:
         even though all internals are synchronous. This is how alembic suggests
         running the migrations themselves, so this matches that style.
         """
-        # The user may not have sqlalchemy 1.4+, and therefore may not even be able to
-        # use async engines.
-        AsyncEngine = None  # noqa: N806
-        with contextlib.suppress(ImportError):
-            from sqlalchemy.ext.asyncio import AsyncEngine
+        # A `PinnedAsyncEngine` is itself an `AsyncEngine`, but runs every task on its
+        # own connection and loop, rather than through a new loop per task.
+        if _is_pinned_async_engine(self.connection):
+            return self.connection.run_task(fn, **kwargs)
 
-        if AsyncEngine and isinstance(self.connection, AsyncEngine):
+        if _is_async_engine(self.connection):
             import asyncio
 
             async def run(engine):
@@ -181,6 +1015,10 @@ class ConnectionExecutor:
 
             return asyncio.run(run(self.connection))
 
+        if self.pinned:
+            with pinned_transaction(self.connection) as connection:
+                return fn(connection=connection, **kwargs)
+
         if isinstance(self.connection, Engine):
             with self.connection.begin() as connection:
                 result = fn(connection=connection, **kwargs)
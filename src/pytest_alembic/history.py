@@ -1,9 +1,26 @@
+import ast
 import collections
+import hashlib
 import itertools
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+import os
+import re
+import types
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
-from alembic.script.revision import RevisionMap
+from alembic import util
+from alembic.script.base import Script, ScriptDirectory
+from alembic.script.revision import Revision, RevisionMap
+
+# Mirrors alembic's own pattern for (non-sourceless) revision file names.
+_revision_file = re.compile(r"(?!\.\#|__init__)(.*\.py)$")
+
+_HEADER_NAMES = frozenset({"revision", "down_revision", "branch_labels", "depends_on"})
+
+# The number of revision files, above which they are scanned in parallel.
+PARALLEL_SCAN_THRESHOLD = 500
 
 
 @dataclass
@@ -34,6 +51,31 @@ class AlembicHistory:
             revisions_by_index=revisions_by_index,
         )
 
+    def extend(self, revisions: Sequence[Revision]) -> bool:
+        """Append `revisions`, which were newly added to the map, to the history in place.
+
+        This is only possible while each revision linearly extends the history's single
+        head. Otherwise `False` is returned, and the history must be reparsed.
+        """
+        for revision in revisions:
+            if revision.revision in self.revision_indices:
+                continue
+
+            head = self.revisions[-2]
+            if revision.down_revision != (None if head == "base" else head):
+                return False
+            if revision.dependencies:
+                return False
+
+            index = len(self.revisions) - 1
+            self.revisions.insert(index, revision.revision)
+            self.revision_indices[revision.revision] = index
+            self.revisions_by_index[index] = revision.revision
+            self.revision_indices["heads"] = index + 1
+            self.revisions_by_index[index + 1] = "heads"
+
+        return tuple(self.map.heads) == (self.revisions[-2],)
+
     def validate_revision(self, revision):
         # Given that 'heads' seems to be strictly more powerful, coerce singular 'head'
         # to 'heads'.
@@ -55,6 +97,23 @@ class AlembicHistory:
         revision_index = self.revision_indices[revision]
         return self.revisions_by_index.get(revision_index + 1)
 
+    def is_parent(self, parent: str, revision: str) -> bool:
+        """Return whether `parent` is the sole `down_revision` of `revision`.
+
+        That is, whether upgrading from `parent` to `revision` executes exactly one revision.
+        """
+        if revision in ("base", "heads") or parent == "heads":
+            return False
+
+        script = self.map.get_revision(revision)
+        if script is None:
+            return False
+
+        down_revision = script.down_revision
+        if parent == "base":
+            return down_revision is None
+        return down_revision == parent
+
     def revision_range(self, current_revision: str, dest_revision: str) -> List[str]:
         current_revision = self.validate_revision(current_revision)
         dest_revision = self.validate_revision(dest_revision)
@@ -72,3 +131,425 @@ class AlembicHistory:
                 )
             )
         )
+
+
+@dataclass(frozen=True)
+class RevisionHeader:
+    """The attributes of a revision file which are required to build the history.
+
+    `stat` (modification time and size) and `hash` (of the file's contents) identify the
+    version of the file the header was read from.
+    """
+
+    revision: str
+    down_revision: Union[str, Tuple[str, ...], None]
+    branch_labels: Tuple[str, ...]
+    depends_on: Tuple[str, ...]
+    path: str
+    hash: str
+    stat: Tuple[int, int]
+
+    @classmethod
+    def from_script(cls, script: Script, file_hash: str, stat: Tuple[int, int]):
+        return cls(
+            revision=script.revision,
+            down_revision=_down_revision(script.down_revision),
+            branch_labels=tuple(script._orig_branch_labels),  # noqa: SLF001
+            depends_on=util.to_tuple(script.dependencies, default=()),
+            path=script.path,
+            hash=file_hash,
+            stat=stat,
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]):
+        return cls(
+            revision=data["revision"],
+            down_revision=_down_revision(data["down_revision"]),
+            branch_labels=tuple(data["branch_labels"]),
+            depends_on=tuple(data["depends_on"]),
+            path=data["path"],
+            hash=data["hash"],
+            stat=(data["stat"][0], data["stat"][1]),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "revision": self.revision,
+            "down_revision": self.down_revision,
+            "branch_labels": list(self.branch_labels),
+            "depends_on": list(self.depends_on),
+            "path": self.path,
+            "hash": self.hash,
+            "stat": list(self.stat),
+        }
+
+
+class LazyScript(Script):
+    """A `Script` built from a `RevisionHeader`, which only imports its module when accessed.
+
+    Alembic only accesses the module to execute a revision's `upgrade`/`downgrade`
+    (or to read its docstring), so the history can be built and traversed without
+    importing any revision file.
+    """
+
+    def __init__(self, header: RevisionHeader, module: Optional[types.ModuleType] = None):
+        self.header = header
+        self.path = header.path
+        self._module = module
+        Revision.__init__(
+            self,
+            header.revision,
+            header.down_revision,
+            dependencies=header.depends_on,
+            branch_labels=header.branch_labels,
+        )
+
+    @property
+    def imported(self) -> bool:
+        return self._module is not None
+
+    @property
+    def module(self) -> types.ModuleType:
+        if self._module is None:
+            dir_, filename = os.path.split(self.path)
+            self._module = util.load_python_file(dir_, filename)
+        return self._module
+
+    @module.setter
+    def module(self, module: types.ModuleType):
+        self._module = module
+
+
+@dataclass
+class RevisionLoader:
+    """Load the revisions of a `ScriptDirectory`, reusing previously read headers.
+
+    Revisions whose file is unchanged since its header was recorded, or whose header
+    can be read statically (see `scan_revision_header`), are produced as `LazyScript`s,
+    without being imported. Headers are persisted to `cache` (pytest's
+    `config.cache`) if given, so that an unchanged history is never imported across
+    sessions, until its revisions are actually executed.
+
+    `imports` counts the revision files which had to be imported to read their header.
+    """
+
+    script: ScriptDirectory
+    cache: Optional[Any] = None
+
+    headers: Optional[Dict[str, RevisionHeader]] = None
+    imports: int = 0
+
+    # Already imported revision modules, by path, alongside the hash of the file they
+    # were imported from. Retained across rebuilds of the revision map.
+    modules: Dict[str, Tuple[str, types.ModuleType]] = field(default_factory=dict)
+
+    @property
+    def cache_key(self) -> str:
+        location = repr((os.path.abspath(self.script.dir), self.version_locations()))  # noqa: PTH100
+        return "pytest-alembic/history/" + hashlib.sha1(location.encode("utf-8")).hexdigest()  # noqa: S324
+
+    def install(self):
+        """Replace the script's revision map with one built by this loader."""
+        self.script.revision_map = RevisionMap(self.load)
+        return self
+
+    def load(self) -> Iterator[Script]:
+        if self.script.sourceless:
+            # Sourceless revisions cannot be hashed or scanned reliably.
+            yield from self.script._load_revisions()  # noqa: SLF001
+            return
+
+        if self.headers is None:
+            self.headers = self._read_cache()
+
+        paths = self.paths()
+        fresh_headers = {path: self._fresh_header(path) for path in paths}
+
+        headers: Dict[str, RevisionHeader] = {}
+        for path, script in self._load_scripts(paths, fresh_headers):
+            headers[path] = self.headers[path]
+            yield script
+
+        self.headers = headers
+        self._write_cache()
+
+    def refresh(self) -> Optional[List[Script]]:
+        """Update the script's revision map to match the revision files on disk.
+
+        Newly added revision files are added to the existing revision map in place, and
+        returned. Modified or removed files require the revision map to be rebuilt (in which
+        case `None` is returned), although unchanged revisions are neither rescanned nor
+        reimported.
+        """
+        revision_map = self.script.revision_map
+        if (
+            self.script.sourceless
+            or self.headers is None
+            or "_revision_map" not in revision_map.__dict__
+        ):
+            self.install()
+            return None
+
+        paths = self.paths()
+        previous_headers = self.headers
+        fresh_headers = {path: self._fresh_header(path) for path in paths}
+        if set(previous_headers) - set(paths) or any(
+            header is None and path in previous_headers for path, header in fresh_headers.items()
+        ):
+            self._retain_modules(revision_map)
+            self.install()
+            return None
+
+        added = []
+        headers = {path: header for path, header in fresh_headers.items() if header is not None}
+        new_paths = [path for path in paths if path not in previous_headers]
+        for path, script in self._load_scripts(new_paths, fresh_headers):
+            existing = revision_map._revision_map.get(script.revision)  # noqa: SLF001
+            if isinstance(existing, Script) and existing.path == path:
+                # Alembic adds the revisions it generates to the map itself.
+                script = existing
+            else:
+                revision_map.add_revision(script)
+
+            headers[path] = self.headers[path]
+            added.append(script)
+
+        self.headers = headers
+        self._write_cache()
+        return added
+
+    def _load_scripts(
+        self, paths: List[str], fresh_headers: Dict[str, Optional[RevisionHeader]]
+    ) -> Iterator[Tuple[str, Script]]:
+        """Produce the scripts of `paths`, recording the header of each in `headers`."""
+        scanned_headers = scan_revision_headers(
+            [path for path in paths if fresh_headers.get(path) is None]
+        )
+
+        headers = self.headers = dict(self.headers or {})
+        for path in paths:
+            header = fresh_headers.get(path) or scanned_headers.get(path)
+            script: Optional[Script]
+            if header is None:
+                # The header couldn't be determined statically, so the file is imported.
+                dir_, filename = os.path.split(path)
+                script = Script._from_filename(self.script, dir_, filename)  # noqa: SLF001
+                if script is None:
+                    continue
+
+                self.imports += 1
+                header = RevisionHeader.from_script(script, _file_hash(path), _file_stat(path))
+                self.modules[path] = (header.hash, script.module)
+            else:
+                hash_, module = self.modules.get(path, (None, None))
+                script = LazyScript(header, module if hash_ == header.hash else None)
+
+            headers[path] = header
+            yield path, script
+
+    def _retain_modules(self, revision_map: RevisionMap):
+        """Record the modules already imported by the scripts of `revision_map`."""
+        for script in revision_map._revision_map.values():  # noqa: SLF001
+            if not isinstance(script, Script):
+                continue
+            if isinstance(script, LazyScript) and not script.imported:
+                continue
+
+            header = (self.headers or {}).get(script.path)
+            if header is not None:
+                self.modules[script.path] = (header.hash, script.module)
+
+    def paths(self) -> List[str]:
+        """List the revision files of the script directory, as alembic would load them."""
+        paths = []
+        seen = set()
+        for location in self.version_locations():
+            if not os.path.exists(location):  # noqa: PTH110
+                continue
+
+            for file_path in Script._list_py_dir(self.script, location):  # noqa: SLF001
+                real_path = os.path.realpath(file_path)
+                if real_path in seen:
+                    continue
+                seen.add(real_path)
+
+                if _revision_file.match(os.path.basename(real_path)):  # noqa: PTH119
+                    paths.append(real_path)
+        return paths
+
+    def version_locations(self) -> Tuple[str, ...]:
+        if self.script.version_locations:
+            return tuple(self.script._version_locations)  # noqa: SLF001
+        return (self.script.versions,)
+
+    def _fresh_header(self, path: str) -> Optional[RevisionHeader]:
+        """Produce the recorded header of `path`, if the file is unchanged since it was read."""
+        header = (self.headers or {}).get(path)
+        if header is None:
+            return None
+
+        stat = _file_stat(path)
+        if header.stat == stat:
+            return header
+
+        if header.hash != _file_hash(path):
+            return None
+        return replace(header, stat=stat)
+
+    def _read_cache(self) -> Dict[str, RevisionHeader]:
+        if self.cache is None:
+            return {}
+
+        data = self.cache.get(self.cache_key, None) or []
+        headers = {}
+        for item in data:
+            try:
+                header = RevisionHeader.from_dict(item)
+            except (KeyError, TypeError, IndexError):
+                # A cache written by another version of this loader.
+                return {}
+            headers[header.path] = header
+        return headers
+
+    def _write_cache(self):
+        if self.cache is None or self.headers is None:
+            return
+
+        self.cache.set(self.cache_key, [header.to_dict() for header in self.headers.values()])
+
+
+def scan_revision_headers(
+    paths: List[str], *, processes: Optional[int] = None
+) -> Dict[str, Optional[RevisionHeader]]:
+    """Scan the headers of many revision files, through `scan_revision_header`.
+
+    Directories with at least `PARALLEL_SCAN_THRESHOLD` files are scanned across a pool
+    of `processes` processes (defaulting to the number of CPUs).
+    """
+    if len(paths) >= PARALLEL_SCAN_THRESHOLD and processes != 1:
+        try:
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                workers = processes or os.cpu_count() or 1
+                chunksize = max(1, len(paths) // (workers * 4))
+                headers = executor.map(scan_revision_header, paths, chunksize=chunksize)
+                return dict(zip(paths, headers))
+        except (OSError, BrokenProcessPool):
+            # Process pools are unavailable on some platforms/sandboxes.
+            pass
+
+    return {path: scan_revision_header(path) for path in paths}
+
+
+def scan_revision_header(path: str) -> Optional[RevisionHeader]:
+    """Read the header of a revision file from its source, without importing it.
+
+    The header can only be read if `revision`, `down_revision`, `branch_labels` and
+    `depends_on` are each (if at all) assigned exactly once, at the top-level of the
+    module, to a literal value. Otherwise `None` is returned, and the file must be
+    imported to determine its header.
+    """
+    with open(path, "rb") as f:  # noqa: PTH123
+        source = f.read()
+
+    try:
+        module = ast.parse(source, filename=path)
+    except (SyntaxError, ValueError):
+        return None
+
+    values = _literal_assignments(module)
+    if values is None or "revision" not in values or "down_revision" not in values:
+        return None
+
+    if _count_bindings(module) != len(values):
+        # Some other binding of the header names (conditional assignments, unpacking,
+        # imports, etc) requires the module to actually be evaluated.
+        return None
+
+    revision = values["revision"]
+    down_revision = values["down_revision"]
+    branch_labels = values.get("branch_labels")
+    depends_on = values.get("depends_on")
+    if not isinstance(revision, str) or not all(
+        _is_revisions(value) for value in (down_revision, branch_labels, depends_on)
+    ):
+        return None
+
+    stat = os.stat(path)  # noqa: PTH116
+    return RevisionHeader(
+        revision=revision,
+        down_revision=_down_revision(down_revision),
+        branch_labels=util.to_tuple(branch_labels, default=()),
+        depends_on=util.to_tuple(depends_on, default=()),
+        path=path,
+        hash=hashlib.sha1(source).hexdigest(),  # noqa: S324
+        stat=(stat.st_mtime_ns, stat.st_size),
+    )
+
+
+def _literal_assignments(module: ast.Module) -> Optional[Dict[str, Any]]:
+    """Collect the top-level, literal assignments to header names."""
+    values: Dict[str, Any] = {}
+    for statement in module.body:
+        target: Optional[ast.expr]
+        if isinstance(statement, ast.Assign) and len(statement.targets) == 1:
+            target = statement.targets[0]
+        elif isinstance(statement, ast.AnnAssign) and statement.value is not None:
+            target = statement.target
+        else:
+            continue
+
+        if not isinstance(target, ast.Name) or target.id not in _HEADER_NAMES:
+            continue
+
+        if target.id in values:
+            return None
+
+        try:
+            values[target.id] = ast.literal_eval(statement.value)  # type: ignore[arg-type]
+        except ValueError:
+            return None
+    return values
+
+
+def _count_bindings(module: ast.Module) -> Optional[int]:
+    """Count every binding of a header name, anywhere in the module.
+
+    Bindings which can never be resolved statically (imports, star imports and `global`
+    declarations) produce `None`.
+    """
+    bindings = 0
+    for node in ast.walk(module):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+            bindings += node.id in _HEADER_NAMES
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            names = {alias.asname or alias.name for alias in node.names}
+            if "*" in names or _HEADER_NAMES.intersection(names):
+                return None
+        elif isinstance(node, (ast.Global, ast.Nonlocal)) and _HEADER_NAMES.intersection(
+            node.names
+        ):
+            return None
+    return bindings
+
+
+def _is_revisions(value) -> bool:
+    if value is None or isinstance(value, str):
+        return True
+    return isinstance(value, (list, tuple)) and all(isinstance(item, str) for item in value)
+
+
+def _down_revision(down_revision) -> Union[str, Tuple[str, ...], None]:
+    if isinstance(down_revision, list):
+        return tuple(down_revision)
+    return down_revision
+
+
+def _file_stat(path: str) -> Tuple[int, int]:
+    stat = os.stat(path)  # noqa: PTH116
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _file_hash(path: str) -> str:
+    with open(path, "rb") as f:  # noqa: PTH123
+        return hashlib.sha1(f.read()).hexdigest()  # noqa: S324
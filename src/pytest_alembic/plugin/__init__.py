@@ -2,8 +2,11 @@ from pytest_alembic.plugin.fixtures import (
     alembic_config,
     alembic_engine,
     alembic_runner,
+    alembic_worker_engine,
+    async_alembic_runner,
 )
 from pytest_alembic.plugin.hooks import (
+    pytest_addhooks,
     pytest_addoption,
     pytest_configure,
     pytest_sessionstart,
@@ -13,6 +16,9 @@ __all__ = [
     "alembic_config",
     "alembic_engine",
     "alembic_runner",
+    "alembic_worker_engine",
+    "async_alembic_runner",
+    "pytest_addhooks",
     "pytest_addoption",
     "pytest_configure",
     "pytest_sessionstart",
@@ -6,6 +6,14 @@ import sqlalchemy
 
 import pytest_alembic
 from pytest_alembic.config import Config
+from pytest_alembic.plugin.xdist import worker_id
+
+try:
+    import pytest_asyncio
+
+    async_fixture = pytest_asyncio.fixture
+except ImportError:  # pragma: no cover
+    async_fixture = pytest.fixture  # type: ignore[assignment]
 
 
 def create_alembic_fixture(raw_config=None):
@@ -49,6 +57,33 @@ def create_alembic_fixture(raw_config=None):
     return alembic_fixture
 
 
+def create_async_alembic_fixture(raw_config=None):
+    """Create a new `async_alembic_runner`-like fixture.
+
+    As with :func:`create_alembic_fixture`, this is minimally necessary for each
+    additional alembic history.
+
+    Examples:
+        >>> import asyncio
+        >>>
+        >>> other_alembic = create_async_alembic_fixture({'file': 'other.ini'})
+        >>>
+        >>> async def test_histories(async_alembic_runner, other_alembic):
+        ...     await asyncio.gather(
+        ...         async_alembic_runner.migrate_up_to('heads'),
+        ...         other_alembic.migrate_up_to('heads'),
+        ...     )
+    """
+
+    @async_fixture
+    async def alembic_fixture(alembic_engine):
+        config = Config.from_raw_config(raw_config)
+        async with pytest_alembic.async_runner(config=config, engine=alembic_engine) as runner:
+            yield runner
+
+    return alembic_fixture
+
+
 @pytest.fixture
 def alembic_runner(alembic_config, alembic_engine):
     """Produce the primary alembic migration context in which to execute alembic tests.
@@ -66,6 +101,23 @@ def alembic_runner(alembic_config, alembic_engine):
         yield runner
 
 
+@async_fixture
+async def async_alembic_runner(alembic_config, alembic_engine):
+    """Produce an alembic migration context, for use in async tests.
+
+    Requires the :func:`alembic_engine` fixture to produce an `AsyncEngine`, and an async
+    test runner, such as `pytest-asyncio`. See :class:`pytest_alembic.AsyncMigrationContext`.
+
+    Examples:
+        >>> async def test_specific_migration(async_alembic_runner):
+        ...     await async_alembic_runner.migrate_up_to('xxxxxxx')
+        ...     assert ...
+    """
+    config = Config.from_raw_config(alembic_config)
+    async with pytest_alembic.async_runner(config=config, engine=alembic_engine) as runner:
+        yield runner
+
+
 @pytest.fixture
 def alembic_config() -> Union[Dict[str, Any], alembic.config.Config, Config]:
     """Override this fixture to configure the exact alembic context setup required.
@@ -127,3 +179,35 @@ def alembic_engine():
         yield engine
     finally:
         engine.dispose()
+
+
+@pytest.fixture
+def alembic_worker_engine(request, tmp_path_factory):
+    """Produce an engine for a database isolated to the current pytest-xdist worker.
+
+    By default, this is a file-backed SQLite database, named by the worker's id, and
+    removed after each test. Implement the :func:`pytest_alembic_worker_engine` hook to
+    provision databases on some other backend.
+
+    Examples:
+        >>> @pytest.fixture
+        ... def alembic_engine(alembic_worker_engine):
+        ...     return alembic_worker_engine
+    """
+    worker = worker_id(request.config)
+    path = tmp_path_factory.getbasetemp() / f"alembic-{worker}.sqlite"
+
+    engine = request.config.hook.pytest_alembic_worker_engine(worker_id=worker, path=path)
+    if engine is not None:
+        try:
+            yield engine
+        finally:
+            engine.dispose()
+        return
+
+    engine = sqlalchemy.create_engine(f"sqlite:///{path}")
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+        path.unlink(missing_ok=True)
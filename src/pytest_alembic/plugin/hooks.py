@@ -1,4 +1,8 @@
+from pytest_alembic.checkpoint import checkpoint_cache, head_cache
+from pytest_alembic.executor import env_script_cache, script_cache
+from pytest_alembic.plugin.plan import migration_plan
 from pytest_alembic.plugin.plugin import OptionResolver, PytestAlembicPlugin
+from pytest_alembic.plugin.xdist import shared_checkpoints
 
 
 def pytest_addoption(parser):
@@ -37,6 +41,28 @@ def pytest_addoption(parser):
         "defined/registered. Note that this path must be the full path, relative to the root location "
         "at which pytest is being invoked.",
     )
+    parser.addini(
+        "pytest_alembic_per_revision",
+        "Whether to collect built-in tests which loop over every revision (such as "
+        "'up_down_consistency') as one test per revision of the default alembic config's "
+        "history. Defaults to false.",
+        type="bool",
+        default=False,
+    )
+    parser.addini(
+        "pytest_alembic_history_cache",
+        "Whether to persist the headers of revision files in pytest's cache, such that unchanged "
+        "revisions need not be imported until they are executed. Defaults to true.",
+        type="bool",
+        default=True,
+    )
+    parser.addini(
+        "pytest_alembic_shared_checkpoints",
+        "Whether pytest-xdist workers share the checkpoints of the built-in tests' upgrades "
+        "(of SQLite databases), through files in pytest's cache. Defaults to true.",
+        type="bool",
+        default=True,
+    )
 
     group = parser.getgroup("collect")
     group.addoption(
@@ -52,6 +78,16 @@ def pytest_addoption(parser):
         help=f"List of built-in tests to exclude. Valid options include: {default_tests}",
         dest="pytest_alembic_exclude",
     )
+    group.addoption(
+        "--alembic-per-revision",
+        action="store_true",
+        default=False,
+        help=(
+            "Collect built-in tests which loop over every revision as one test per revision. "
+            "Has higher precedence than the corresponding `pytest_alembic_per_revision` ini option."
+        ),
+        dest="pytest_alembic_per_revision",
+    )
     group.addoption(
         "--alembic-tests-path",
         help=(
@@ -62,11 +98,26 @@ def pytest_addoption(parser):
     )
 
 
+def pytest_addhooks(pluginmanager):
+    from pytest_alembic.plugin import hookspecs
+
+    pluginmanager.add_hookspecs(hookspecs)
+
+
 def pytest_configure(config):
     config.addinivalue_line("markers", "alembic: Tests which use pytest-alembic.")
 
 
 def pytest_sessionstart(session):
     if session.config.getini("pytest_alembic_enabled"):
+        env_script_cache.reset_counts()
+        script_cache.clear()
+        checkpoint_cache.clear()
+        migration_plan.reset(shared_checkpoints(session.config))
+        script_cache.history_cache = None
+        head_cache.reset(getattr(session.config, "cache", None))
+        if session.config.getini("pytest_alembic_history_cache"):
+            script_cache.history_cache = getattr(session.config, "cache", None)
+
         plugin = PytestAlembicPlugin(session.config)
         session.config.pluginmanager.register(plugin, "pytest-alembic")
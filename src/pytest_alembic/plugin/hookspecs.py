@@ -0,0 +1,18 @@
+import pytest
+
+
+@pytest.hookspec(firstresult=True)
+def pytest_alembic_worker_engine(worker_id, path):
+    """Produce the engine yielded by the `alembic_worker_engine` fixture, for a single test.
+
+    Implement this hook (for example, in a ``conftest.py``) to provision per-worker databases
+    on some other backend, such as a PostgreSQL database named by `worker_id`. The engine
+    is disposed of after the test, and each test should be given an empty database.
+
+    Args:
+        worker_id: The pytest-xdist worker id (such as "gw0"), or "master" without pytest-xdist.
+        path: The file-backed SQLite database otherwise used, unique to the worker.
+
+    Returns:
+        An `Engine`, or `None` to fall back to the SQLite database at `path`.
+    """
@@ -0,0 +1,181 @@
+import contextlib
+import hashlib
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING
+
+from pytest_alembic.checkpoint import CheckpointStore
+
+if TYPE_CHECKING:
+    from pytest_alembic.runner import MigrationContext
+
+# The default bound (in bytes) on the plan's in-memory checkpoints.
+DEFAULT_CHECKPOINT_BUDGET = 64 * 1024 * 1024
+
+
+@dataclass
+class UpgradeOutcome:
+    """The result of upgrading a history from "base" to "heads"."""
+
+    error: Optional[Exception] = None
+    traceback: Optional[TracebackType] = None
+
+    # The revision whose upgrade failed, where it could be determined.
+    failing_revision: Optional[str] = None
+
+    def raise_for_error(self):
+        if self.error is not None:
+            raise self.error.with_traceback(self.traceback)
+
+
+@dataclass
+class MigrationPlan:
+    """Upgrade each history from "base" to "heads" once per session, for the built-in tests.
+
+    The first upgrade captures a checkpoint after each revision, and records its outcome.
+    Later upgrades from the same starting state restore the "heads" checkpoint rather than
+    replaying the history, or report the recorded failure rather than re-executing it.
+
+    Upgrades are shared where the database supports checkpoints (see
+    :class:`pytest_alembic.checkpoint.CheckpointStore`). Otherwise (or if the runner
+    is not at "base", is isolated by `rollback_isolation`, or is configured with a
+    `transaction_mode` other than "revision"), they are simply performed.
+
+    Each history (identified by its script directory, its "heads" checkpoint key and its
+    `env.py`) uses its own :meth:`~pytest_alembic.checkpoint.CheckpointStore.namespace`
+    of `checkpoints`.
+
+    The upgrade is always replayed, rather than restored from the configured `head_cache`,
+    given that executing the history is the point of the built-in tests.
+
+    By default, the checkpoints held in memory are bounded by `DEFAULT_CHECKPOINT_BUDGET`
+    bytes, evicting the least recently used (the "heads" checkpoint, having just been
+    captured, is the last to be evicted).
+    """
+
+    checkpoints: CheckpointStore = field(default_factory=lambda: default_checkpoints())
+    outcomes: Dict[str, UpgradeOutcome] = field(default_factory=dict)
+
+    def shares(self, alembic_runner: "MigrationContext") -> bool:
+        """Whether upgrades of `alembic_runner` are shared through the plan."""
+        return self._keys(alembic_runner) is not None
+
+    def upgrade(self, alembic_runner: "MigrationContext") -> UpgradeOutcome:
+        """Upgrade `alembic_runner` to "heads", returning (rather than raising) any failure."""
+        keys = self._keys(alembic_runner)
+        if keys is None:
+            try:
+                alembic_runner.managed_upgrade("heads", return_current=False, cached=False)
+            except Exception as e:  # noqa: BLE001
+                return UpgradeOutcome(error=e, traceback=e.__traceback__)
+            return UpgradeOutcome()
+
+        history = self._history(alembic_runner, keys)
+        script_dir = alembic_runner.command_executor.script.dir
+        key = hashlib.sha1(f"{script_dir}\0{history}".encode()).hexdigest()  # noqa: S324
+
+        outcome = self.outcomes.get(key)
+        if outcome is not None and outcome.error is not None:
+            return outcome
+
+        with self.attach(alembic_runner, history):
+            try:
+                alembic_runner.managed_upgrade("heads", return_current=False, cached=False)
+            except Exception as e:  # noqa: BLE001
+                failing_revision = _failing_revision(alembic_runner, keys)
+                outcome = UpgradeOutcome(
+                    error=e, traceback=e.__traceback__, failing_revision=failing_revision
+                )
+            else:
+                outcome = UpgradeOutcome()
+
+        self.outcomes[key] = outcome
+        return outcome
+
+    def upgrade_to(self, alembic_runner: "MigrationContext", revision: str) -> UpgradeOutcome:
+        """Upgrade `alembic_runner` to `revision`, through the plan's checkpoints where shared.
+
+        Unlike :meth:`upgrade`, the outcome is not recorded.
+        """
+        keys = self._keys(alembic_runner)
+        attached = (
+            contextlib.nullcontext()
+            if keys is None
+            else self.attach(alembic_runner, self._history(alembic_runner, keys))
+        )
+        with attached:
+            try:
+                alembic_runner.migrate_up_to(revision, return_current=False)
+            except Exception as e:  # noqa: BLE001
+                return UpgradeOutcome(error=e, traceback=e.__traceback__)
+        return UpgradeOutcome()
+
+    @contextlib.contextmanager
+    def attach(
+        self, alembic_runner: "MigrationContext", history: Optional[str] = None
+    ) -> Iterator[CheckpointStore]:
+        """Supply the plan's checkpoints (for `history`, if given) to a runner without its own.
+
+        Yields:
+            The checkpoints used by the runner.
+        """
+        if alembic_runner.checkpoints is not None:
+            yield alembic_runner.checkpoints
+            return
+
+        checkpoints = self.checkpoints
+        if history is not None:
+            script_dir = alembic_runner.command_executor.script.dir
+            checkpoints = checkpoints.namespace(script_dir, history)
+
+        alembic_runner.checkpoints = checkpoints
+        try:
+            yield checkpoints
+        finally:
+            alembic_runner.checkpoints = None
+
+    def reset(self, checkpoints: Optional[CheckpointStore] = None):
+        """Discard all state, replacing the store of checkpoints (with `checkpoints`, if given)."""
+        self.checkpoints = checkpoints if checkpoints is not None else default_checkpoints()
+        self.outcomes.clear()
+
+    def _keys(self, alembic_runner: "MigrationContext") -> Optional[List[Tuple[str, str]]]:
+        if alembic_runner.connection_executor.isolated or alembic_runner.current != "base":
+            return None
+
+        # Checkpoints are captured as each revision is committed, which the mode prevents.
+        if alembic_runner.config.transaction_mode != "revision":
+            return None
+
+        with self.attach(alembic_runner):
+            return alembic_runner.checkpoint_keys("heads")
+
+    def _history(self, alembic_runner: "MigrationContext", keys: List[Tuple[str, str]]) -> str:
+        script = alembic_runner.command_executor.script
+        return self.checkpoints.key(keys[-1][1], "env.py", script.env_py_location)
+
+
+def default_checkpoints() -> CheckpointStore:
+    return CheckpointStore(budget=DEFAULT_CHECKPOINT_BUDGET)
+
+
+def _failing_revision(
+    alembic_runner: "MigrationContext", keys: List[Tuple[str, str]]
+) -> Optional[str]:
+    """Produce the revision following the one a failed upgrade reached, if it's known.
+
+    Each revision is committed (and checkpointed) as it's applied, so the database is left
+    at the last successful revision. The checkpoints captured up to it may since have been
+    evicted, so can't themselves be relied upon.
+    """
+    revisions = [revision for revision, _ in keys]
+    try:
+        last = alembic_runner.current
+    except Exception:  # noqa: BLE001
+        return None
+
+    index = revisions.index(last) + 1 if last in revisions else 0
+    return revisions[index] if index < len(revisions) else None
+
+
+migration_plan = MigrationPlan()
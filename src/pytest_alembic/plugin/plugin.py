@@ -1,11 +1,24 @@
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path, PurePath
 from typing import Callable, cast, Dict, List, Optional
 
+import alembic.util
 import pytest
 from _pytest import config
 
+from pytest_alembic.config import Config
+from pytest_alembic.executor import CommandExecutor, script_cache
+from pytest_alembic.plugin import fixtures
+from pytest_alembic.plugin.xdist import (
+    duration_key,
+    DURATIONS_CACHE_KEY,
+    GROUP_PREFIX,
+    longest_first,
+    revision_groups,
+    worker_count,
+)
+
 pytest_version_tuple = getattr(pytest, "version_tuple", None)
 
 
@@ -14,6 +27,9 @@ class PytestAlembicPlugin:
     config: config.Config
     registered = False
 
+    # The duration of each pytest-alembic item run during the session, by node id.
+    durations: Dict[str, float] = field(default_factory=dict)
+
     # Some weird decisions were made by pytest it seems like. There is not an obvious
     # way to support both <7 and >=7 without weird nonsense like this.
     if pytest_version_tuple and pytest_version_tuple >= (8, 1, 0):
@@ -55,9 +71,41 @@ class PytestAlembicPlugin:
         if not hasattr(item, "fixturenames"):
             return
 
-        if "alembic_runner" in item.fixturenames:
+        fixturenames = item.fixturenames
+        if "alembic_runner" in fixturenames or "async_alembic_runner" in fixturenames:
             item.add_marker("alembic")
 
+    def pytest_collection_modifyitems(self, items):
+        """Run pytest-alembic items longest-first, when distributed across pytest-xdist workers.
+
+        Items retain the positions occupied by pytest-alembic items, and are only reordered
+        amongst themselves, by the durations recorded in previous sessions.
+        """
+        if worker_count(self.config) <= 1:
+            return
+
+        cache = getattr(self.config, "cache", None)
+        durations = cache.get(DURATIONS_CACHE_KEY, {}) if cache else {}
+
+        indices = [index for index, item in enumerate(items) if isinstance(item, PytestAlembicItem)]
+        ordered = longest_first([items[index] for index in indices], durations)
+        for index, item in zip(indices, ordered):
+            items[index] = item
+
+    def pytest_runtest_logreport(self, report):
+        if report.when == "call" and "::pytest-alembic::" in report.nodeid:
+            self.durations[duration_key(report.nodeid)] = report.duration
+
+    def pytest_sessionfinish(self):
+        """Record the durations of pytest-alembic items, for ordering future sessions."""
+        cache = getattr(self.config, "cache", None)
+        if not self.durations or cache is None or hasattr(self.config, "workerinput"):
+            return
+
+        durations = cache.get(DURATIONS_CACHE_KEY, {})
+        durations.update(self.durations)
+        cache.set(DURATIONS_CACHE_KEY, durations)
+
 
 class TestCollector(pytest.Module):
     def __init__(self, **kwargs):
@@ -90,19 +138,74 @@ class TestCollector(pytest.Module):
             .exclude(*raw_excluded_tests)
         )
 
+        per_revision = option.pytest_alembic_per_revision or config.getini(
+            "pytest_alembic_per_revision"
+        )
+        revisions: List[str] = []
+        if per_revision:
+            revisions = self.collect_revisions()
+
+        # Under pytest-xdist, items which share checkpoints are grouped onto the same worker
+        # (with `--dist loadgroup`): per-revision items by contiguous ranges of revisions,
+        # and every other item alongside the last range, where the "heads" upgrade is shared.
+        distributed = worker_count(config) > 1
+        groups = revision_groups(revisions, worker_count(config))
+        group = groups[revisions[-1]] if revisions else GROUP_PREFIX
+
         result = []
         for test in test_collector.sorted_tests():
             name = test.raw_name
             self.ihook.pytest_pycollect_makeitem(collector=self, name=name, obj=test)
-            result.append(
-                PytestAlembicItem.from_parent(
-                    self,
-                    name=name,
-                    callobj=test.function,
-                )
+
+            if test.per_revision and revisions:
+                for revision in revisions:
+                    item = PytestAlembicItem.from_parent(
+                        self,
+                        name=f"{name}[{revision}]",
+                        originalname=name,
+                        callobj=bind_revision(test.per_revision, revision),
+                    )
+                    if distributed:
+                        item.add_marker(pytest.mark.xdist_group(name=groups[revision]))
+                    result.append(item)
+                continue
+
+            item = PytestAlembicItem.from_parent(
+                self,
+                name=name,
+                callobj=test.function,
             )
+            if distributed:
+                item.add_marker(pytest.mark.xdist_group(name=group))
+            result.append(item)
         return result
 
+    def collect_revisions(self) -> List[str]:
+        """Read the revisions to collect per-revision tests for, warning where they can't be.
+
+        The `alembic_config` fixture can't be evaluated at collection time, so the revisions
+        are only read where it is not overridden, and therefore resolves to `alembic.ini`.
+        """
+        if overrides_fixture(self, "alembic_config"):
+            message = (
+                "pytest-alembic cannot read the revisions of an overridden `alembic_config` "
+                "fixture at collection time, so is collecting each built-in test once, rather "
+                "than once per revision."
+            )
+            self.warn(pytest.PytestConfigWarning(message))
+            return []
+
+        try:
+            return collect_revisions()
+        except alembic.util.CommandError as e:
+            message = (
+                "pytest-alembic could not read the revisions of the default alembic config "
+                f"(`alembic.ini`), so is collecting each built-in test once, rather than once "
+                f"per revision: {e}"
+            )
+            self.warn(pytest.PytestConfigWarning(message))
+            return []
+
 
 class PytestAlembicItem(pytest.Function):
     def reportinfo(self):
@@ -115,6 +218,9 @@ class PytestAlembicTest:
     function: Callable
     is_experimental: bool
 
+    # The equivalent of `function` for a single revision, if it can be split up by revision.
+    per_revision: Optional[Callable] = None
+
     @property
     def name(self):
         # Chop off the "test_" prefix.
@@ -138,17 +244,29 @@ class OptionResolver:
     ):
         import pytest_alembic.tests
         import pytest_alembic.tests.experimental
+        from pytest_alembic.tests.default import up_down_consistency_at
+        from pytest_alembic.tests.experimental.downgrade_leaves_no_trace import (
+            downgrade_leaves_no_trace_at,
+        )
 
         test_groups = [(pytest_alembic.tests, False)]
         if experimental:
             test_groups.append((pytest_alembic.tests.experimental, True))
 
+        per_revision_tests = {
+            "test_up_down_consistency": up_down_consistency_at,
+            "test_downgrade_leaves_no_trace": downgrade_leaves_no_trace_at,
+        }
+
         all_tests = {}
         for test_group, is_experimental in test_groups:
             for name in dir(test_group):
                 if name.startswith("test_"):
                     pytest_alembic_test = PytestAlembicTest(
-                        name, getattr(test_group, name), is_experimental
+                        name,
+                        getattr(test_group, name),
+                        is_experimental,
+                        per_revision=per_revision_tests.get(name),
                     )
                     all_tests[pytest_alembic_test.name] = pytest_alembic_test
 
@@ -226,3 +344,38 @@ def parse_test_names(raw_test_names):
             continue
         result.add(test_name)
     return result
+
+
+def collect_revisions() -> List[str]:
+    """Read the revisions of the default alembic config's history, from base to head.
+
+    Raises:
+        alembic.util.CommandError: If there's no default alembic config, or its script
+            location cannot be found.
+    """
+    command_executor = CommandExecutor.from_config(Config())
+    history = script_cache.history(command_executor.script)
+    return history.revisions[1:-1]
+
+
+def overrides_fixture(node: pytest.Collector, name: str) -> bool:
+    """Whether the fixture `name`, as visible to `node`, is defined outside of pytest-alembic."""
+    fixture_manager = node.session._fixturemanager  # noqa: SLF001
+    if pytest_version_tuple and pytest_version_tuple >= (8, 1, 0):
+        fixturedefs = fixture_manager.getfixturedefs(name, node)
+    else:
+        fixturedefs = fixture_manager.getfixturedefs(name, node.nodeid)  # type: ignore[arg-type]
+
+    if not fixturedefs:
+        return False
+    return fixturedefs[-1].func.__module__ != fixtures.__name__
+
+
+def bind_revision(function: Callable, revision: str) -> Callable:
+    """Produce a test function which calls `function` for the given `revision`."""
+
+    def test(alembic_runner):
+        return function(alembic_runner, revision)
+
+    test.__doc__ = function.__doc__
+    return test
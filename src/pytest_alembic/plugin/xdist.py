@@ -0,0 +1,92 @@
+"""Support for distributing pytest-alembic tests with pytest-xdist.
+
+None of this requires pytest-xdist to be installed. Without it, the session is treated
+as a single worker, named "master" (as pytest-xdist itself does).
+"""
+
+import math
+import uuid
+from typing import Dict, List, Optional, Sequence
+
+import pytest
+from _pytest import config
+
+from pytest_alembic.checkpoint import FileCheckpointStore
+
+CHECKPOINTS_CACHE_DIR = "pytest-alembic-checkpoints"
+DURATIONS_CACHE_KEY = "pytest-alembic/durations"
+GROUP_PREFIX = "pytest-alembic"
+
+
+def worker_id(config: config.Config) -> str:
+    """Produce the id of the current pytest-xdist worker (such as "gw0"), or "master"."""
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is None:
+        return "master"
+    return workerinput["workerid"]
+
+
+def worker_count(config: config.Config) -> int:
+    """Produce the number of pytest-xdist workers in the session, or 1 without pytest-xdist."""
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is None:
+        return 1
+    return int(workerinput["workercount"])
+
+
+def run_id(config: config.Config) -> str:
+    """Produce an id shared by every worker of the current pytest-xdist run.
+
+    Without pytest-xdist, a new id is produced on every call.
+    """
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is None:
+        return uuid.uuid4().hex
+    return workerinput["testrunuid"]
+
+
+def shared_checkpoints(config: config.Config) -> Optional[FileCheckpointStore]:
+    """Produce a store of checkpoints shared between pytest-xdist workers, through pytest's cache.
+
+    This is only the case with more than one worker, unless disabled through the
+    `pytest_alembic_shared_checkpoints` ini option.
+    """
+    cache = getattr(config, "cache", None)
+    if cache is None or worker_count(config) <= 1:
+        return None
+
+    if not config.getini("pytest_alembic_shared_checkpoints"):
+        return None
+
+    return FileCheckpointStore(directory=cache.mkdir(CHECKPOINTS_CACHE_DIR), run_id=run_id(config))
+
+
+def revision_groups(revisions: Sequence[str], count: int) -> Dict[str, str]:
+    """Split `revisions` into (at most) `count` contiguous groups, named for `xdist_group`.
+
+    Per-revision tests start from a checkpoint of the preceding revision, so a worker which
+    runs a contiguous range of revisions only needs to upgrade to the start of that range
+    once, with every later test restoring a checkpoint captured along the way.
+    """
+    if not revisions:
+        return {}
+
+    count = max(1, min(count, len(revisions)))
+    return {
+        revision: f"{GROUP_PREFIX}-{index * count // len(revisions)}"
+        for index, revision in enumerate(revisions)
+    }
+
+
+def longest_first(items: Sequence[pytest.Item], durations: Dict[str, float]) -> List[pytest.Item]:
+    """Order `items` by their recorded durations, longest first.
+
+    Items without a recorded duration are assumed to be the longest. Otherwise, the
+    original order is retained, such that every worker collects the same order.
+    """
+    return sorted(items, key=lambda item: -durations.get(duration_key(item.nodeid), math.inf))
+
+
+def duration_key(nodeid: str) -> str:
+    """Strip the "@<group>" suffix which pytest-xdist appends to grouped items' node ids."""
+    return nodeid.split(f"@{GROUP_PREFIX}", 1)[0]
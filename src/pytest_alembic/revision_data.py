@@ -1,18 +1,415 @@
+import abc
+import csv
+import functools
+import hashlib
+import json
+import os
+import pathlib
+import re
+import types
 from dataclasses import dataclass
-from typing import Dict, List, TYPE_CHECKING, Union
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+    Union,
+)
 
 if TYPE_CHECKING:
     from pytest_alembic.config import Config
+    from pytest_alembic.executor import ConnectionExecutor
+
+
+class DataSource(abc.ABC):
+    """Lazily produce the data to insert at a given revision.
+
+    A source is only read once its revision is reached during an upgrade, and inserted
+    however is appropriate to it (for example, `SQLFile` executes its statements).
+    Sources which produce rows subclass `RowSource` instead.
+    """
+
+    # Whether the source produces rows (see `RowSource`), as read by `RevisionData.get`.
+    produces_rows: ClassVar[bool] = False
+
+    @abc.abstractmethod
+    def insert(self, connection_executor: "ConnectionExecutor", revision: str):
+        """Insert the source's data, using the table definitions at `revision`."""
+
+    def fingerprint(self) -> Optional[str]:
+        """Identify the data the source produces, such that it changes if the data does.
+
+        Used to key checkpoints (see :class:`pytest_alembic.checkpoint.CheckpointStore`).
+        By default, the source's `repr`, which must therefore describe its data in full.
+        A source which cannot be identified (for example, whose `repr` includes a memory
+        address) produces `None`, which disables checkpoints altogether.
+        """
+        return _stable_repr(self)
+
+    @classmethod
+    def from_path(cls, path: Union[str, os.PathLike], table: Optional[str] = None):
+        """Produce the file-backed source appropriate to the extension of `path`."""
+        suffix = pathlib.Path(path).suffix.lower()
+        if suffix == ".csv":
+            return CSVFile(path, table=table)
+        if suffix in (".jsonl", ".ndjson"):
+            return JSONLinesFile(path, table=table)
+        if suffix == ".sql":
+            return SQLFile(path)
+
+        message = f"Unrecognized revision data file type: {path}"
+        raise ValueError(message)
+
+
+class RowSource(DataSource):
+    """A `DataSource` of rows, in the same form as would be given directly.
+
+    Rows are streamed into the database in bounded chunks (see
+    `ConnectionExecutor.table_insert`), so that the data never needs to be held in memory
+    in its entirety.
+    """
+
+    produces_rows = True
+
+    @abc.abstractmethod
+    def rows(self) -> Iterable[Dict]:
+        """Produce the rows of the source."""
+
+    def insert(self, connection_executor: "ConnectionExecutor", revision: str):
+        connection_executor.table_insert(revision=revision, data=self.rows())
+
+
+@dataclass
+class Rows(RowSource):
+    """Rows produced by an iterable, or by a callable returning an iterable.
+
+    Note a generator (or any other iterator) can only be consumed once. Supply a
+    callable producing one, to insert the same data through more than one upgrade.
+    """
+
+    data: Union[Iterable[Dict], Callable[[], Iterable[Dict]]]
+
+    def rows(self) -> Iterator[Dict]:
+        data = self.data() if callable(self.data) else self.data
+        if isinstance(data, dict):
+            yield data
+        else:
+            yield from data
+
+    def fingerprint(self) -> Optional[str]:
+        """Identify callables by their code and closure, and iterators not at all.
+
+        An iterator's (or generator's) rows cannot be known without consuming it.
+        """
+        if callable(self.data):
+            return _callable_fingerprint(self.data)
+        if isinstance(self.data, (dict, list, tuple)):
+            return _stable_repr(("Rows", self.data))
+        return None
+
+
+@dataclass
+class CSVFile(RowSource):
+    """Rows read from a CSV file with a header row.
+
+    Rows are inserted into `table` (defaulting to the file's name, without extension),
+    unless they include a `__tablename__` column. Values equal to `null` are inserted
+    as `NULL`.
+    """
+
+    path: Union[str, os.PathLike]
+    table: Optional[str] = None
+    null: Optional[str] = ""
+
+    def rows(self) -> Iterator[Dict]:
+        table = self.table or pathlib.Path(self.path).stem
+        with open(self.path, newline="") as f:  # noqa: PTH123
+            for row in csv.DictReader(f):
+                yield _with_table(
+                    {k: (None if v == self.null else v) for k, v in row.items()}, table
+                )
+
+    def fingerprint(self) -> str:
+        return repr(("CSVFile", self.table, self.null, _file_hash(self.path)))
+
+
+@dataclass
+class JSONLinesFile(RowSource):
+    """Rows read from a JSON Lines file, one JSON object per line.
+
+    As with `CSVFile`, rows are inserted into `table` (defaulting to the file's name),
+    unless they include a `__tablename__` key.
+    """
+
+    path: Union[str, os.PathLike]
+    table: Optional[str] = None
+
+    def rows(self) -> Iterator[Dict]:
+        table = self.table or pathlib.Path(self.path).stem
+        with open(self.path) as f:  # noqa: PTH123
+            for line in f:
+                if line.strip():
+                    yield _with_table(json.loads(line), table)
+
+    def fingerprint(self) -> str:
+        return repr(("JSONLinesFile", self.table, _file_hash(self.path)))
+
+
+@dataclass
+class SQLFile(DataSource):
+    """SQL statements (for example, a dump of `INSERT` statements) read from a file.
+
+    Statements are executed one at a time, as they are read. Each statement must end
+    with a `;` at the end of a line, and lines starting with `--` are ignored.
+    """
+
+    path: Union[str, os.PathLike]
+
+    def statements(self) -> Iterator[str]:
+        lines: List[str] = []
+        with open(self.path) as f:  # noqa: PTH123
+            for line in f:
+                stripped = line.strip()
+                if not lines and (not stripped or stripped.startswith("--")):
+                    continue
+
+                lines.append(line)
+                if stripped.endswith(";"):
+                    yield "".join(lines).strip().rstrip(";")
+                    lines = []
+
+        if "".join(lines).strip():
+            yield "".join(lines).strip()
+
+    def insert(self, connection_executor: "ConnectionExecutor", revision: str):  # noqa: ARG002
+        connection_executor.execute_statements(self.statements())
+
+    def fingerprint(self) -> str:
+        return repr(("SQLFile", _file_hash(self.path)))
+
+
+@dataclass
+class Columns(RowSource):
+    """Column-oriented rows for a single table, inserted without producing per-row dicts.
+
+    `data` may be any of:
+
+    - A mapping of column names to sequences (lists, NumPy arrays, etc) of values.
+    - A NumPy structured (record) array, whose fields name the columns.
+    - A `pyarrow.Table`.
+
+    Neither NumPy nor pyarrow are required by pytest-alembic, inputs are recognized by
+    their interface. Values are inserted in chunks of positional rows, through
+    `ConnectionExecutor.table_insert_columns`.
+    """
+
+    table: str
+    data: Any
+    schema: Optional[str] = None
+
+    def column_names(self) -> List[str]:
+        dtype = getattr(self.data, "dtype", None)
+        if dtype is not None and dtype.names:
+            return list(dtype.names)
+
+        if hasattr(self.data, "column_names"):
+            return list(self.data.column_names)
+
+        return list(self.data.keys())
+
+    def __len__(self) -> int:
+        if hasattr(self.data, "num_rows"):
+            return self.data.num_rows
+
+        dtype = getattr(self.data, "dtype", None)
+        if dtype is not None and dtype.names:
+            return len(self.data)
+
+        return max((len(column) for column in self.data.values()), default=0)
+
+    def chunks(self, chunk_size: int) -> Iterator[List[Tuple]]:
+        """Produce the rows, as lists of at most `chunk_size` tuples of native python values."""
+        names = self.column_names()
+        dtype = getattr(self.data, "dtype", None)
+
+        for start in range(0, len(self), chunk_size):
+            stop = start + chunk_size
+            if dtype is not None and dtype.names:
+                # Structured arrays convert directly to a list of (native) tuples.
+                yield self.data[start:stop].tolist()
+            elif hasattr(self.data, "slice"):
+                columns = self.data.slice(start, chunk_size).columns
+                yield list(zip(*(column.to_pylist() for column in columns)))
+            else:
+                columns = [_to_list(self.data[name][start:stop]) for name in names]
+                yield list(zip(*columns))
+
+    def rows(self) -> Iterator[Dict]:
+        names = self.column_names()
+        for chunk in self.chunks(1000):
+            for row in chunk:
+                yield {"__tablename__": self.table, **dict(zip(names, row))}
+
+    def insert(self, connection_executor: "ConnectionExecutor", revision: str):
+        connection_executor.table_insert_columns(
+            revision=revision,
+            tablename=self.table,
+            columns=self.column_names(),
+            chunks=self.chunks(connection_executor.insert_chunk_size),
+            schema=self.schema,
+        )
+
+    def fingerprint(self) -> str:
+        """Hash the column data itself, rather than its (truncated) `repr`."""
+        digest = hashlib.sha1()  # noqa: S324
+        digest.update(repr(("Columns", self.table, self.schema, self.column_names())).encode())
+
+        dtype = getattr(self.data, "dtype", None)
+        if dtype is not None and dtype.names:
+            digest.update(str(dtype).encode())
+            _update_digest(digest, self.data)
+        elif hasattr(self.data, "columns") and hasattr(self.data, "num_rows"):
+            for column in self.data.columns:
+                digest.update(str(column.type).encode())
+                for chunk in column.chunks:
+                    for buffer in chunk.buffers():
+                        if buffer is not None:
+                            digest.update(buffer)
+        else:
+            for name in self.column_names():
+                values = self.data[name]
+                digest.update(str(getattr(values, "dtype", "")).encode())
+                _update_digest(digest, values)
+
+        return digest.hexdigest()
+
+
+def _update_digest(digest, values):
+    # Arrays of python objects hold pointers, rather than the values themselves.
+    if hasattr(values, "tobytes") and not getattr(values.dtype, "hasobject", True):
+        digest.update(values.tobytes())
+    else:
+        digest.update(repr(_to_list(values)).encode())
+
+
+# The memory addresses included in the default `repr` of most objects.
+_address = re.compile(r" at 0x[0-9a-fA-F]+")
+
+
+def _stable_repr(value: Any) -> Optional[str]:
+    """Produce the `repr` of `value`, unless it includes a memory address.
+
+    Sets are sorted, given their ordering depends on (per-process) string hashing.
+    """
+    text = repr(_canonical(value))
+    if _address.search(text):
+        return None
+    return text
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, (set, frozenset)):
+        return (type(value).__name__, sorted(repr(_canonical(item)) for item in value))
+    if isinstance(value, list):
+        return [_canonical(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_canonical(item) for item in value)
+    if isinstance(value, dict):
+        return {key: _canonical(item) for key, item in value.items()}
+    return value
+
+
+def _callable_fingerprint(fn: Callable) -> Optional[str]:
+    """Identify a callable by its code, defaults and closure, rather than its address."""
+    if isinstance(fn, functools.partial):
+        func = _callable_fingerprint(fn.func)
+        arguments = _stable_repr((fn.args, fn.keywords))
+        if func is None or arguments is None:
+            return None
+        return repr(("partial", func, arguments))
+
+    code = getattr(fn, "__code__", None)
+    if not isinstance(code, types.CodeType):
+        return _stable_repr(fn)
+
+    try:
+        closure = [cell.cell_contents for cell in fn.__closure__ or ()]
+    except ValueError:
+        # An unfilled cell, for example of a function referencing itself.
+        return None
+
+    context = _stable_repr((fn.__defaults__, fn.__kwdefaults__, closure))
+    if context is None:
+        return None
+
+    digest = hashlib.sha1()  # noqa: S324
+    _update_code_digest(digest, code)
+    digest.update(context.encode())
+    return digest.hexdigest()
+
+
+def _update_code_digest(digest, code: types.CodeType):
+    digest.update(code.co_code)
+    digest.update(repr((code.co_names, code.co_varnames, code.co_freevars)).encode())
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _update_code_digest(digest, const)
+        else:
+            digest.update(str(_stable_repr(const)).encode())
+
+
+def _with_table(row: Dict, table: str) -> Dict:
+    if not row.get("__tablename__"):
+        row["__tablename__"] = table
+    return row
+
+
+def _to_list(values) -> List:
+    if hasattr(values, "tolist"):
+        return values.tolist()
+    return list(values)
+
+
+# The content hashes of data files, by path, modification time and size.
+_file_hashes: Dict[Tuple[str, int, int], str] = {}
+
+
+def _file_hash(path: Union[str, os.PathLike]) -> str:
+    stat = os.stat(path)  # noqa: PTH116
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)  # noqa: PTH100
+    file_hash = _file_hashes.get(key)
+    if file_hash is None:
+        digest = hashlib.sha1()  # noqa: S324
+        with open(path, "rb") as f:  # noqa: PTH123
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        file_hash = _file_hashes[key] = digest.hexdigest()
+    return file_hash
+
+
+RevisionDataValue = Union[Dict, List, DataSource, Callable[[], Iterable[Dict]], Iterable[Dict]]
 
 
 @dataclass
 class RevisionSpec:
-    """Describe a set of valid database data at a set of revisions."""
+    """Describe a set of valid database data at a set of revisions.
+
+    Beyond a `dict` (single row) or `list` of rows, the data for a revision may be a
+    `DataSource` (or a list of them), a `pathlib.Path` to a CSV, JSON Lines or SQL file,
+    or a callable/iterable producing rows, all of which are only read once the revision
+    is reached.
+    """
 
-    data: Dict[str, Union[Dict, List[Dict]]]
+    data: Dict[str, RevisionDataValue]
 
     @classmethod
-    def parse(cls, data: Union[None, "RevisionSpec", Dict[str, Union[Dict, List[Dict]]]]):
+    def parse(cls, data: Union["RevisionSpec", Dict[str, RevisionDataValue], None]):
         """Parse a raw dict structure into a `RevisionSpec`."""
         if not data:
             return cls({})
@@ -22,10 +419,33 @@ class RevisionSpec:
 
         return cls(data)
 
-    def get(self, revision: str) -> Union[Dict, List[Dict]]:
+    def get(self, revision: str) -> RevisionDataValue:
         """Get the database data described at a particular revision."""
         return self.data.get(revision, [])
 
+    def sources(self, revision: str) -> List[DataSource]:
+        """Get the database data described at a particular revision, as `DataSource`s.
+
+        Consecutive rows given directly are combined into a single source.
+        """
+        return list(_sources(self.get(revision)))
+
+    def fingerprint(self) -> Optional[str]:
+        """Identify the data described at every revision (see `DataSource.fingerprint`).
+
+        Returns:
+            The fingerprint, or `None` if any source cannot be identified.
+        """
+        digest = hashlib.sha1()  # noqa: S324
+        for revision in sorted(self.data):
+            digest.update(revision.encode())
+            for source in self.sources(revision):
+                fingerprint = source.fingerprint()
+                if fingerprint is None:
+                    return None
+                digest.update(fingerprint.encode())
+        return digest.hexdigest()
+
 
 @dataclass
 class RevisionData:
@@ -42,18 +462,81 @@ class RevisionData:
             at_revision_data=RevisionSpec.parse(config.at_revision_data),
         )
 
-    def get(self, revision_data: Union[Dict, List[Dict]]):
-        if isinstance(revision_data, Dict):
-            yield revision_data
-        else:
-            yield from revision_data
+    def get(self, revision_data: RevisionDataValue):
+        """Yield the rows of `revision_data`.
+
+        Raises:
+            TypeError: If any of its sources doesn't produce rows (such as a `SQLFile`), in which
+                case use `sources_before` or `sources_at`.
+        """
+        for source in _sources(revision_data):
+            if not (source.produces_rows and isinstance(source, RowSource)):
+                message = (
+                    f"{type(source).__name__} does not produce rows, and can only be inserted "
+                    "(see `RevisionData.sources_before` and `RevisionData.sources_at`)."
+                )
+                raise TypeError(message)
+            yield from source.rows()
 
     def get_before(self, revision: str) -> List[Dict]:
-        """Yield the individual data insertions which should occur before the given revision."""
+        """Yield the individual data insertions which should occur before the given revision.
+
+        Raises:
+            TypeError: If any of the revision's sources doesn't produce rows.
+        """
         before_revision_data = self.before_revision_data.get(revision)
         return list(self.get(before_revision_data))
 
     def get_at(self, revision: str) -> Union[Dict, List[Dict]]:
-        """Yield individual data insertions which should occur upon reaching the given revision."""
+        """Yield individual data insertions which should occur upon reaching the given revision.
+
+        Raises:
+            TypeError: If any of the revision's sources doesn't produce rows.
+        """
         at_revision_data = self.at_revision_data.get(revision)
         return list(self.get(at_revision_data))
+
+    def sources_before(self, revision: str) -> List[DataSource]:
+        """Get the (unread) sources of data to insert before the given revision."""
+        return self.before_revision_data.sources(revision)
+
+    def sources_at(self, revision: str) -> List[DataSource]:
+        """Get the (unread) sources of data to insert upon reaching the given revision."""
+        return self.at_revision_data.sources(revision)
+
+    def fingerprint(self) -> Optional[str]:
+        """Identify the data described before and at every revision, if it can be."""
+        before = self.before_revision_data.fingerprint()
+        at = self.at_revision_data.fingerprint()
+        if before is None or at is None:
+            return None
+        return before + at
+
+
+def _sources(data: RevisionDataValue) -> Iterator[DataSource]:
+    if not isinstance(data, (dict, list)):
+        if isinstance(data, DataSource):
+            yield data
+        elif isinstance(data, os.PathLike):
+            yield DataSource.from_path(data)
+        elif data is not None:
+            yield Rows(data)
+        return
+
+    if isinstance(data, dict):
+        yield Rows([data])
+        return
+
+    rows: List[Dict] = []
+    for item in data:
+        if isinstance(item, dict):
+            rows.append(item)
+            continue
+
+        if rows:
+            yield Rows(rows)
+            rows = []
+        yield from _sources(item)
+
+    if rows:
+        yield Rows(rows)
@@ -1,21 +1,33 @@
 from __future__ import annotations
 
 import contextlib
+import dataclasses
 import functools
-from dataclasses import dataclass
-from typing import TYPE_CHECKING
+import time
+from dataclasses import dataclass, field
+from typing import Sequence, TYPE_CHECKING
 
 import alembic.command
 import alembic.migration
 import alembic.util
-from alembic.script.revision import RevisionMap
-
-from pytest_alembic.executor import CommandExecutor, ConnectionExecutor
-from pytest_alembic.history import AlembicHistory
-from pytest_alembic.revision_data import RevisionData
+from sqlalchemy.engine import Engine
+
+from pytest_alembic.checkpoint import CheckpointStore, head_cache
+from pytest_alembic.executor import (
+    _is_async_engine,
+    CommandExecutor,
+    ConnectionExecutor,
+    isolated_transaction,
+    PinnedConnection,
+    script_cache,
+)
+from pytest_alembic.revision_data import DataSource, RevisionData
+from pytest_alembic.scaling import ScalingMeasurement
+from pytest_alembic.synthetic import SyntheticData
 
 if TYPE_CHECKING:
     from pytest_alembic.config import Config
+    from pytest_alembic.history import AlembicHistory
 
 
 @contextlib.contextmanager
@@ -25,15 +37,37 @@ def runner(config: Config, engine=None):
     Yields:
         `MigrationContext` to the caller.
     """
-    command_executor = CommandExecutor.from_config(config)
-    migration_context = MigrationContext.from_config(
-        config,
-        command_executor,
-        ConnectionExecutor(engine),
-    )
+    with contextlib.ExitStack() as stack:
+        command_executor = CommandExecutor.from_config(config)
+        isolated = False
+
+        # Check out a single connection, used for every operation throughout the test.
+        if config.pin_connection and isinstance(engine, Engine):
+            connection = stack.enter_context(engine.connect())
+            if config.rollback_isolation:
+                # Roll back everything the test does, once it's done.
+                stack.enter_context(isolated_transaction(connection))
+                isolated = True
+
+            connection_executor = ConnectionExecutor(connection, pinned=True)
+            command_executor.configure(connection=PinnedConnection(connection))
+        elif config.pin_connection and _is_async_engine(engine):
+            from pytest_alembic.async_connection import PinnedAsyncEngine
+
+            # Or for async engines, a single connection on a runner-owned event loop.
+            pinned_engine = PinnedAsyncEngine(engine)
+            stack.callback(pinned_engine.close)
+            connection_executor = ConnectionExecutor(pinned_engine)
+            command_executor.configure(connection=pinned_engine)
+        else:
+            connection_executor = ConnectionExecutor(engine)
+            command_executor.configure(connection=engine)
 
-    command_executor.configure(connection=engine)
-    yield migration_context
+        context = MigrationContext.from_config(config, command_executor, connection_executor)
+        if isolated:
+            # Snapshots cannot be captured or restored within the isolating transaction.
+            context.checkpoints = None
+        yield context
 
 
 @dataclass
@@ -45,6 +79,15 @@ class MigrationContext:
     connection_executor: ConnectionExecutor
     history: AlembicHistory
     config: Config
+    checkpoints: CheckpointStore | None = None
+
+    # The revision (and checkpoint key) for which the database was last known to be in
+    # the exact state produced by an unadulterated upgrade, if any.
+    checkpoint_revision: str | None = None
+    checkpoint_key: str | None = None
+
+    # The duration (in seconds) of the latest individual upgrade to each revision.
+    upgrade_durations: dict[str, float] = field(default_factory=dict)
 
     @classmethod
     def from_config(
@@ -53,7 +96,7 @@ class MigrationContext:
         command_executor: CommandExecutor,
         connection_executor: ConnectionExecutor,
     ):
-        history = AlembicHistory.parse(command_executor.script.revision_map)
+        history = script_cache.history(command_executor.script)
 
         return cls(
             command_executor=command_executor,
@@ -61,6 +104,7 @@ class MigrationContext:
             connection_executor=connection_executor,
             history=history,
             config=config,
+            checkpoints=CheckpointStore.from_config(config),
         )
 
     @property
@@ -73,32 +117,61 @@ class MigrationContext:
 
     @property
     def current(self) -> str:
-        """Get the list of revision heads."""
-        current = "base"
+        """Get the current revision.
 
-        def get_current(rev, _):
-            nonlocal current
-            if rev:
-                current = rev[0]
+        The revision is tracked in-process as the runner upgrades, downgrades and stamps,
+        such that `env.py` is only executed to read it from the database when it's unknown.
 
-            return []
+        With `verify_current` configured, the tracked revision is additionally checked
+        against a direct read of the version table.
+        """
+        current = self.command_executor.revision
+        if current is None:
+            current = self.read_current()
+            self.command_executor.revision = current
+        elif self.config.verify_current:
+            self.verify_current(current)
 
-        self.command_executor.execute_fn(get_current)
+        return current
 
-        if current:
-            return current
+    def read_current(self) -> str:
+        """Read the current revision from the database, regardless of the tracked revision."""
+        heads = self._read_heads()
+
+        if heads:
+            return heads[0]
         return "base"
 
+    def verify_current(self, current: str):
+        """Assert that the database is at the `current` revision.
+
+        Raises:
+            RuntimeError: If the database's version table disagrees.
+        """
+        heads = self._read_heads()
+
+        if current == "base" and not heads:
+            return
+
+        if current not in heads:
+            heads_str = ", ".join(heads) or "base"
+            message = (
+                f"The tracked revision ({current}) does not match the database's version table "
+                f"({heads_str}). Some revision was applied outside of the `MigrationContext`."
+            )
+            raise RuntimeError(message)
+
     def refresh_history(self) -> AlembicHistory:
         """Refresh the context's version of the alembic history.
 
         Note this is not done automatically to avoid the expensive reevaluation
         step which can make long histories take seconds longer to evaluate for
         each test.
+
+        The script directory is shared by all runners in the session, so the refreshed
+        history is also seen by subsequently created runners.
         """
-        script = self.command_executor.script
-        script.revision_map = RevisionMap(script._load_revisions)  # noqa: SLF001
-        self.history = AlembicHistory.parse(self.command_executor.script.revision_map)
+        self.history = script_cache.refresh(self.command_executor.script)
         return self.history
 
     def generate_revision(
@@ -142,52 +215,164 @@ class MigrationContext:
 
     def raw_command(self, *args, **kwargs):
         """Execute a raw alembic command."""
+        self.forget_checkpoint()
         return self.command_executor.run_command(*args, **kwargs)
 
-    def managed_upgrade(self, dest_revision, *, current=None, return_current=True):
-        """Perform an upgrade one migration at a time, inserting static data at the given points."""
+    def managed_upgrade(
+        self,
+        dest_revision,
+        *,
+        current=None,
+        return_current=True,
+        coalesce: bool | None = None,
+        cached: bool | None = None,
+    ):
+        """Perform an upgrade, inserting static data at the given points.
+
+        Consecutive revisions which require no data to be inserted, are not skipped, and
+        which directly follow one another, are upgraded through a single execution of
+        `env.py`. Supply `coalesce=False` (or configure `coalesce_steps=False`) to upgrade
+        one migration at a time, for example to more precisely locate a failure.
+
+        With `head_cache` configured, an upgrade from "base" to "heads" restores a cached
+        snapshot of the database, where available. Supply `cached=False` to always replay it.
+        """
+        if cached is None:
+            cached = self.config.head_cache
+
         if current is None:
             current = self.current
 
-        for current_revision, next_revision in self.history.revision_window(current, dest_revision):
-            before_upgrade_data = self.revision_data.get_before(next_revision)
-            self.insert_into(data=before_upgrade_data, revision=current_revision, table=None)
+        head_cache_key = None
+        if cached and current == "base" and dest_revision == "heads":
+            head_cache_key = head_cache.key(self)
+            if head_cache_key is not None and head_cache.restore(self, head_cache_key):
+                self.forget_checkpoint()
+                self.command_executor.revision = self.command_executor.resolve_revision("heads")
+                return self.current if return_current else None
 
-            if next_revision in (self.config.skip_revisions or {}):
-                self.set_revision(next_revision)
-            else:
-                self.command_executor.upgrade(next_revision)
+        current = self.restore_checkpoint(current, dest_revision)
 
-            at_upgrade_data = self.revision_data.get_at(next_revision)
-            self.insert_into(data=at_upgrade_data, revision=next_revision, table=None)
+        window = self.history.revision_window(current, dest_revision)
+        with self._migration_transaction() as savepoint:
+            for steps in self._plan_steps(window, coalesce=coalesce):
+                with savepoint():
+                    self._upgrade_steps(steps)
+
+        if head_cache_key is not None:
+            head_cache.save(self, head_cache_key)
 
         if return_current:
             return self.current
         return None
 
-    def managed_downgrade(self, dest_revision, *, current=None, return_current=True):
-        """Perform an downgrade, one migration at a time."""
+    def managed_downgrade(
+        self, dest_revision, *, current=None, return_current=True, coalesce: bool | None = None
+    ):
+        """Perform a downgrade.
+
+        As with `managed_upgrade`, consecutive revisions are downgraded through a single
+        execution of `env.py` unless `coalesce=False`.
+        """
         if current is None:
             current = self.current
 
-        for next_revision, current_revision in reversed(
-            self.history.revision_window(dest_revision, current)
-        ):
-            if current_revision in (self.config.skip_revisions or {}):
-                self.set_revision(next_revision)
-            else:
-                try:
-                    self.command_executor.downgrade(next_revision)
-                except alembic.util.CommandError as e:
-                    if "not a valid downgrade target" in str(e):
-                        pass
-                    else:
-                        raise
+        # Downgrades are not guaranteed to exactly reverse their upgrade, so the resulting
+        # database can no longer be assumed to match any checkpoint.
+        self.forget_checkpoint()
+
+        window = [
+            (current_revision, next_revision)
+            for next_revision, current_revision in reversed(
+                self.history.revision_window(dest_revision, current)
+            )
+        ]
+        with self._migration_transaction() as savepoint:
+            for steps in self._plan_steps(window, coalesce=coalesce, downgrade=True):
+                with savepoint():
+                    self._downgrade_steps(steps)
 
         if return_current:
             return self.current
         return None
 
+    def _upgrade_steps(self, steps: list[tuple[str, str]]):
+        if len(steps) > 1:
+            self.command_executor.upgrade(steps[-1][1])
+            return
+
+        current_revision, next_revision = steps[0]
+        checkpoint_key = self._next_checkpoint_key(current_revision, next_revision)
+        self.forget_checkpoint()
+
+        for before_upgrade_data in self.revision_data.sources_before(next_revision):
+            self.insert_into(data=before_upgrade_data, revision=current_revision, table=None)
+
+        if next_revision in (self.config.skip_revisions or {}):
+            self.set_revision(next_revision)
+        else:
+            start = time.perf_counter()
+            self.command_executor.upgrade(next_revision)
+            self.upgrade_durations[next_revision] = time.perf_counter() - start
+
+        for at_upgrade_data in self.revision_data.sources_at(next_revision):
+            self.insert_into(data=at_upgrade_data, revision=next_revision, table=None)
+
+        if checkpoint_key:
+            self.capture_checkpoint(next_revision, checkpoint_key)
+
+    def _downgrade_steps(self, steps: list[tuple[str, str]]):
+        current_revision, next_revision = steps[-1]
+        if current_revision in (self.config.skip_revisions or {}):
+            self.set_revision(next_revision)
+            return
+
+        try:
+            self.command_executor.downgrade(next_revision)
+        except alembic.util.CommandError as e:
+            if "not a valid downgrade target" in str(e):
+                pass
+            else:
+                raise
+
+    @contextlib.contextmanager
+    def _migration_transaction(self):
+        """Apply the configured `transaction_mode` to a window of migration steps.
+
+        Yields:
+            A context manager to wrap around each step, savepointing it if configured.
+
+        Raises:
+            ValueError: If the mode is unrecognized, or combined with `checkpoints`.
+        """
+        mode = self.config.transaction_mode
+        if mode not in ("revision", "single", "savepoint"):
+            message = f"Unrecognized transaction_mode: {mode!r}."
+            raise ValueError(message)
+
+        if mode == "revision":
+            yield contextlib.nullcontext
+            return
+
+        if self.checkpoints is not None:
+            # Snapshots can only be captured once each revision has been committed.
+            message = f"transaction_mode={mode!r} cannot be combined with `checkpoints`."
+            raise ValueError(message)
+
+        savepoint = self.connection_executor.savepoint
+        if mode == "single":
+            savepoint = contextlib.nullcontext
+
+        connection_executor = self.connection_executor
+        try:
+            with connection_executor.hold_transaction(commit_on_failure=mode == "savepoint"):
+                yield savepoint
+        except BaseException:
+            # The failing step (if not everything) was rolled back, which the tracked
+            # revision may not reflect.
+            self.command_executor.revision = None
+            raise
+
     def migrate_up_before(self, revision):
         """Migrate up to, but not including the given `revision`."""
         preceeding_revision = self.history.previous_revision(revision)
@@ -235,7 +420,9 @@ class MigrationContext:
             return self.migrate_up_one()
         return None
 
-    def insert_into(self, table: str | None, data: dict | list | None = None, revision=None):
+    def insert_into(
+        self, table: str | None, data: dict | list | DataSource | None = None, revision=None
+    ):
         """Insert data into a given table.
 
         Args:
@@ -243,20 +430,136 @@ class MigrationContext:
             data: The data to insert. This is eventually passed through to SQLAlchemy's
                 Table class `values` method, and so should accept either a list of
                 `dict`s representing a list of rows, or a `dict` representing one row.
+                A `DataSource` is read (and inserted) in chunks, in which case `table`
+                is ignored.
             revision: The revision of MetaData to use as the table definition for the insert.
         """
         if data is None:
             return
 
+        self.forget_checkpoint()
+
         if revision is None:
             revision = self.current
 
+        if isinstance(data, DataSource):
+            data.insert(self.connection_executor, revision)
+            return
+
         self.connection_executor.table_insert(
             revision=revision,
             tablename=table,
             data=data,
         )
 
+    def generate_data(self, counts: dict[str, int], *, revision=None, seed: int = 0):
+        """Insert synthetic rows into the given tables, according to their reflected definition.
+
+        Args:
+            counts: The number of rows to generate, by table name.
+            revision: The revision of MetaData to use as the table definitions.
+            seed: The seed of the (deterministic) data generation.
+
+        See :class:`pytest_alembic.synthetic.SyntheticData`.
+        """
+        self.insert_into(table=None, data=SyntheticData(counts, seed=seed), revision=revision)
+
+    def fill_tables(
+        self, rows: int | dict[str, int], *, revision=None, seed: int = 0
+    ) -> dict[str, int]:
+        """Top up tables with synthetic rows, until they contain (at least) the given number of rows.
+
+        Args:
+            rows: The number of rows each table should contain. Either a single count for
+                every table in the default schema (other than the version table), or
+                counts by table name. Tables which do not exist at `revision` are ignored.
+            revision: The revision of MetaData to use as the table definitions.
+            seed: The seed of the (deterministic) data generation.
+
+        Returns:
+            The number of rows in each table, after having been filled.
+        """
+        if revision is None:
+            revision = self.current
+
+        tablenames = None if isinstance(rows, int) else list(rows)
+        exclude = [self.command_executor.version_table or "alembic_version"]
+        existing = self.connection_executor.row_counts(tablenames, exclude=exclude)
+
+        targets = {name: rows if isinstance(rows, int) else rows[name] for name in existing}
+        counts = {
+            name: target - existing[name]
+            for name, target in targets.items()
+            if target > existing[name]
+        }
+        if counts:
+            self.insert_into(table=None, data=SyntheticData(counts, seed=seed), revision=revision)
+
+        return {name: max(targets[name], existing[name]) for name in existing}
+
+    def measure_scaling(
+        self, revision: str, sizes: Sequence[int] = (1_000, 10_000, 100_000), *, seed: int = 0
+    ) -> ScalingMeasurement:
+        """Time the upgrade of `revision` against tables filled to each of the given `sizes`.
+
+        The database is first migrated to the revision preceding `revision` (so must not
+        already be beyond it). Between runs, that pre-revision state is restored from a
+        snapshot where the database supports checkpoints (and isn't within the transaction
+        of `rollback_isolation`), or by downgrading otherwise (in
+        which case, the data of the previous run is retained and topped up).
+
+        The database is left at `revision`, filled to the largest of `sizes`.
+
+        Args:
+            revision: The revision to measure.
+            sizes: The number of rows to fill each table to (see :meth:`fill_tables`).
+            seed: The seed of the (deterministic) data generation.
+        """
+        revision = self.history.validate_revision(revision)
+        previous = self.history.previous_revision(revision)
+        if previous is None or revision in (self.config.skip_revisions or []):
+            message = f"Revision {revision} cannot be measured, it is never upgraded to."
+            raise ValueError(message)
+
+        # Each run must actually execute the revision, rather than restore a checkpoint.
+        self.forget_checkpoint()
+        runner = dataclasses.replace(self, checkpoints=None)
+        runner.migrate_up_to(previous, return_current=False)
+
+        store = self.checkpoints or CheckpointStore()
+        backend = runner.connection_executor.run_task(store.backend)
+        snapshot = None
+        if backend is not None and not runner.connection_executor.isolated:
+            snapshot, _ = runner.connection_executor.run_task(backend.snapshot)
+
+        def run() -> float:
+            runner.migrate_up_to(revision, return_current=False)
+            return runner.upgrade_durations.pop(revision)
+
+        def restore():
+            if snapshot is None:
+                runner.migrate_down_to(previous, return_current=False)
+                return
+
+            runner.connection_executor.run_task(backend.restore, snapshot=snapshot)
+            runner.command_executor.revision = runner.command_executor.resolve_revision(previous)
+
+        measurement = ScalingMeasurement(revision=revision, rows=[], durations=[])
+        try:
+            for index, size in enumerate(sorted(sizes)):
+                if index:
+                    restore()
+
+                counts = runner.fill_tables(size, seed=seed)
+                measurement.rows.append(sum(counts.values()))
+                measurement.durations.append(run())
+        finally:
+            if snapshot is not None:
+                backend.release(snapshot)
+
+        self.forget_checkpoint()
+        return measurement
+
     def table_at_revision(self, name, *, revision=None, schema=None):
         """Return a reference to a `sqlalchemy.Table` at the given revision.
 
@@ -269,8 +572,183 @@ class MigrationContext:
         return self.connection_executor.table(revision=revision, name=name, schema=schema)
 
     def set_revision(self, revision: str):
+        self.forget_checkpoint()
         self.command_executor.stamp(revision)
 
+    def restore_checkpoint(self, current: str, dest_revision: str) -> str:
+        """Restore the latest available checkpoint between `current` and `dest_revision`.
+
+        Checkpoints are only restored while the database is in a state which some
+        checkpoint would have captured, so that no data written by the test itself is
+        discarded. That is, at "base", or having only been upgraded since, provided its
+        contents still match the latest checkpoint captured or restored (they won't, if
+        the test has written to the database other than through the runner).
+
+        Returns:
+            The revision the database is at, after any restoration.
+        """
+        checkpoints = self.checkpoints
+        if checkpoints is None:
+            return current
+
+        if current == "base":
+            # The key of "base" is derived from the database's contents, so always matches.
+            self.checkpoint_key = self.connection_executor.run_task(
+                lambda connection: checkpoints.base_key(connection, self.config)
+            )
+            self.checkpoint_revision = current
+
+        if self.checkpoint_key is None or self.checkpoint_revision != current:
+            return current
+
+        checkpoint_key = self.checkpoint_key
+        if current != "base" and not self.connection_executor.run_task(
+            lambda connection: checkpoints.matches(connection, checkpoint_key)
+        ):
+            self.forget_checkpoint()
+            return current
+
+        latest = None
+        key = self.checkpoint_key
+        for revision in self.history.revision_range(current, dest_revision)[1:]:
+            key = checkpoints.key(key, revision, self._revision_path(revision))
+            if key in checkpoints:
+                latest = (revision, key)
+
+        if latest is None:
+            return current
+
+        revision, key = latest
+        self.connection_executor.run_task(lambda connection: checkpoints.restore(connection, key))
+        self.command_executor.revision = self.command_executor.resolve_revision(revision)
+        self.checkpoint_revision = revision
+        self.checkpoint_key = key
+        return revision
+
+    def capture_checkpoint(self, revision: str, key: str):
+        """Snapshot the database, as the checkpoint for `revision`."""
+        checkpoints = self.checkpoints
+        assert checkpoints is not None
+
+        checkpoint = self.connection_executor.run_task(
+            lambda connection: checkpoints.capture(connection, key, revision)
+        )
+        if checkpoint is not None:
+            self.checkpoint_revision = revision
+            self.checkpoint_key = key
+
+    def checkpoint_keys(
+        self, dest_revision: str, *, checkpoints: CheckpointStore | None = None
+    ) -> list[tuple[str, str]] | None:
+        """Produce the checkpoint key of each revision an upgrade from "base" passes through.
+
+        The keys are derived from the database's current contents, which are therefore
+        assumed to be its state at "base".
+
+        Args:
+            dest_revision: The revision to produce keys up to.
+            checkpoints: The store to derive the keys with, defaulting to the runner's own.
+
+        Returns:
+            The `(revision, key)` of each revision up to `dest_revision`, or `None` if
+            checkpoints are disabled, or unsupported for the database.
+        """
+        if checkpoints is None:
+            checkpoints = self.checkpoints
+        if checkpoints is None:
+            return None
+
+        key = self.connection_executor.run_task(
+            lambda connection: checkpoints.base_key(connection, self.config)
+        )
+        if key is None:
+            return None
+
+        result = []
+        for revision in self.history.revision_range("base", dest_revision)[1:]:
+            key = checkpoints.key(key, revision, self._revision_path(revision))
+            result.append((revision, key))
+        return result
+
+    def forget_checkpoint(self):
+        """Record that the database may no longer match any checkpoint."""
+        self.checkpoint_revision = None
+        self.checkpoint_key = None
+
+    def _plan_steps(
+        self,
+        window: list[tuple[str, str]],
+        *,
+        coalesce: bool | None = None,
+        downgrade: bool = False,
+    ) -> list[list[tuple[str, str]]]:
+        """Group the `(current, next)` steps of a window into runs executable all at once.
+
+        Each group of more than one step can be executed as a single migration to the
+        last step's `next` revision. Checkpoints are captured after (and savepoints taken
+        around) each individual revision, and so also force steps to be executed individually.
+        """
+        if coalesce is None:
+            coalesce = self.config.coalesce_steps
+
+        savepoints = self.config.transaction_mode == "savepoint"
+        if not coalesce or self.checkpoints is not None or savepoints:
+            return [[step] for step in window]
+
+        groups: list[list[tuple[str, str]]] = []
+        last_coalescable = False
+        for step in window:
+            coalescable = self._is_coalescable(*step, downgrade=downgrade)
+            if coalescable and last_coalescable:
+                groups[-1].append(step)
+            else:
+                groups.append([step])
+            last_coalescable = coalescable
+        return groups
+
+    def _is_coalescable(self, current_revision: str, next_revision: str, *, downgrade: bool):
+        skip_revisions = self.config.skip_revisions or []
+        if downgrade:
+            return current_revision not in skip_revisions and self.history.is_parent(
+                next_revision, current_revision
+            )
+
+        if next_revision in skip_revisions:
+            return False
+
+        if self.revision_data.sources_before(next_revision) or self.revision_data.sources_at(
+            next_revision
+        ):
+            return False
+
+        return next_revision == "heads" or self.history.is_parent(current_revision, next_revision)
+
+    def _read_heads(self) -> tuple[str, ...]:
+        command_executor = self.command_executor
+        if command_executor.version_table is None:
+            return command_executor.read_revision()
+
+        return self.connection_executor.current_heads(
+            command_executor.version_table, command_executor.version_table_schema
+        )
+
+    def _next_checkpoint_key(self, current_revision: str, next_revision: str) -> str | None:
+        if self.checkpoints is None or self.checkpoint_key is None:
+            return None
+
+        if self.checkpoint_revision != current_revision:
+            return None
+
+        path = self._revision_path(next_revision)
+        return self.checkpoints.key(self.checkpoint_key, next_revision, path)
+
+    def _revision_path(self, revision: str) -> str | None:
+        if revision in ("base", "heads"):
+            return None
+
+        script = self.command_executor.script.revision_map.get_revision(revision)
+        return getattr(script, "path", None)
+
 
 class RevisionSuccess(Exception):  # noqa: N818
     """Raise when a revision is successfully generated.
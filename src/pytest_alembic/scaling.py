@@ -0,0 +1,60 @@
+import math
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+# Durations are floored at this (in seconds), to be able to take their logarithm.
+MINIMUM_DURATION = 1e-9
+
+
+@dataclass
+class ScalingMeasurement:
+    """The durations of a revision's upgrade, against increasing volumes of data.
+
+    Durations include the fixed overhead of the upgrade (such as executing `env.py`),
+    which flattens the fit where it dominates. The estimated exponent is therefore only
+    meaningful for volumes of data at which the upgrade's own work dominates, and errs
+    towards underestimating it otherwise.
+    """
+
+    revision: str
+    rows: List[int]
+    durations: List[float]
+
+    @property
+    def exponent(self) -> Optional[float]:
+        """Estimate `k`, where the duration of the upgrade grows as `rows ** k`.
+
+        Returns `None` if there were fewer than two distinct (non-zero) numbers of rows.
+        """
+        return fit_exponent(self.rows, self.durations)
+
+    def describe(self) -> str:
+        return "\n".join(
+            f"{rows:>12,} rows: {duration:.4f}s"
+            for rows, duration in zip(self.rows, self.durations)
+        )
+
+
+def fit_exponent(rows: Sequence[int], durations: Sequence[float]) -> Optional[float]:
+    """Fit `durations` to `rows` on a log-log scale, producing the slope of the fit.
+
+    Examples:
+        >>> round(fit_exponent([10, 100, 1000], [0.1, 10, 1000]), 3)
+        2.0
+
+        >>> fit_exponent([10, 10], [1, 2]) is None
+        True
+    """
+    points = [
+        (math.log(count), math.log(max(duration, MINIMUM_DURATION)))
+        for count, duration in zip(rows, durations)
+        if count > 0
+    ]
+    if len({x for x, _ in points}) < 2:
+        return None
+
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    return covariance / variance
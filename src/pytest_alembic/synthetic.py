@@ -0,0 +1,440 @@
+import datetime as dt
+import decimal
+import random
+import string
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from sqlalchemy import Enum, func, select, Table, UniqueConstraint
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import Column, sort_tables
+
+from pytest_alembic.revision_data import DataSource
+
+if TYPE_CHECKING:
+    from pytest_alembic.executor import ConnectionExecutor
+
+_EPOCH = dt.datetime(2000, 1, 1)  # noqa: DTZ001
+_SECONDS = 30 * 365 * 24 * 60 * 60
+
+
+@dataclass
+class SyntheticData(DataSource):
+    """Generate rows of type-appropriate values for the reflected tables at a revision.
+
+    `counts` maps table names (optionally "schema.table") to the number of rows to
+    generate. Tables are filled in foreign key order. Foreign key values are drawn from
+    the rows generated for the referenced table or, if it is not being generated, from
+    its existing rows.
+
+    - Primary key, unique, and unique-constrained columns receive distinct values
+      (integer keys continue on from the largest existing value).
+    - Composite primary keys and unique constraints receive distinct combinations of
+      values: either one of their columns receives distinct values, or (for instance, in
+      an association table) their foreign key columns receive distinct combinations of
+      the referenced rows.
+    - Nullable columns receive `NULL` for roughly `null_fraction` of rows.
+    - Generation is deterministic for a given `seed`.
+
+    Values are generated column-by-column, `chunk_size` rows at a time, and inserted
+    through `ConnectionExecutor.execute_insert_columns`.
+
+    Examples:
+        >>> data = SyntheticData({"user": 1000, "order": 10_000}, seed=1)
+
+        Usable as revision data:
+
+        >>> config = {"before_revision_data": {"aaaaaaaaaaaa": data}}
+    """
+
+    counts: Dict[str, int]
+    seed: int = 0
+    null_fraction: float = 0.1
+    chunk_size: int = 10_000
+
+    def insert(self, connection_executor: "ConnectionExecutor", revision: str):
+        connection_executor.run_task(
+            self.generate, connection_executor=connection_executor, revision=revision
+        )
+
+    def generate(
+        self, connection: Connection, connection_executor: "ConnectionExecutor", revision: str
+    ) -> Dict[str, int]:
+        """Generate and insert the data, over an existing `connection`.
+
+        Returns:
+            The number of rows inserted into each table.
+        """
+        tables = {}
+        for name, count in self.counts.items():
+            schema = None
+            tablename = name
+            if "." in name:
+                schema, tablename = name.split(".", 1)
+
+            table = connection_executor.table(
+                revision, tablename, schema=schema, connection=connection
+            )
+            tables[table] = count
+
+        rng = random.Random(self.seed)  # noqa: S311
+        keys: Dict[Column, List[Any]] = {}
+
+        inserted = {}
+        for table in sort_tables(tables):
+            count = tables[table]
+            generator = _TableGenerator(table, rng, self.null_fraction, keys)
+            generator.prepare(connection, count)
+
+            columns = [column.key for column in generator.columns]
+            connection_executor.execute_insert_columns(
+                connection, table, columns, generator.chunks(count, self.chunk_size)
+            )
+            inserted[table.fullname] = count
+        return inserted
+
+
+@dataclass
+class _TableGenerator:
+    table: Table
+    rng: random.Random
+    null_fraction: float
+
+    # The generated values of every column referenced by a foreign key, by column.
+    keys: Dict[Column, List[Any]]
+
+    columns: List[Column] = field(default_factory=list)
+    unique: Set[Column] = field(default_factory=set)
+    retained: Set[Column] = field(default_factory=set)
+    offsets: Dict[Column, int] = field(default_factory=dict)
+    references: Dict[Column, Tuple[List[Any], bool]] = field(default_factory=dict)
+
+    # The sampled combination indices, the stride, and the referenced values, of each
+    # foreign key column drawn from distinct combinations of referenced rows.
+    combinations: Dict[Column, Tuple[List[int], int, List[Any]]] = field(default_factory=dict)
+
+    def prepare(self, connection: Connection, count: int):
+        self.columns = [
+            column
+            for column in self.table.columns
+            if column.computed is None and not _is_always_identity(column)
+        ]
+        constraints = _unique_constraints(self.table)
+        self.unique = {column for columns in constraints if len(columns) == 1 for column in columns}
+        composite = self._prepare_composite(constraints)
+
+        self._prepare_offsets(connection)
+        self._check_capacity(count)
+        self._prepare_references(connection, count)
+        self._prepare_combinations(composite, count)
+
+        # Values referenced by other tables must be retained until those are generated.
+        referenced = {foreign_key.column for foreign_key in _referencing(self.table)}
+        self.retained = {column for column in self.columns if column in referenced}
+
+    def _prepare_composite(self, constraints: List[Set[Column]]) -> List[Set[Column]]:
+        """Make each composite constraint unique through one of its generated columns.
+
+        Returns:
+            The constraints which can only be made unique through distinct combinations
+            of their foreign key columns.
+        """
+        referencing = {element.parent for element in self.table.foreign_keys}
+
+        composite: List[Set[Column]] = []
+        for columns in constraints:
+            if len(columns) == 1 or columns & self.unique:
+                continue
+            if any(_is_always_identity(column) for column in columns):
+                continue
+            if any(other <= columns for other in composite):
+                continue
+
+            distinct = [
+                column
+                for column in self.columns
+                if column in columns and column not in referencing and _is_distinct(column)
+            ]
+            if distinct:
+                self.unique.add(distinct[0])
+            else:
+                composite.append(columns)
+        return composite
+
+    def _prepare_offsets(self, connection: Connection):
+        """Continue unique values on from those of any existing rows."""
+        existing: Optional[int] = None
+        for column in self.columns:
+            if column not in self.unique:
+                continue
+
+            if _python_type(column) is int:
+                largest = connection.execute(select(func.max(column))).scalar()
+                self.offsets[column] = (largest or 0) + 1
+            else:
+                if existing is None:
+                    query = select(func.count()).select_from(self.table)
+                    existing = connection.execute(query).scalar() or 0
+                self.offsets[column] = existing
+
+    def _check_capacity(self, count: int):
+        """Ensure unique string columns are long enough to hold distinct values."""
+        for column in self.columns:
+            if column not in self.unique or column.foreign_keys:
+                continue
+            if _python_type(column) is not str:
+                continue
+            if isinstance(column.type, Enum) and column.type.enums:
+                continue
+
+            length = _string_length(column)
+            capacity = len(_DIGITS) ** length
+            if self.offsets.get(column, 0) + count > capacity:
+                message = (
+                    f"Cannot generate {count} unique values for {column}, whose length of "
+                    f"{length} holds only {capacity} distinct values."
+                )
+                raise ValueError(message)
+
+    def _prepare_references(self, connection: Connection, count: int):
+        for constraint in self.table.foreign_key_constraints:
+            for element in constraint.elements:
+                referenced = element.column
+                values = self.keys.get(referenced)
+                if values is None:
+                    values = list(connection.execute(select(referenced)).scalars())
+
+                unique = element.parent in self.unique
+                if unique and len(values) < count:
+                    message = (
+                        f"Cannot generate {count} unique values for {element.parent}, "
+                        f"which references only {len(values)} rows of {referenced.table}."
+                    )
+                    raise ValueError(message)
+
+                self.references[element.parent] = (values, unique)
+
+    def _prepare_combinations(self, composite: List[Set[Column]], count: int):
+        """Draw distinct combinations of referenced rows, for each remaining constraint."""
+        for columns in composite:
+            names = ", ".join(sorted(column.name for column in columns))
+            referencing = [column for column in self.columns if column in self.references]
+            referencing = [column for column in referencing if column in columns]
+            if not referencing or any(column in self.combinations for column in referencing):
+                message = (
+                    f"Cannot generate unique values for ({names}) of {self.table.fullname}, "
+                    "which has no column able to receive distinct values."
+                )
+                raise ValueError(message)
+
+            capacity = 1
+            for column in referencing:
+                capacity *= len(self.references[column][0])
+            if count > capacity:
+                message = (
+                    f"Cannot generate {count} unique values for ({names}) of "
+                    f"{self.table.fullname}, which references only {capacity} combinations "
+                    "of rows."
+                )
+                raise ValueError(message)
+
+            sample = self.rng.sample(range(capacity), count)
+            stride = 1
+            for column in referencing:
+                values = self.references[column][0]
+                self.combinations[column] = (sample, stride, values)
+                stride *= len(values)
+
+    def chunks(self, count: int, chunk_size: int):
+        for start in range(0, count, chunk_size):
+            size = min(chunk_size, count - start)
+            values = [self.values(column, start, size) for column in self.columns]
+
+            for column, column_values in zip(self.columns, values):
+                if column in self.retained:
+                    self.keys.setdefault(column, []).extend(column_values)
+
+            yield list(zip(*values))
+
+    def values(self, column: Column, start: int, size: int) -> List[Any]:
+        rng = self.rng
+
+        combination = self.combinations.get(column)
+        if combination is not None:
+            sample, stride, candidates = combination
+            return [
+                candidates[index // stride % len(candidates)]
+                for index in sample[start : start + size]
+            ]
+
+        reference = self.references.get(column)
+        if reference is not None:
+            candidates, unique = reference
+            if unique:
+                return candidates[start : start + size]
+            if not candidates:
+                return self._nulls(column, size)
+            return [rng.choice(candidates) for _ in range(size)]
+
+        unique = column in self.unique
+        generate = _value_generator(column)
+        if generate is None:
+            return self._nulls(column, size)
+
+        offset = self.offsets.get(column, 0)
+        values = generate(rng, range(offset + start, offset + start + size), unique)
+
+        if column.nullable and not unique and self.null_fraction:
+            values = [None if rng.random() < self.null_fraction else v for v in values]
+        return values
+
+    @staticmethod
+    def _nulls(column: Column, size: int) -> List[Any]:
+        if not column.nullable:
+            message = f"Cannot generate values for non-nullable column {column}."
+            raise ValueError(message)
+        return [None] * size
+
+
+Generator = Callable[[random.Random, range, bool], List[Any]]
+
+
+def _value_generator(column: Column) -> Optional[Generator]:
+    """Produce a function generating values appropriate to the type of `column`."""
+    column_type = column.type
+    if isinstance(column_type, Enum) and column_type.enums:
+        choices = list(column_type.enums)
+        return lambda rng, indices, _: [rng.choice(choices) for _ in indices]
+
+    python_type = _python_type(column)
+    if python_type is str:
+        length = _string_length(column)
+        return lambda rng, indices, unique: _strings(rng, indices, unique, length)
+
+    return _GENERATORS.get(python_type)  # type: ignore[arg-type]
+
+
+def _python_type(column: Column) -> Optional[type]:
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return None
+
+
+def _string_length(column: Column) -> int:
+    return getattr(column.type, "length", None) or 16
+
+
+def _is_distinct(column: Column) -> bool:
+    """Whether distinct values can be generated for `column`."""
+    if isinstance(column.type, Enum) and column.type.enums:
+        return False
+    return _python_type(column) in _DISTINCT
+
+
+# Lowercase only, so distinct values remain distinct under case-insensitive collations.
+_DIGITS = string.digits + string.ascii_lowercase
+
+
+def _strings(rng: random.Random, indices: range, unique: bool, length: int) -> List[str]:  # noqa: FBT001
+    if unique:
+        return [_encode(i) for i in indices]
+
+    alphabet = string.ascii_letters
+    size = min(length, 12)
+    return ["".join(rng.choices(alphabet, k=size)) for _ in indices]
+
+
+def _encode(index: int) -> str:
+    """Encode `index` in as few of `_DIGITS` as possible."""
+    digits = []
+    while True:
+        index, digit = divmod(index, len(_DIGITS))
+        digits.append(_DIGITS[digit])
+        if not index:
+            return "".join(reversed(digits))
+
+
+def _integers(rng: random.Random, indices: range, unique: bool) -> List[int]:  # noqa: FBT001
+    if unique:
+        return list(indices)
+    return [rng.randrange(2**15) for _ in indices]
+
+
+def _datetimes(rng: random.Random, indices: range, unique: bool) -> List[dt.datetime]:  # noqa: FBT001
+    if unique:
+        return [_EPOCH + dt.timedelta(seconds=i) for i in indices]
+    return [_EPOCH + dt.timedelta(seconds=rng.randrange(_SECONDS)) for _ in indices]
+
+
+_GENERATORS: Dict[type, Generator] = {
+    int: _integers,
+    float: lambda rng, indices, unique: [
+        float(i) if unique else round(rng.uniform(0, 1000), 2) for i in indices
+    ],
+    decimal.Decimal: lambda rng, indices, unique: [
+        decimal.Decimal(i if unique else rng.randrange(100000)) / 100 for i in indices
+    ],
+    bool: lambda rng, indices, _: [rng.random() < 0.5 for _ in indices],
+    dt.datetime: _datetimes,
+    dt.date: lambda rng, indices, unique: [d.date() for d in _datetimes(rng, indices, unique)],
+    dt.time: lambda rng, indices, _: [
+        dt.time(rng.randrange(24), rng.randrange(60), rng.randrange(60)) for _ in indices
+    ],
+    dt.timedelta: lambda rng, indices, unique: [
+        dt.timedelta(seconds=i if unique else rng.randrange(86400)) for i in indices
+    ],
+    bytes: lambda rng, indices, unique: [
+        i.to_bytes(8, "big") if unique else bytes(rng.getrandbits(8) for _ in range(8))
+        for i in indices
+    ],
+    uuid.UUID: lambda rng, indices, _: [uuid.UUID(int=rng.getrandbits(128)) for _ in indices],
+    dict: lambda rng, indices, _: [{"value": rng.randrange(1000)} for _ in indices],
+}
+
+
+# The types of column for which distinct values are generated, when asked to.
+_DISTINCT = {
+    int,
+    float,
+    decimal.Decimal,
+    dt.datetime,
+    dt.date,
+    dt.timedelta,
+    bytes,
+    str,
+    uuid.UUID,
+}
+
+
+def _unique_constraints(table: Table) -> List[Set[Column]]:
+    """Produce the sets of columns whose combined values must be unique, smallest first."""
+    constraints = [set(table.primary_key.columns)]
+    for constraint in table.constraints:
+        if isinstance(constraint, UniqueConstraint):
+            constraints.append(set(constraint.columns))
+    for index in table.indexes:
+        if index.unique:
+            constraints.append(set(index.columns))
+    constraints.extend({column} for column in table.columns if column.unique)
+
+    unique: List[Set[Column]] = []
+    for columns in sorted(constraints, key=len):
+        if columns and columns not in unique:
+            unique.append(columns)
+    return unique
+
+
+def _is_always_identity(column: Column) -> bool:
+    identity = getattr(column, "identity", None)
+    return bool(identity is not None and identity.always)
+
+
+def _referencing(table: Table):
+    """Produce the foreign keys (within the same metadata) which reference `table`."""
+    metadata = table.metadata
+    for other in metadata.tables.values():
+        for foreign_key in other.foreign_keys:
+            if foreign_key.references(table):
+                yield foreign_key
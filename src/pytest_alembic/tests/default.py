@@ -6,6 +6,7 @@ from alembic.autogenerate.api import AutogenContext
 from alembic.autogenerate.render import _render_cmd_body
 
 from pytest_alembic.plugin.error import AlembicTestFailure
+from pytest_alembic.plugin.plan import migration_plan
 
 log = logging.getLogger(__name__)
 
@@ -40,18 +41,23 @@ def test_single_head_revision(alembic_runner):
 
 @pytest.mark.alembic
 def test_upgrade(alembic_runner):
-    """Assert that the revision history can be run through from base to head."""
-    try:
-        alembic_runner.migrate_up_to("heads", return_current=False)
-    except RuntimeError as e:
+    """Assert that the revision history can be run through from base to head.
+
+    The upgrade is shared with the other built-in tests, through the session's
+    :class:`pytest_alembic.plugin.plan.MigrationPlan`.
+    """
+    outcome = migration_plan.upgrade(alembic_runner)
+    if isinstance(outcome.error, RuntimeError):
         message = (
             "Failed to upgrade to the head revision. This means the historical chain from an "
             "empty database, to the current revision is not possible."
         )
-        raise AlembicTestFailure(
-            message,
-            context=[("Alembic Error", str(e))],
-        )
+        context = [("Alembic Error", str(outcome.error))]
+        if outcome.failing_revision:
+            context.insert(0, ("Failing Revision", outcome.failing_revision))
+        raise AlembicTestFailure(message, context=context)
+
+    outcome.raise_for_error()
 
 
 @pytest.mark.alembic
@@ -108,17 +114,7 @@ def test_up_down_consistency(alembic_runner):
 
     Individually upgrade to ensure that it's clear which revision caused the failure.
     """
-    last = None
-    for revision in alembic_runner.history.revisions:
-        try:
-            alembic_runner.migrate_up_to(revision, current=last, return_current=False)
-        except Exception as e:
-            message = "Failed to upgrade through each revision individually."
-            raise AlembicTestFailure(
-                message,
-                context=[("Failing Revision", revision), ("Alembic Error", str(e))],
-            )
-        last = revision
+    _upgrade_individually(alembic_runner)
 
     # Skip the `heads` revision. Caused by new alembic warning in 1.6.x.
     down_revisions = list(reversed(alembic_runner.history.revisions[:-1]))
@@ -164,3 +160,89 @@ def test_up_down_consistency(alembic_runner):
                 context=[("Failing Revision", revision), ("Alembic Error", str(e))],
             )
         last = revision
+
+
+def up_down_consistency_at(alembic_runner, revision):
+    """Assert that `revision` alone upgrades, downgrades, and upgrades again.
+
+    The per-revision equivalent of :func:`test_up_down_consistency`, collected for each
+    revision with ``--alembic-per-revision``. The database is first brought to the preceding
+    revision, through the session's checkpoints where possible, so that each revision can
+    be tested independently.
+    """
+    history = alembic_runner.history
+    previous = history.previous_revision(revision)
+
+    outcome = migration_plan.upgrade_to(alembic_runner, previous)
+    if outcome.error is not None:
+        pytest.skip(f"The preceding revision, {previous}, could not be upgraded to.")
+
+    # The revision must actually be executed, rather than restored from a checkpoint.
+    alembic_runner.forget_checkpoint()
+    try:
+        alembic_runner.migrate_up_to(revision, current=previous, return_current=False)
+    except Exception as e:
+        message = "Failed to upgrade through each revision individually."
+        raise AlembicTestFailure(
+            message,
+            context=[("Failing Revision", revision), ("Alembic Error", str(e))],
+        )
+
+    minimum_downgrade_revision = alembic_runner.config.minimum_downgrade_revision
+    if minimum_downgrade_revision is not None:
+        minimum_index = history.revision_indices[
+            history.validate_revision(minimum_downgrade_revision)
+        ]
+        if history.revision_indices[previous] <= minimum_index:
+            return
+
+    try:
+        alembic_runner.migrate_down_to(previous, current=revision, return_current=False)
+    except NotImplementedError:
+        warnings.warn(NOT_IMPLEMENTED_WARNING.format(revision=previous), stacklevel=1)
+        return
+    except Exception as e:
+        message = "Failed to downgrade through each revision individually."
+        raise AlembicTestFailure(
+            message,
+            context=[("Failing Revision", previous), ("Alembic Error", str(e))],
+        )
+
+    try:
+        alembic_runner.migrate_up_to(revision, current=previous, return_current=False)
+    except Exception as e:
+        message = (
+            "Failed to upgrade through each revision individually after performing a "
+            "roundtrip upgrade -> downgrade -> upgrade cycle."
+        )
+        raise AlembicTestFailure(
+            message,
+            context=[("Failing Revision", revision), ("Alembic Error", str(e))],
+        )
+
+
+def _upgrade_individually(alembic_runner):
+    if migration_plan.shares(alembic_runner):
+        # The shared upgrade already proceeds individually, checkpointing each revision.
+        outcome = migration_plan.upgrade(alembic_runner)
+        if outcome.error is not None:
+            message = "Failed to upgrade through each revision individually."
+            raise AlembicTestFailure(
+                message,
+                context=[
+                    ("Failing Revision", outcome.failing_revision or "unknown"),
+                    ("Alembic Error", str(outcome.error)),
+                ],
+            )
+    else:
+        last = None
+        for revision in alembic_runner.history.revisions:
+            try:
+                alembic_runner.migrate_up_to(revision, current=last, return_current=False)
+            except Exception as e:
+                message = "Failed to upgrade through each revision individually."
+                raise AlembicTestFailure(
+                    message,
+                    context=[("Failing Revision", revision), ("Alembic Error", str(e))],
+                )
+            last = revision
@@ -4,8 +4,14 @@ from pytest_alembic.tests.experimental.all_models_register_on_metadata import (
 from pytest_alembic.tests.experimental.downgrade_leaves_no_trace import (
     test_downgrade_leaves_no_trace,
 )
+from pytest_alembic.tests.experimental.migration_scaling import test_migration_scaling
+from pytest_alembic.tests.experimental.migration_under_volume import (
+    test_migration_under_volume,
+)
 
 __all__ = [
     "test_all_models_register_on_metadata",
     "test_downgrade_leaves_no_trace",
+    "test_migration_scaling",
+    "test_migration_under_volume",
 ]
@@ -7,7 +7,7 @@ import subprocess  # nosec
 from typing import List, Optional, Set, Tuple
 
 from sqlalchemy import MetaData
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.engine.url import URL
 
 from pytest_alembic.plugin.error import AlembicTestFailure
@@ -89,8 +89,8 @@ def test_all_models_register_on_metadata(
             async_ = True
         url = connection.url
     else:
-        assert isinstance(connection, Engine), connection
-        url = connection.url
+        assert isinstance(connection, (Engine, Connection)), connection
+        url = connection.engine.url
 
     modules, bare_tables = get_bare_import_tableset(
         url_to_string(url),
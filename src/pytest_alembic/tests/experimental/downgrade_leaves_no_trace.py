@@ -3,12 +3,14 @@ import dataclasses
 import warnings
 
 import alembic.migration
+import pytest
 from alembic.autogenerate import produce_migrations, render_python_code
 from sqlalchemy import MetaData
 from sqlalchemy.engine import Connection
 
 from pytest_alembic.config import duplicate_alembic_config
 from pytest_alembic.plugin.error import AlembicTestFailure
+from pytest_alembic.plugin.plan import migration_plan
 from pytest_alembic.runner import MigrationContext
 from pytest_alembic.tests.default import NOT_IMPLEMENTED_WARNING
 
@@ -47,25 +49,38 @@ def test_downgrade_leaves_no_trace(alembic_runner: MigrationContext):
     )
 
 
-def _test_downgrade_leaves_no_trace(connection: Connection, alembic_runner: MigrationContext):
-    wrapped_connection = WrappingConnection(connection)
+def downgrade_leaves_no_trace_at(alembic_runner: MigrationContext, revision: str):
+    """Assert equal states of the MetaData before and after the `revision` upgrade/downgrade cycle.
 
-    # Swap the original engine for a connection to enable us to rollback the transaction
-    # midway through.
-    alembic_config = duplicate_alembic_config(alembic_runner.command_executor.alembic_config)
-    alembic_config.attributes["connection"] = wrapped_connection
+    The per-revision equivalent of :func:`test_downgrade_leaves_no_trace`, collected for each
+    revision with ``--alembic-per-revision``. The database is first brought to the preceding
+    revision, through the session's checkpoints where possible, so that each revision can
+    be tested independently.
+    """
+    history = alembic_runner.history
+    minimum_downgrade_revision = alembic_runner.config.minimum_downgrade_revision
+    if minimum_downgrade_revision is not None:
+        minimum_index = history.revision_indices[
+            history.validate_revision(minimum_downgrade_revision)
+        ]
+        if history.revision_indices[revision] < minimum_index:
+            pytest.skip(f"{revision} is below the minimum_downgrade_revision.")
+
+    previous = history.previous_revision(revision)
+    assert previous is not None
+
+    outcome = migration_plan.upgrade_to(alembic_runner, previous)
+    if outcome.error is not None:
+        pytest.skip(f"The preceding revision, {previous}, could not be upgraded to.")
+
+    def check(connection: Connection):
+        check_revision_cycle(wrap_runner(alembic_runner, connection), connection, previous)
+
+    alembic_runner.connection_executor.run_task(check)
 
-    alembic_runner = dataclasses.replace(
-        alembic_runner,
-        connection_executor=dataclasses.replace(
-            alembic_runner.connection_executor,
-            connection=connection,
-        ),
-        command_executor=dataclasses.replace(
-            alembic_runner.command_executor,
-            alembic_config=alembic_config,
-        ),
-    )
+
+def _test_downgrade_leaves_no_trace(connection: Connection, alembic_runner: MigrationContext):
+    alembic_runner = wrap_runner(alembic_runner, connection)
 
     history = alembic_runner.history
     revisions = history.revisions[:-1]
@@ -87,9 +102,38 @@ def _test_downgrade_leaves_no_trace(connection: Connection, alembic_runner: Migr
         alembic_runner.migrate_up_to(revision)
 
 
+def wrap_runner(alembic_runner: MigrationContext, connection: Connection) -> MigrationContext:
+    """Produce a runner executing directly against `connection`, such that it can be rolled back."""
+    wrapped_connection = WrappingConnection(connection)
+
+    # Swap the original engine for a connection to enable us to rollback the transaction
+    # midway through.
+    alembic_config = duplicate_alembic_config(alembic_runner.command_executor.alembic_config)
+    alembic_config.attributes["connection"] = wrapped_connection
+
+    # Checkpoints cannot be taken or restored midway through the nested transactions below.
+    return dataclasses.replace(
+        alembic_runner,
+        checkpoints=None,
+        connection_executor=dataclasses.replace(
+            alembic_runner.connection_executor,
+            connection=connection,
+            pinned=False,
+        ),
+        command_executor=dataclasses.replace(
+            alembic_runner.command_executor,
+            alembic_config=alembic_config,
+        ),
+    )
+
+
 def check_revision_cycle(alembic_runner, connection, original_revision):
     migration_context = alembic.migration.MigrationContext.configure(connection)
 
+    # Rolling back the transactions below reverts the database to this revision, without
+    # the runner's knowledge.
+    current = alembic_runner.current
+
     # We first need to produce a `MetaData` which represents the state of the database
     # we're trying to get to.
     with connection.begin_nested() as trans:
@@ -101,6 +145,7 @@ def check_revision_cycle(alembic_runner, connection, original_revision):
 
         # Having procured the target `MetaData`, we need the database back in its original state.
         trans.rollback()
+        alembic_runner.command_executor.revision = current
 
     with connection.begin_nested() as trans:
         # Produce a canonically autogenerated upgrade relative to the original.
@@ -150,6 +195,7 @@ def check_revision_cycle(alembic_runner, connection, original_revision):
         finally:
             # **This** rollback is to ensure we leave the database back in it's original state for the next revision.
             trans.rollback()
+            alembic_runner.command_executor.revision = current
 
 
 @dataclasses.dataclass
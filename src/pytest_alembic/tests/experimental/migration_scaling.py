@@ -0,0 +1,60 @@
+from pytest_alembic.plugin.error import AlembicTestFailure
+from pytest_alembic.runner import MigrationContext
+
+
+def test_migration_scaling(alembic_runner: MigrationContext):
+    """Assert that no revision's upgrade grows faster than allowed, with the volume of data.
+
+    Each revision (or those configured by `scaling_revisions`) is upgraded against tables
+    filled to each of the `scaling_sizes`, restoring the pre-revision state between runs
+    (see :meth:`pytest_alembic.runner.MigrationContext.measure_scaling`).
+
+    The durations are fit to `rows ** k` to estimate the complexity exponent `k` of the
+    upgrade, and every revision whose exponent exceeds `scaling_exponent` is reported.
+
+    **note** revisions which run before any tables exist (and so have no rows to measure
+    against) cannot be estimated, and always pass.
+    """
+    config = alembic_runner.config
+    history = alembic_runner.history
+
+    revisions = history.revisions[1:-1]
+    if config.scaling_revisions is not None:
+        revisions = sorted(
+            (history.validate_revision(revision) for revision in config.scaling_revisions),
+            key=history.revision_indices.__getitem__,
+        )
+
+    flagged = []
+    for index, revision in enumerate(revisions):
+        if revision in (config.skip_revisions or []):
+            continue
+
+        try:
+            measurement = alembic_runner.measure_scaling(revision, config.scaling_sizes, seed=index)
+        except Exception as e:
+            message = f"Failed to measure the scaling of revision {revision}."
+            raise AlembicTestFailure(
+                message,
+                context=[("Failing Revision", revision), ("Error", str(e))],
+            )
+
+        exponent = measurement.exponent
+        if exponent is not None and exponent > config.scaling_exponent:
+            flagged.append((measurement, exponent))
+
+    if flagged:
+        message = (
+            f"The upgrades of {len(flagged)} revision(s) grow faster than "
+            f"rows ** {config.scaling_exponent} with the volume of data."
+        )
+        raise AlembicTestFailure(
+            message,
+            context=[
+                (
+                    f"Revision {measurement.revision} (exponent {exponent:.2f})",
+                    measurement.describe(),
+                )
+                for measurement, exponent in flagged
+            ],
+        )
@@ -0,0 +1,79 @@
+import dataclasses
+from typing import Optional
+
+from pytest_alembic.plugin.error import AlembicTestFailure
+from pytest_alembic.runner import MigrationContext
+
+
+def test_migration_under_volume(alembic_runner: MigrationContext):
+    """Assert that each revision upgrades within its time budget, against a populated database.
+
+    Before each revision, every table which exists is filled with synthetic rows (see
+    :class:`pytest_alembic.synthetic.SyntheticData`) up to the configured `data_volume`,
+    after which the revision's upgrade is timed. Configured revision data is inserted
+    as usual.
+
+    A revision fails if its upgrade takes longer than `upgrade_budget` seconds, or longer
+    than `upgrade_row_budget` seconds per row in the database before the upgrade.
+
+    **note** the timing includes the execution of `env.py`, so budgets should allow for
+    that fixed overhead.
+    """
+    # Each revision must actually be executed to be timed, rather than restored.
+    alembic_runner = dataclasses.replace(alembic_runner, checkpoints=None)
+    config = alembic_runner.config
+
+    for index, revision in enumerate(alembic_runner.history.revisions[1:-1]):
+        try:
+            counts = alembic_runner.fill_tables(config.data_volume, seed=index)
+        except ValueError as e:
+            message = f"Failed to fill the tables before revision {revision}."
+            raise AlembicTestFailure(
+                message,
+                context=[("Failing Revision", revision), ("Error", str(e))],
+            )
+
+        try:
+            alembic_runner.migrate_up_to(revision, return_current=False)
+        except Exception as e:
+            message = f"Failed to upgrade through revision {revision}, with populated tables."
+            raise AlembicTestFailure(
+                message,
+                context=[("Failing Revision", revision), ("Alembic Error", str(e))],
+            )
+
+        duration = alembic_runner.upgrade_durations.pop(revision, None)
+        if duration is None:
+            # Skipped revisions are never executed.
+            continue
+
+        rows = sum(counts.values())
+        _check_budget(revision, duration, rows, _revision_budget(config.upgrade_budget, revision))
+        if rows and config.upgrade_row_budget is not None:
+            _check_budget(revision, duration, rows, config.upgrade_row_budget * rows)
+
+
+def _revision_budget(budget, revision: str) -> Optional[float]:
+    if isinstance(budget, dict):
+        return budget.get(revision)
+    return budget
+
+
+def _check_budget(revision: str, duration: float, rows: int, budget: Optional[float]):
+    if budget is None or duration <= budget:
+        return
+
+    rate = f"{rows / duration:,.0f} rows/sec" if duration else "n/a"
+    message = (
+        f"Revision {revision} took {duration:.3f}s to upgrade {rows:,} rows ({rate}), "
+        f"exceeding its budget of {budget:.3f}s."
+    )
+    raise AlembicTestFailure(
+        message,
+        context=[
+            ("Failing Revision", revision),
+            ("Duration", f"{duration:.3f}s"),
+            ("Rows", f"{rows:,}"),
+            ("Throughput", rate),
+        ],
+    )
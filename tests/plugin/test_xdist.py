@@ -0,0 +1,75 @@
+from types import SimpleNamespace
+
+from pytest_alembic.plugin.xdist import (
+    duration_key,
+    longest_first,
+    revision_groups,
+    worker_count,
+    worker_id,
+)
+
+
+def test_worker_without_xdist():
+    config = SimpleNamespace()
+    assert worker_id(config) == "master"
+    assert worker_count(config) == 1
+
+
+def test_worker_with_xdist():
+    config = SimpleNamespace(workerinput={"workerid": "gw1", "workercount": 4})
+    assert worker_id(config) == "gw1"
+    assert worker_count(config) == 4
+
+
+def test_revision_groups_contiguous():
+    groups = revision_groups(["a", "b", "c", "d", "e"], 2)
+    assert groups == {
+        "a": "pytest-alembic-0",
+        "b": "pytest-alembic-0",
+        "c": "pytest-alembic-0",
+        "d": "pytest-alembic-1",
+        "e": "pytest-alembic-1",
+    }
+
+
+def test_revision_groups_more_workers_than_revisions():
+    groups = revision_groups(["a", "b"], 8)
+    assert groups == {"a": "pytest-alembic-0", "b": "pytest-alembic-1"}
+
+
+def test_longest_first():
+    items = [SimpleNamespace(nodeid=nodeid) for nodeid in ("a", "b", "c", "d")]
+    durations = {"a": 1.0, "b": 3.0, "d": 2.0}
+
+    result = longest_first(items, durations)
+    assert [item.nodeid for item in result] == ["c", "b", "d", "a"]
+
+
+def test_duration_key_strips_group():
+    nodeid = "conftest.py::pytest-alembic::test_upgrade@pytest-alembic-0"
+    assert duration_key(nodeid) == "conftest.py::pytest-alembic::test_upgrade"
+
+
+def test_worker_engine_hook(testdir):
+    testdir.copy_example("test_worker_engine")
+    testdir.makeconftest(
+        """
+        import pytest
+        from sqlalchemy import create_engine
+
+        def pytest_alembic_worker_engine(worker_id, path):
+            return create_engine(f"sqlite:///{path.with_name('custom-' + worker_id + '.sqlite')}")
+
+        @pytest.fixture
+        def alembic_engine(alembic_worker_engine):
+            return alembic_worker_engine
+        """
+    )
+    testdir.makepyfile(
+        test_worker_engine="""
+        def test_worker_database(alembic_engine):
+            assert alembic_engine.url.database.endswith("custom-master.sqlite")
+        """
+    )
+    result = testdir.runpytest("-vv", "test_worker_engine.py")
+    result.assert_outcomes(passed=1)
@@ -0,0 +1,79 @@
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy import text
+
+pytest.importorskip("sqlalchemy.ext.asyncio")
+
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from pytest_alembic.async_connection import EventLoopThread, PinnedAsyncEngine
+from pytest_alembic.executor import ConnectionExecutor
+
+
+async def current_thread():
+    return threading.current_thread()
+
+
+def test_event_loop_thread():
+    event_loop = EventLoopThread.start()
+    try:
+        assert event_loop.run(current_thread()) is event_loop.thread
+
+        # Dispatched from within a different (running) loop.
+        assert asyncio.run(event_loop.run_async(current_thread())) is event_loop.thread
+
+        async def block():
+            event_loop.run(current_thread())
+
+        with pytest.raises(RuntimeError, match="from within the loop itself"):
+            event_loop.run(block())
+    finally:
+        event_loop.close()
+
+    assert not event_loop.thread.is_alive()
+
+
+def test_pinned_tasks_run_on_pinned_loop(monkeypatch):
+    pytest.importorskip("aiosqlite")
+
+    engine = create_async_engine("sqlite+aiosqlite:///")
+    pinned_engine = PinnedAsyncEngine(engine)
+
+    def run(coroutine):
+        coroutine.close()
+        message = "asyncio.run should not be called for a pinned engine."
+        raise AssertionError(message)
+
+    monkeypatch.setattr(asyncio, "run", run)
+    try:
+        executor = ConnectionExecutor(pinned_engine)
+        executor.run_task(lambda connection: connection.execute(text("CREATE TABLE foo (id INT)")))
+        executor.run_task(lambda connection: connection.execute(text("INSERT INTO foo VALUES (1)")))
+
+        def threads(connection):
+            return threading.current_thread(), connection.execute(text("SELECT id FROM foo")).all()
+
+        thread, rows = executor.run_task(threads)
+        assert thread is pinned_engine.event_loop.thread
+        assert rows == [(1,)]
+
+        # Each task was committed by `pinned_transaction`.
+        assert pinned_engine.run_sync(lambda connection: connection.in_transaction()) is False
+    finally:
+        monkeypatch.undo()
+        pinned_engine.close()
+
+
+def test_pinned_engine_is_async_engine():
+    pytest.importorskip("aiosqlite")
+
+    engine = create_async_engine("sqlite+aiosqlite:///")
+    pinned_engine = PinnedAsyncEngine(engine)
+    try:
+        assert isinstance(pinned_engine, AsyncEngine)
+        assert pinned_engine.sync_engine is engine.sync_engine
+        assert pinned_engine.dialect is engine.dialect
+    finally:
+        pinned_engine.close()
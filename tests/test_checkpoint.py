@@ -0,0 +1,169 @@
+import sqlite3
+
+import pytest
+import sqlalchemy
+from sqlalchemy import text
+
+from pytest_alembic import Config
+from pytest_alembic.checkpoint import (
+    Checkpoint,
+    checkpoint_cache,
+    CheckpointBackend,
+    CheckpointStore,
+    FileCheckpointStore,
+)
+
+
+class NullBackend(CheckpointBackend):
+    def supports(self, connection):  # noqa: ARG002
+        return True
+
+    def fingerprint(self, connection):  # noqa: ARG002
+        return ""
+
+    def snapshot(self, connection):  # noqa: ARG002
+        return None, 0
+
+    def restore(self, connection, snapshot):
+        pass
+
+    def snapshot_fingerprint(self, snapshot):  # noqa: ARG002
+        return ""
+
+
+def make_checkpoint(key, size):
+    return Checkpoint(key=key, revision=key, backend=NullBackend(), snapshot=None, size=size)
+
+
+def test_incomplete_backend_rejected():
+    class IncompleteBackend(CheckpointBackend):
+        def supports(self, connection):  # noqa: ARG002
+            return True
+
+    with pytest.raises(TypeError, match="abstract"):
+        IncompleteBackend()
+
+
+def test_evicts_least_recently_used():
+    store = CheckpointStore(budget=20)
+    store.put(make_checkpoint("a", 10))
+    store.put(make_checkpoint("b", 10))
+
+    # Touch "a", such that "b" is the least recently used.
+    store.get("a")
+    store.put(make_checkpoint("c", 10))
+
+    assert list(store.checkpoints) == ["a", "c"]
+    assert store.size == 20
+
+
+def test_key_depends_on_parent():
+    store = CheckpointStore()
+    assert store.key("parent1", "aaaa") != store.key("parent2", "aaaa")
+    assert store.key("parent1", "aaaa") == store.key("parent1", "aaaa")
+
+
+def test_sqlite_roundtrip():
+    engine = sqlalchemy.create_engine("sqlite:///")
+    store = CheckpointStore()
+
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE foo (id INTEGER)"))
+        connection.execute(text("INSERT INTO foo VALUES (1)"))
+
+    with engine.begin() as connection:
+        checkpoint = store.capture(connection, "key", "aaaa")
+        assert checkpoint is not None
+        assert checkpoint.size > 0
+
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE foo"))
+
+    with engine.begin() as connection:
+        store.restore(connection, "key")
+
+    with engine.connect() as connection:
+        result = connection.execute(text("SELECT id FROM foo")).fetchall()
+    assert result == [(1,)]
+    engine.dispose()
+
+
+def test_file_store_shared_between_stores(tmp_path):
+    publisher = FileCheckpointStore(directory=tmp_path, run_id="run").namespace("migrations", "a")
+    consumer = FileCheckpointStore(directory=tmp_path, run_id="run").namespace("migrations", "a")
+
+    engine = sqlalchemy.create_engine("sqlite:///")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE foo (id INTEGER)"))
+        connection.execute(text("INSERT INTO foo VALUES (1)"))
+
+    with engine.begin() as connection:
+        publisher.capture(connection, "key", "aaaa")
+        connection.execute(text("DROP TABLE foo"))
+
+    assert "key" in consumer
+    with engine.begin() as connection:
+        checkpoint = consumer.restore(connection, "key")
+        assert checkpoint is not None
+        assert checkpoint.revision == "aaaa"
+
+    with engine.connect() as connection:
+        result = connection.execute(text("SELECT id FROM foo")).fetchall()
+    assert result == [(1,)]
+    engine.dispose()
+
+
+def test_file_store_first_publication_wins(tmp_path):
+    first = FileCheckpointStore(directory=tmp_path)
+    second = FileCheckpointStore(directory=tmp_path)
+
+    engine = sqlalchemy.create_engine("sqlite:///")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE foo (id INTEGER)"))
+        first.capture(connection, "key", "aaaa")
+
+        connection.execute(text("INSERT INTO foo VALUES (1)"))
+        second.capture(connection, "key", "aaaa")
+
+    with engine.begin() as connection:
+        second.restore(connection, "key")
+        result = connection.execute(text("SELECT id FROM foo")).fetchall()
+    assert result == []
+    assert [path.name for path in tmp_path.iterdir()] == ["key.aaaa.sqlite"]
+    engine.dispose()
+
+
+def test_file_store_collects_other_runs_histories(tmp_path):
+    FileCheckpointStore(directory=tmp_path, run_id="1").namespace("migrations", "a")
+    FileCheckpointStore(directory=tmp_path, run_id="2").namespace("migrations", "b")
+    FileCheckpointStore(directory=tmp_path, run_id="2").namespace("migrations", "c")
+    FileCheckpointStore(directory=tmp_path, run_id="2").namespace("other", "a")
+
+    (root,) = (path for path in tmp_path.iterdir() if (path / "c").exists())
+    assert sorted(path.name for path in root.iterdir()) == [".lock", "b", "c"]
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_session_store_shared_per_budget():
+    store = CheckpointStore.from_config(Config(checkpoints=True))
+    assert store is CheckpointStore.from_config(Config(checkpoints=True))
+    assert store is not CheckpointStore.from_config(Config(checkpoints=True, checkpoint_budget=1))
+
+    checkpoint_cache.clear()
+    assert store is not CheckpointStore.from_config(Config(checkpoints=True))
+
+
+def test_snapshots_closed_once_discarded():
+    engine = sqlalchemy.create_engine("sqlite:///")
+    store = CheckpointStore()
+
+    with engine.begin() as connection:
+        snapshots = [store.capture(connection, key, key).snapshot for key in ("a", "b", "c")]
+        store.discard("a")
+        store.capture(connection, "b", "b")
+        store.clear()
+    engine.dispose()
+
+    for snapshot in snapshots:
+        with pytest.raises(sqlite3.ProgrammingError, match="closed"):
+            snapshot.execute("SELECT 1")
@@ -1,7 +1,21 @@
+from unittest import mock
+
+import pytest
+from alembic.script import ScriptDirectory
 from pytest_mock_resources import create_postgres_fixture
-from sqlalchemy import Column, MetaData, Table, types
+from sqlalchemy import Column, create_engine, event, func, MetaData, select, Table, text, types
+from sqlalchemy.engine import Connection
 
-from pytest_alembic.executor import ConnectionExecutor
+from pytest_alembic.executor import (
+    compile_positional_insert,
+    ConnectionExecutor,
+    EnvConfiguration,
+    EnvScriptCache,
+    isolated_transaction,
+    PinnedConnection,
+    ScriptCache,
+)
+from pytest_alembic.revision_data import Columns
 
 metadata = MetaData()
 
@@ -13,3 +27,248 @@ pg = create_postgres_fixture(metadata)
 def test_table_insert(pg):
     command_executor = ConnectionExecutor(pg)
     command_executor.table_insert("", [{"name": "who"}], tablename="t")
+
+
+def test_env_configuration_replayable():
+    engine = create_engine("sqlite:///")
+    with engine.connect() as connection:
+        calls = [((), {"connection": connection, "target_metadata": metadata})]
+        env_configuration = EnvConfiguration.from_calls(calls, engine)
+
+    assert env_configuration.replayable
+    assert env_configuration.engine is engine
+    assert env_configuration.kwargs == {"target_metadata": metadata}
+
+
+def test_env_configuration_not_replayable():
+    offline = EnvConfiguration.from_calls([((), {"url": "sqlite:///"})])
+    assert not offline.replayable
+
+    multiple = EnvConfiguration.from_calls([((), {}), ((), {})])
+    assert not multiple.replayable
+
+
+def test_env_script_cache(tmp_path):
+    env_py = tmp_path / "env.py"
+    env_py.write_text("from alembic import context\ncontext.append(1)\n")
+
+    script = ScriptDirectory(str(tmp_path))
+    cache = EnvScriptCache()
+
+    executed = []
+    with mock.patch("alembic.context", executed, create=True):
+        cache.run(script)
+        cache.run(script)
+
+        assert (cache.compilations, cache.executions) == (1, 2)
+
+        env_py.write_text("from alembic import context\ncontext.append(2)\n\n")
+        cache.run(script)
+
+    assert (cache.compilations, cache.executions) == (2, 3)
+    assert executed == [1, 1, 2]
+
+
+def test_script_cache(tmp_path):
+    (tmp_path / "versions").mkdir()
+    (tmp_path / "versions" / "aaaa.py").write_text(
+        "revision = 'aaaa'\ndown_revision = None\nbranch_labels = None\ndepends_on = None\n"
+    )
+
+    cache = ScriptCache()
+    script = cache.script(ScriptDirectory(str(tmp_path)))
+    assert cache.script(ScriptDirectory(str(tmp_path))) is script
+    assert cache.script(ScriptDirectory(str(tmp_path), sourceless=True)) is not script
+
+    history = cache.history(script)
+    assert history.revisions == ["base", "aaaa", "heads"]
+    assert cache.history(script) is history
+
+    script.revision_map = ScriptDirectory(str(tmp_path)).revision_map
+    assert cache.history(script) is not history
+
+
+def test_script_cache_refreshed(tmp_path):
+    (tmp_path / "versions").mkdir()
+    (tmp_path / "versions" / "aaaa.py").write_text(
+        "revision = 'aaaa'\ndown_revision = None\nbranch_labels = None\ndepends_on = None\n"
+    )
+
+    cache = ScriptCache()
+    script = cache.script(ScriptDirectory(str(tmp_path)))
+    assert cache.history(script).revisions == ["base", "aaaa", "heads"]
+
+    bbbb = tmp_path / "versions" / "bbbb.py"
+    bbbb.write_text(
+        "revision = 'bbbb'\ndown_revision = 'aaaa'\nbranch_labels = None\ndepends_on = None\n"
+    )
+    assert cache.script(ScriptDirectory(str(tmp_path))) is script
+    assert cache.history(script).revisions == ["base", "aaaa", "bbbb", "heads"]
+
+    bbbb.unlink()
+    assert cache.script(ScriptDirectory(str(tmp_path))) is script
+    assert cache.history(script).revisions == ["base", "aaaa", "heads"]
+
+
+def test_table_insert_grouped():
+    engine = create_engine("sqlite:///")
+    metadata.create_all(engine)
+
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute", named=True)
+    def record(**kwargs):
+        statements.append((kwargs["statement"], kwargs["executemany"]))
+
+    data = [{"__tablename__": "t", "name": str(i)} for i in range(5)]
+    data.append({"__tablename__": "t", "name": func.lower("UPPER")})
+
+    connection_executor = ConnectionExecutor(engine, insert_chunk_size=2)
+    connection_executor.table_insert("", data)
+
+    inserts = [executemany for statement, executemany in statements if "INSERT" in statement]
+    assert inserts == [True, True, False, False]
+
+    with engine.connect() as conn:
+        names = conn.execute(select(table.c.name)).scalars().all()
+    assert sorted(names) == ["0", "1", "2", "3", "4", "upper"]
+
+
+def test_table_insert_columns():
+    engine = create_engine("sqlite:///")
+    metadata.create_all(engine)
+
+    connection_executor = ConnectionExecutor(engine, insert_chunk_size=2)
+    columns = Columns("t", {"name": ("a", "b", "c")})
+    with mock.patch.object(Connection, "execute") as execute:
+        columns.insert(connection_executor, "")
+    execute.assert_not_called()
+
+    with engine.connect() as conn:
+        names = conn.execute(select(table.c.name)).scalars().all()
+    assert sorted(names) == ["a", "b", "c"]
+
+
+def test_compile_positional_insert():
+    from sqlalchemy.dialects.oracle.oracledb import OracleDialect_oracledb
+    from sqlalchemy.dialects.postgresql.psycopg2 import PGDialect_psycopg2
+
+    pair = Table("pair", MetaData(), Column("a", types.Integer()), Column("b", types.Integer()))
+    insert = pair.insert()
+
+    statement, positions = compile_positional_insert(
+        insert, PGDialect_psycopg2(), ["b", "a"], column_keys=["b", "a"]
+    )
+    assert statement == "INSERT INTO pair (a, b) VALUES (%s, %s)"
+    assert positions == [1, 0]
+
+    statement, _ = compile_positional_insert(
+        insert, OracleDialect_oracledb(), ["a", "b"], column_keys=["a", "b"]
+    )
+    assert statement == "INSERT INTO pair (a, b) VALUES (:1, :2)"
+
+
+def test_table_insert_columns_pages():
+    engine = create_engine("sqlite:///")
+    metadata.create_all(engine)
+
+    # As for psycopg2, whose `executemany` executes each row individually.
+    engine.dialect.use_insertmanyvalues_wo_returning = True
+    engine.dialect.insertmanyvalues_page_size = 2
+
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute", named=True)
+    def record(**kwargs):
+        statements.append((kwargs["statement"], kwargs["executemany"]))
+
+    connection_executor = ConnectionExecutor(engine, insert_chunk_size=3)
+    Columns("t", {"name": ("a", "b", "c", "d", "e")}).insert(connection_executor, "")
+
+    inserts = [statement for statement in statements if "INSERT" in statement[0]]
+    assert inserts == [
+        ("INSERT INTO t (name) VALUES (?), (?)", False),
+        ("INSERT INTO t (name) VALUES (?)", False),
+        ("INSERT INTO t (name) VALUES (?), (?)", False),
+    ]
+
+    with engine.connect() as conn:
+        names = conn.execute(select(table.c.name)).scalars().all()
+    assert sorted(names) == ["a", "b", "c", "d", "e"]
+
+
+def test_table_insert_columns_postgres(pg):
+    connection_executor = ConnectionExecutor(pg, insert_chunk_size=2)
+    Columns("t", {"name": ("a", "b", "c")}).insert(connection_executor, "")
+
+    with pg.connect() as conn:
+        names = conn.execute(select(table.c.name)).scalars().all()
+    assert sorted(names) == ["a", "b", "c"]
+
+
+def test_table_insert_columns_numpy():
+    np = pytest.importorskip("numpy")
+
+    engine = create_engine("sqlite:///")
+    metadata.create_all(engine)
+
+    data = np.array([("a",), ("b",)], dtype=[("name", "U10")])
+    ConnectionExecutor(engine).table_insert_columns("", "t", ["name"], Columns("t", data).chunks(1))
+
+    with engine.connect() as conn:
+        names = conn.execute(select(table.c.name)).scalars().all()
+    assert sorted(names) == ["a", "b"]
+
+
+def test_pinned_connection(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'db.sqlite'}")
+    with engine.connect() as connection:
+        pinned = PinnedConnection(connection)
+        with pinned.connect() as conn:
+            assert conn is connection
+        assert not connection.closed
+
+        executor = ConnectionExecutor(connection, pinned=True)
+        executor.run_task(lambda connection: connection.execute(text("CREATE TABLE foo (id int)")))
+        executor.run_task(lambda connection: connection.execute(text("INSERT INTO foo VALUES (1)")))
+        assert not connection.in_transaction()
+
+        with pytest.raises(ZeroDivisionError):
+            executor.run_task(
+                lambda connection: [connection.execute(text("INSERT INTO foo VALUES (2)")), 1 / 0]
+            )
+        assert not connection.in_transaction()
+
+        with engine.connect() as other:
+            assert other.execute(text("SELECT id FROM foo")).scalars().all() == [1]
+
+
+def test_isolated_transaction(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'db.sqlite'}")
+    with engine.connect() as connection:
+        executor = ConnectionExecutor(connection, pinned=True)
+        with isolated_transaction(connection):
+            assert executor.isolated
+
+            executor.run_task(
+                lambda connection: connection.execute(text("CREATE TABLE foo (id int)"))
+            )
+            executor.run_task(
+                lambda connection: connection.execute(text("INSERT INTO foo VALUES (1)"))
+            )
+
+            # A failing task only rolls back its own savepoint.
+            with pytest.raises(ZeroDivisionError):
+                executor.run_task(
+                    lambda connection: [
+                        connection.execute(text("INSERT INTO foo VALUES (2)")),
+                        1 / 0,
+                    ]
+                )
+            assert executor.run_task(
+                lambda connection: connection.execute(text("SELECT id FROM foo")).scalars().all()
+            ) == [1]
+
+        assert not executor.isolated
+        assert not connection.in_transaction()
+        assert not engine.dialect.has_table(connection, "foo")
@@ -1,10 +1,17 @@
 from dataclasses import dataclass
 from typing import List
+from unittest import mock
 
 import pytest
-from alembic.script import revision
+from alembic.script import revision, ScriptDirectory
 
-from pytest_alembic.history import AlembicHistory
+from pytest_alembic.history import (
+    AlembicHistory,
+    LazyScript,
+    RevisionLoader,
+    scan_revision_header,
+    scan_revision_headers,
+)
 
 
 @dataclass
@@ -97,3 +104,163 @@ def test_revision_window():
 
     expected_result = [("base", "bar"), ("bar", "bax"), ("bax", "baz")]
     assert expected_result == result
+
+
+class Cache(dict):
+    def set(self, key, value):
+        self[key] = value
+
+
+def write_revision(versions, revision, down_revision=None):
+    (versions / f"{revision}.py").write_text(
+        f"revision = {revision!r}\n"
+        f"down_revision = {down_revision!r}\n"
+        "branch_labels = None\n"
+        "depends_on = None\n"
+        "\n"
+        "def upgrade():\n"
+        "    pass\n"
+    )
+
+
+def test_revision_loader_cache(tmp_path):
+    versions = tmp_path / "versions"
+    versions.mkdir()
+    write_revision(versions, "aaaa")
+    write_revision(versions, "bbbb", "aaaa")
+
+    cache = Cache()
+    loader = RevisionLoader(ScriptDirectory(str(tmp_path)), cache=cache).install()
+    assert AlembicHistory.parse(loader.script.revision_map).revisions == [
+        "base",
+        "aaaa",
+        "bbbb",
+        "heads",
+    ]
+    assert loader.imports == 0
+    assert cache
+
+    # A new session, with the same cache, reuses the recorded headers.
+    loader = RevisionLoader(ScriptDirectory(str(tmp_path)), cache=cache).install()
+    history = AlembicHistory.parse(loader.script.revision_map)
+    assert history.revisions == ["base", "aaaa", "bbbb", "heads"]
+    assert loader.imports == 0
+
+    script = loader.script.revision_map.get_revision("bbbb")
+    assert isinstance(script, LazyScript)
+    assert not script.imported
+    assert script.module.upgrade
+    assert script.imported
+    assert script.down_revision == "aaaa"
+
+    write_revision(versions, "bbbb", None)
+    loader = RevisionLoader(ScriptDirectory(str(tmp_path)), cache=cache).install()
+    assert sorted(loader.script.revision_map.heads) == ["aaaa", "bbbb"]
+
+
+def test_revision_loader_dynamic_header(tmp_path):
+    versions = tmp_path / "versions"
+    versions.mkdir()
+    write_revision(versions, "aaaa")
+    (versions / "bbbb.py").write_text(
+        "revision = 'bb' + 'bb'\ndown_revision = 'aaaa'\nbranch_labels = None\n"
+    )
+
+    loader = RevisionLoader(ScriptDirectory(str(tmp_path))).install()
+    assert loader.script.revision_map.get_revision("bbbb").down_revision == "aaaa"
+    assert loader.imports == 1
+
+
+def test_scan_revision_header(tmp_path):
+    path = tmp_path / "aaaa.py"
+    path.write_text(
+        '"""Message."""\n'
+        "from typing import Sequence, Union\n"
+        "revision: str = 'aaaa'\n"
+        "down_revision: Union[str, None] = ('bbbb', 'cccc')\n"
+        "branch_labels: Union[str, Sequence[str], None] = 'label'\n"
+        "depends_on: Union[str, Sequence[str], None] = None\n"
+    )
+
+    header = scan_revision_header(str(path))
+    assert header is not None
+    assert header.revision == "aaaa"
+    assert header.down_revision == ("bbbb", "cccc")
+    assert header.branch_labels == ("label",)
+    assert header.depends_on == ()
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "revision = 'aaaa'\n",
+        "revision = 'aaaa'\ndown_revision = None\nif True:\n    down_revision = 'bbbb'\n",
+        "revision = 'aaaa'\nfrom foo import down_revision\n",
+        "revision = 'aaaa'\ndown_revision = None\nfrom foo import *\n",
+        "revision = 'aaaa'\ndown_revision = OTHER\n",
+        "revision = 'aaaa'\ndown_revision = None\nrevision, _ = 'b', 'c'\n",
+        "revision = 'aaaa'\ndown_revision = None\nbranch_labels = [1]\n",
+        "revision = (\n",
+    ],
+)
+def test_scan_revision_header_dynamic(tmp_path, source):
+    path = tmp_path / "aaaa.py"
+    path.write_text(source)
+    assert scan_revision_header(str(path)) is None
+
+
+def test_scan_revision_headers_parallel(tmp_path):
+    paths = []
+    for rev_id in ("aaaa", "bbbb", "cccc"):
+        write_revision(tmp_path, rev_id)
+        paths.append(str(tmp_path / f"{rev_id}.py"))
+
+    with mock.patch("pytest_alembic.history.PARALLEL_SCAN_THRESHOLD", 1):
+        headers = scan_revision_headers(paths, processes=2)
+
+    assert [headers[path].revision for path in paths] == ["aaaa", "bbbb", "cccc"]
+
+
+def test_revision_loader_refresh(tmp_path):
+    versions = tmp_path / "versions"
+    versions.mkdir()
+    write_revision(versions, "aaaa")
+
+    loader = RevisionLoader(ScriptDirectory(str(tmp_path))).install()
+    revision_map = loader.script.revision_map
+    history = AlembicHistory.parse(revision_map)
+    assert loader.refresh() == []
+
+    # Added revisions are added to the existing map, and history.
+    for rev_id, down_revision in (("bbbb", "aaaa"), ("cccc", "bbbb")):
+        write_revision(versions, rev_id, down_revision)
+        added = loader.refresh()
+        assert [script.revision for script in added] == [rev_id]
+        assert history.extend(added)
+
+    assert loader.script.revision_map is revision_map
+    assert history.revisions == AlembicHistory.parse(revision_map).revisions
+    assert history.next_revision("bbbb") == "cccc"
+
+    # Modified revisions require the map to be rebuilt, retaining imported modules.
+    module = revision_map.get_revision("aaaa").module
+    write_revision(versions, "cccc", "aaaa")
+    assert loader.refresh() is None
+
+    revision_map = loader.script.revision_map
+    assert sorted(revision_map.heads) == ["bbbb", "cccc"]
+    assert revision_map.get_revision("aaaa").module is module
+    assert loader.imports == 0
+
+
+def test_history_extend_branch(tmp_path):
+    versions = tmp_path / "versions"
+    versions.mkdir()
+    write_revision(versions, "aaaa")
+    write_revision(versions, "bbbb", "aaaa")
+
+    loader = RevisionLoader(ScriptDirectory(str(tmp_path))).install()
+    history = AlembicHistory.parse(loader.script.revision_map)
+
+    write_revision(versions, "cccc", "aaaa")
+    assert not history.extend(loader.refresh())
@@ -1,5 +1,17 @@
+import pytest
+
 from pytest_alembic.config import Config
-from pytest_alembic.revision_data import RevisionData, RevisionSpec
+from pytest_alembic.revision_data import (
+    Columns,
+    CSVFile,
+    DataSource,
+    JSONLinesFile,
+    RevisionData,
+    RevisionSpec,
+    Rows,
+    SQLFile,
+)
+from pytest_alembic.synthetic import SyntheticData
 
 
 def test_from_config_empty():
@@ -49,3 +61,121 @@ def test_get_at_multiple_items():
 
     expected_result = [{1: 1}, {2: 2}]
     assert expected_result == result
+
+
+def test_sources_combine_rows(tmp_path):
+    csv_file = CSVFile(tmp_path / "foo.csv")
+    spec = RevisionSpec({"foo": [{"id": 1}, {"id": 2}, csv_file, {"id": 3}], "bar": {"id": 4}})
+
+    assert spec.sources("foo") == [Rows([{"id": 1}, {"id": 2}]), csv_file, Rows([{"id": 3}])]
+    assert spec.sources("bar") == [Rows([{"id": 4}])]
+    assert spec.sources("baz") == []
+
+
+def test_sources_are_lazy():
+    calls = []
+
+    def rows():
+        calls.append(1)
+        yield {"id": 1}
+
+    rev = RevisionData(
+        before_revision_data=RevisionSpec({"foo": rows}), at_revision_data=RevisionSpec({})
+    )
+    assert rev.sources_before("foo")
+    assert calls == []
+
+    assert rev.get_before("foo") == [{"id": 1}]
+    assert calls == [1]
+
+
+def test_file_sources(tmp_path):
+    (tmp_path / "foo.csv").write_text("id,name\n1,\n2,two\n")
+    (tmp_path / "foo.jsonl").write_text('{"id": 1}\n\n{"id": 2}\n')
+    (tmp_path / "foo.sql").write_text(
+        "-- comment\nINSERT INTO foo (id)\nVALUES (1);\n\nINSERT INTO foo (id) VALUES (2)"
+    )
+
+    assert list(DataSource.from_path(tmp_path / "foo.csv").rows()) == [
+        {"__tablename__": "foo", "id": "1", "name": None},
+        {"__tablename__": "foo", "id": "2", "name": "two"},
+    ]
+    assert list(JSONLinesFile(tmp_path / "foo.jsonl", table="bar").rows()) == [
+        {"__tablename__": "bar", "id": 1},
+        {"__tablename__": "bar", "id": 2},
+    ]
+    assert list(SQLFile(tmp_path / "foo.sql").statements()) == [
+        "INSERT INTO foo (id)\nVALUES (1)",
+        "INSERT INTO foo (id) VALUES (2)",
+    ]
+
+    with pytest.raises(ValueError, match="Unrecognized"):
+        DataSource.from_path(tmp_path / "foo.txt")
+
+
+def test_file_fingerprints_follow_contents(tmp_path):
+    path = tmp_path / "foo.csv"
+    path.write_text("id\n1\n")
+    spec = RevisionSpec({"aaaa": path})
+    fingerprint = spec.fingerprint()
+
+    path.write_text("id\n2\n")
+    assert spec.fingerprint() != fingerprint
+    assert CSVFile(path).fingerprint() != CSVFile(path, table="bar").fingerprint()
+
+
+def test_columns_fingerprint_follows_data():
+    fingerprint = Columns("foo", {"id": list(range(10_000))}).fingerprint()
+    assert fingerprint == Columns("foo", {"id": list(range(10_000))}).fingerprint()
+
+    changed = list(range(10_000))
+    changed[5_000] = -1
+    assert fingerprint != Columns("foo", {"id": changed}).fingerprint()
+
+
+def make_rows(count):
+    return lambda: [{"__tablename__": "foo", "id": i} for i in range(count)]
+
+
+def test_callable_fingerprints_follow_code_and_closure():
+    # Distinct (yet identical) function objects, at distinct addresses.
+    assert Rows(make_rows(3)).fingerprint() == Rows(make_rows(3)).fingerprint()
+    assert Rows(make_rows(3)).fingerprint() != Rows(make_rows(4)).fingerprint()
+    assert (
+        Rows(make_rows(3)).fingerprint()
+        != Rows(lambda: [{"__tablename__": "foo", "id": 0}]).fingerprint()
+    )
+
+
+def test_unidentifiable_sources_disable_fingerprints():
+    class Opaque:
+        def __call__(self):
+            return []
+
+    assert Rows(iter([{"id": 1}])).fingerprint() is None
+    assert Rows(Opaque()).fingerprint() is None
+    assert RevisionSpec({"aaaa": [{"id": 1}, Opaque()]}).fingerprint() is None
+    assert RevisionSpec({"aaaa": [{"id": 1}]}).fingerprint() is not None
+
+
+def test_data_source_is_abstract():
+    with pytest.raises(TypeError):
+        DataSource()
+
+    assert not SQLFile.produces_rows
+    assert Rows.produces_rows
+
+
+def test_get_rejects_sources_without_rows(tmp_path):
+    (tmp_path / "foo.sql").write_text("INSERT INTO foo (id) VALUES (1);")
+    rev = RevisionData(
+        before_revision_data=RevisionSpec({"foo": [{"id": 1}, SQLFile(tmp_path / "foo.sql")]}),
+        at_revision_data=RevisionSpec({"foo": SyntheticData({"foo": 10})}),
+    )
+
+    with pytest.raises(TypeError, match="SQLFile does not produce rows"):
+        rev.get_before("foo")
+    with pytest.raises(TypeError, match="SyntheticData does not produce rows"):
+        rev.get_at("foo")
+
+    assert len(rev.sources_before("foo")) == 2
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 
 from tests import requires_asyncio_support
@@ -287,3 +289,190 @@ def test_version_table_schema(pytester):
 def test_branched_history_before_upgrade_data(pytester):
     """Assert branched upgrade data is only inserted once per migration."""
     run_pytest(pytester, passed=4)
+
+
+def test_checkpoints(pytester):
+    """Assert upgrades restore checkpoints recorded by earlier upgrades."""
+    run_pytest(pytester, passed=8)
+
+
+def test_head_cache(pytester):
+    """Assert upgrades to "heads" restore the cached snapshot, and are periodically replayed."""
+    run_pytest(pytester, passed=9)
+
+    entries = pytester.path / ".pytest_cache" / "v" / "pytest-alembic" / "head-cache"
+    (entry,) = entries.iterdir()
+    assert json.loads(entry.read_text())["restores"] == 0
+
+
+def test_current_revision(pytester):
+    """Assert the current revision is tracked without re-running env.py, and can be verified."""
+    run_pytest(pytester, passed=8)
+
+
+def test_coalesce_steps(pytester):
+    """Assert consecutive revisions without revision data are executed together."""
+    run_pytest(pytester, passed=7)
+
+
+def test_replay_env(pytester):
+    """Assert env.py is executed only once, when its configuration is replayed."""
+    run_pytest(pytester, passed=5)
+
+
+def test_revision_data_sources(pytester):
+    """Assert revision data can be streamed from files, callables and generators."""
+    run_pytest(pytester)
+
+
+def test_synthetic_data(pytester):
+    """Assert synthetic data can be generated as revision data, and through the runner."""
+    run_pytest(pytester, passed=5)
+
+
+def test_migration_under_volume_success(pytester):
+    """Assert revisions within their budgets pass, against tables filled to the data volume."""
+    result = run_pytest(pytester, passed=1)
+    assert_has_test(result, "test_migration_under_volume")
+
+
+def test_migration_under_volume_failure(pytester):
+    """Assert a revision exceeding its budget fails, reporting its throughput."""
+    result = run_pytest(pytester, success=False, passed=0, failed=1)
+    assert_failed_test_has_content(
+        result,
+        test="test_migration_under_volume",
+        content="Revision bbbbbbbbbbbb took",
+    )
+    assert_failed_test_has_content(
+        result,
+        test="test_migration_under_volume",
+        content="rows/sec",
+    )
+
+
+def test_migration_scaling_success(pytester):
+    """Assert a revision which is linear in the volume of data passes."""
+    result = run_pytest(pytester, passed=1)
+    assert_has_test(result, "test_migration_scaling")
+
+
+def test_migration_scaling_failure(pytester):
+    """Assert a revision which is quadratic in the volume of data is flagged."""
+    result = run_pytest(pytester, success=False, passed=0, failed=1)
+    assert_failed_test_has_content(
+        result,
+        test="test_migration_scaling",
+        content="Revision bbbbbbbbbbbb (exponent",
+    )
+
+
+def test_pinned_connection(pytester):
+    """Assert the runner performs everything through a single, committed, connection."""
+    run_pytest(pytester, passed=3, args=["-vv", "-s"])
+
+
+@requires_asyncio_support
+def test_async_migration_context(pytester):
+    """Assert async tests can migrate through `AsyncMigrationContext`, including concurrently."""
+    run_pytest(pytester, passed=7)
+
+
+@requires_asyncio_support
+def test_async_runner_standard_env(pytester):
+    """Assert an `env.py` which always calls `asyncio.run` is rejected clearly by `async_alembic_runner`."""
+    run_pytest(pytester, passed=6)
+
+
+@requires_asyncio_support
+def test_async_sqlalchemy_pinned(pytester):
+    """Assert an async engine's migrations, inserts and reflection share a single connection."""
+    run_pytest(pytester, passed=7)
+
+
+def test_transaction_mode(pytester):
+    """Assert single-transaction (and savepoint) modes match committing each revision."""
+    run_pytest(pytester, passed=8, args=["-vv"])
+
+
+def test_rollback_isolation(pytester):
+    """Assert built-in and custom tests each roll back their changes to a shared database."""
+    run_pytest(pytester, passed=7)
+
+
+def test_migration_plan(pytester):
+    """Assert built-in tests share one upgrade per history, and attribute its failure."""
+    run_pytest(pytester, passed=9)
+
+
+def test_worker_engine(pytester):
+    """Assert the worker engine is isolated per test, and item durations are recorded."""
+    run_pytest(pytester, passed=7)
+
+    durations = pytester.path / ".pytest_cache" / "v" / "pytest-alembic" / "durations"
+    recorded = json.loads(durations.read_text())
+    assert "conftest.py::pytest-alembic::test_upgrade" in recorded
+
+
+per_revision_args = [
+    "--test-alembic",
+    "--alembic-tests-path",
+    "conftest.py",
+    "--alembic-per-revision",
+    "-W",
+    "default::pytest.PytestConfigWarning",
+]
+
+
+def assert_warned(result, content: str):
+    assert [
+        recorded
+        for recorded in result.getcalls("pytest_warning_recorded")
+        if content in str(recorded.warning_message.message)
+    ]
+
+
+def run_per_revision_fallback(pytester, *, warning):
+    result = run_pytest(pytester, args=per_revision_args)
+    assert_has_test(result, "test_up_down_consistency")
+    assert_warned(result, warning)
+    return result
+
+
+def test_per_revision_without_default_config(pytester):
+    """Assert per-revision collection falls back to whole tests, without a default alembic config."""
+    run_per_revision_fallback(pytester, warning="overridden `alembic_config` fixture")
+
+    # Without the fixture either, there are no revisions to read.
+    (pytester.path / "conftest.py").write_text("")
+    result = pytester.inline_run(*per_revision_args, "--collect-only")
+    assert_warned(result, "could not read the revisions of the default alembic config")
+
+
+def test_per_revision_config_fixture(pytester):
+    """Assert per-revision tests aren't collected from `alembic.ini`, given an `alembic_config` fixture."""
+    result = run_per_revision_fallback(pytester, warning="overridden `alembic_config` fixture")
+    assert not [
+        report
+        for report in result.getreports("pytest_runtest_logreport")
+        if "dddddddddddd" in report.nodeid
+    ]
+
+
+def test_per_revision(pytester):
+    """Assert per-revision built-in tests are collected, and fail independently."""
+    result = run_pytest(pytester, passed=7, failed=2, success=False)
+    for revision in ("aaaaaaaaaaaa", "bbbbbbbbbbbb", "cccccccccccc"):
+        assert_has_test(result, f"test_up_down_consistency[{revision}]")
+        assert_has_test(result, f"test_downgrade_leaves_no_trace[{revision}]")
+
+    assert_failed_test_has_content(
+        result,
+        test="test_up_down_consistency[bbbbbbbbbbbb]",
+        content="Failed to downgrade through each revision",
+    )
+    assert_failed_test_has_content(
+        result,
+        test="test_downgrade_leaves_no_trace[bbbbbbbbbbbb]",
+        content="Something went wrong",
+    )
@@ -0,0 +1,137 @@
+import pytest
+from sqlalchemy import (
+    Boolean,
+    Column,
+    create_engine,
+    Date,
+    ForeignKey,
+    Integer,
+    MetaData,
+    Numeric,
+    select,
+    String,
+    Table,
+    UniqueConstraint,
+)
+
+from pytest_alembic.executor import ConnectionExecutor
+from pytest_alembic.synthetic import SyntheticData
+
+metadata = MetaData()
+
+user = Table(
+    "user",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("email", String(32), unique=True, nullable=False),
+    Column("active", Boolean, nullable=True),
+    Column("born", Date, nullable=True),
+)
+order = Table(
+    "order",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("user_id", Integer, ForeignKey("user.id"), nullable=False),
+    Column("total", Numeric(10, 2), nullable=False),
+)
+
+
+def generate(data):
+    engine = create_engine("sqlite:///")
+    metadata.create_all(engine)
+    data.insert(ConnectionExecutor(engine), "")
+
+    with engine.connect() as conn:
+        users = conn.execute(select(user).order_by(user.c.id)).fetchall()
+        orders = conn.execute(select(order).order_by(order.c.id)).fetchall()
+    return users, orders
+
+
+def test_generate():
+    # Listed out of foreign key order.
+    users, orders = generate(SyntheticData({"order": 50, "user": 10}, chunk_size=7))
+
+    assert len(users) == 10
+    assert len(orders) == 50
+    assert len({u.email for u in users}) == 10
+    assert {o.user_id for o in orders} <= {u.id for u in users}
+
+
+def test_generate_deterministic():
+    assert generate(SyntheticData({"user": 10}, seed=3)) == generate(
+        SyntheticData({"user": 10}, seed=3)
+    )
+    assert generate(SyntheticData({"user": 10}, seed=3)) != generate(
+        SyntheticData({"user": 10}, seed=4)
+    )
+
+
+def test_generate_missing_reference():
+    with pytest.raises(ValueError, match="non-nullable"):
+        generate(SyntheticData({"order": 10}))
+
+
+def test_row_counts():
+    engine = create_engine("sqlite:///")
+    metadata.create_all(engine)
+    executor = ConnectionExecutor(engine)
+    SyntheticData({"user": 5}).insert(executor, "")
+
+    assert executor.row_counts() == {"order": 0, "user": 5}
+    assert executor.row_counts(["user", "missing"]) == {"user": 5}
+    assert executor.row_counts(exclude=["order"]) == {"user": 5}
+
+
+def generate_table(table, counts):
+    engine = create_engine("sqlite:///")
+    table.metadata.create_all(engine)
+    SyntheticData(counts).insert(ConnectionExecutor(engine), "")
+
+    with engine.connect() as conn:
+        return conn.execute(select(table)).fetchall()
+
+
+def test_generate_short_unique_strings():
+    codes = MetaData()
+    code = Table("code", codes, Column("code", String(2), primary_key=True))
+
+    rows = generate_table(code, {"code": 1000})
+    assert len({row.code for row in rows}) == 1000
+    assert all(len(row.code) <= 2 for row in rows)
+
+    with pytest.raises(ValueError, match="length of 2 holds only 1296 distinct values"):
+        generate_table(code, {"code": 1297})
+
+
+def test_generate_association_table():
+    tags = MetaData()
+    Table("post", tags, Column("id", Integer, primary_key=True))
+    Table("tag", tags, Column("id", Integer, primary_key=True))
+    post_tag = Table(
+        "post_tag",
+        tags,
+        Column("post_id", Integer, ForeignKey("post.id"), primary_key=True),
+        Column("tag_id", Integer, ForeignKey("tag.id"), primary_key=True),
+    )
+
+    rows = generate_table(post_tag, {"post": 10, "tag": 5, "post_tag": 50})
+    assert len(set(rows)) == 50
+
+    with pytest.raises(ValueError, match="references only 50 combinations"):
+        generate_table(post_tag, {"post": 10, "tag": 5, "post_tag": 51})
+
+
+def test_generate_composite_unique_constraint():
+    slugs = MetaData()
+    Table("site", slugs, Column("id", Integer, primary_key=True))
+    page = Table(
+        "page",
+        slugs,
+        Column("id", Integer, primary_key=True),
+        Column("site_id", Integer, ForeignKey("site.id"), nullable=False),
+        Column("slug", String(8), nullable=False),
+        UniqueConstraint("site_id", "slug"),
+    )
+
+    rows = generate_table(page, {"site": 2, "page": 100})
+    assert len({(row.site_id, row.slug) for row in rows}) == 100